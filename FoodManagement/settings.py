@@ -53,6 +53,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # 요청별 DB 쿼리/직렬화/응답 시간 측정 (Server-Timing 헤더, /api/stats/performance)
+    'FoodManagementAPI.middleware.PerformanceMiddleware',
+    # 읽기 요청은 복제 DB 사용 (DB_REPLICAS 가 없으면 사용 안 함)
+    'FoodManagementAPI.db_router.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -103,12 +107,56 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD'),
         'HOST': os.getenv('DB_HOST'),
         'PORT': os.getenv('DB_PORT'),
-        'OPPTIONS': {
+        'OPTIONS': {
             'init_command': "SET sql_mode='STRICT_TRANS_TABLES'"
         }
     }
 }
 
+# 로컬 부하 테스트 등에서 sqlite 사용 (DB_ENGINE=sqlite, DB_NAME: 파일 경로)
+if os.getenv('DB_ENGINE') == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv('DB_NAME') or BASE_DIR / 'db.sqlite3',
+            # 동시 쓰기 요청이 바로 'database is locked' 로 실패하지 않도록 대기 (초)
+            'OPTIONS': {'timeout': 20},
+        }
+    }
+
+# 요청마다 DB 연결을 새로 만들지 않도록 DB_CONN_MAX_AGE(초) 동안 연결 재사용 (0 이면 요청마다 연결)
+# 재사용하기 전에 연결 상태를 확인해서 끊어진 연결은 다시 연결
+DATABASES['default']['CONN_MAX_AGE'] = int(os.getenv('DB_CONN_MAX_AGE', 60))
+DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+
+# 읽기 전용 복제 DB (DB_REPLICAS: 쉼표로 구분, mysql 은 호스트, sqlite 는 파일 경로)
+# GET/HEAD/OPTIONS 요청의 읽기는 복제 DB 사용, 쓰기 요청이 성공한 사용자는 DB_REPLICA_STICKY_SECONDS 동안 default 에서 읽음
+# (FoodManagementAPI.db_router) 테스트에서는 default 를 그대로 사용
+DATABASE_REPLICAS = []
+for number, replica in enumerate(filter(None, os.getenv('DB_REPLICAS', '').split(',')), 1):
+    alias = f'replica{number}'
+    location = 'NAME' if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3' else 'HOST'
+    DATABASES[alias] = {**DATABASES['default'], location: replica.strip(), 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['FoodManagementAPI.db_router.ReplicaRouter']
+REPLICA_STICKY_SECONDS = int(os.getenv('DB_REPLICA_STICKY_SECONDS', 5))
+
+# cache
+# 여러 프로세스로 실행할 때는 공유 캐시(redis, memcached 등)를 사용해야 카탈로그/색인 버전이 함께 갱신됨
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    }
+}
+
+# 성능 측정 기준, 초과한 요청은 경고 로그 (빈 값으로 설정하면 검사 안 함)
+PERFORMANCE_QUERY_BUDGET = os.getenv('PERFORMANCE_QUERY_BUDGET', '20')
+PERFORMANCE_QUERY_BUDGET = int(PERFORMANCE_QUERY_BUDGET) if PERFORMANCE_QUERY_BUDGET else None
+PERFORMANCE_LATENCY_BUDGET_MS = os.getenv('PERFORMANCE_LATENCY_BUDGET_MS', '500')
+PERFORMANCE_LATENCY_BUDGET_MS = float(PERFORMANCE_LATENCY_BUDGET_MS) if PERFORMANCE_LATENCY_BUDGET_MS else None
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -159,12 +207,22 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     # 'PAGE_SIZE': 10,
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # 'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # 요청마다 User 를 조회하지 않도록 사용자 정보를 캐시하는 JWT 인증
+        'FoodManagementAPI.authentication.CachedJWTAuthentication',
         # 'rest_framework.authentication.TokenAuthentication',
         'rest_framework.authentication.SessionAuthentication'
     ],
+    # 요청 비용 기반 사용자별/URL 별 토큰 버킷, 초과하면 429 + Retry-After
+    'DEFAULT_THROTTLE_CLASSES': [
+        'FoodManagementAPI.throttling.TokenBucketThrottle',
+    ],
 }
 
+# throttle 저장소: 기본은 프로세스 메모리, THROTTLE_CACHE 에 캐시 alias 를 지정하면 여러 프로세스가 공유
+# 예산(THROTTLE_USER_BUDGET, THROTTLE_ROUTE_BUDGETS), 비용(THROTTLE_COSTS) 기본값은 FoodManagementAPI.throttling
+THROTTLE_CACHE = os.getenv('THROTTLE_CACHE') or None
+
 SIMPLE_JWT = {
     # Access 토큰의 유효 시간 설정
     'ACCESS_TOKEN_LIFETIME': timedelta(days=int(os.getenv('ACCESS_TOKEN_LIFETIME'))),
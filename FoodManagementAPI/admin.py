@@ -1,5 +1,14 @@
 from django.contrib import admin
-from .models import IngredientCategory, Ingredient, UserIngredient, RecipeCategory, Recipe, RecipeIngredient, Cart
+from .models import IngredientCategory, Ingredient, UserIngredient, RecipeCategory, Recipe, RecipeIngredient, Cart, Job
+from .pagination import EstimatedCountPaginator
+
+
+# 행이 많은 테이블용 ModelAdmin
+# 목록: list_select_related 로 __str__ 에 필요한 관련 행을 JOIN, 추정 행 수 Paginator, 전체 개수 COUNT(*) 생략
+# 수정 화면: 관련 모델은 전체 <select> 대신 autocomplete 위젯 (관련 ModelAdmin 의 search_fields 사용)
+class LargeTableAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 admin.site.register(IngredientCategory)
@@ -7,13 +16,52 @@ admin.site.register(IngredientCategory)
 
 # admin.site.register(Ingredient)
 @admin.register(Ingredient)
-class IngredintAdmin(admin.ModelAdmin):
+class IngredintAdmin(LargeTableAdmin):
+    list_display = ('id', 'title', 'category')
+    list_select_related = ('category',)
     list_filter = ('category',)
     search_fields = ('title',)
 
 
-admin.site.register(UserIngredient)
+@admin.register(UserIngredient)
+class UserIngredientAdmin(LargeTableAdmin):
+    list_display = ('id', 'user', 'ingredient', 'quantity', 'start', 'end')
+    list_select_related = ('user', 'ingredient')
+    autocomplete_fields = ('user', 'ingredient')
+    # 인덱스를 사용할 수 있도록 사용자 이름은 일치, 식재료 이름은 앞부분 일치 검색
+    search_fields = ('=user__username', '^ingredient__title')
+
+
 admin.site.register(RecipeCategory)
-admin.site.register(Recipe)
-admin.site.register(RecipeIngredient)
-admin.site.register(Cart)
+
+
+@admin.register(Recipe)
+class RecipeAdmin(LargeTableAdmin):
+    list_display = ('id', 'code', 'title', 'category')
+    list_select_related = ('category',)
+    list_filter = ('category',)
+    search_fields = ('^title', '=code')
+
+
+@admin.register(RecipeIngredient)
+class RecipeIngredientAdmin(LargeTableAdmin):
+    list_display = ('id', 'recipe', 'ingredient')
+    list_select_related = ('recipe', 'ingredient')
+    autocomplete_fields = ('recipe', 'ingredient')
+    search_fields = ('^recipe__title', '^ingredient__title')
+
+
+@admin.register(Cart)
+class CartAdmin(LargeTableAdmin):
+    list_display = ('id', 'user', 'ingredient', 'buy')
+    list_select_related = ('user', 'ingredient')
+    autocomplete_fields = ('user', 'ingredient')
+    list_filter = ('buy',)
+    search_fields = ('=user__username', '^ingredient__title')
+
+
+@admin.register(Job)
+class JobAdmin(LargeTableAdmin):
+    list_display = ('id', 'name', 'status', 'attempts', 'progress', 'message', 'run_at', 'finished_at')
+    list_filter = ('status', 'name')
+    search_fields = ('=name', '=key')
@@ -0,0 +1,142 @@
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Exists, OuterRef, Q, Sum
+from django.utils import timezone
+
+from .models import IngredientCategory, UserIngredient, Cart
+
+
+# 사용자 식재료/장바구니 통계 (관리자용)
+# 집계(COUNT, SUM, GROUP BY)는 DB 에서 하고, DB 마다 다른 날짜 계산과 분위수는 chunk 단위로 가져와 NumPy/pandas 로 계산
+# 결과는 캐시에 저장 (compute_pantry_analytics 명령을 주기적으로 실행하거나, 조회 시 만료되었으면 다시 계산)
+ANALYTICS_CACHE_KEY = 'pantry-analytics'
+ANALYTICS_CACHE_TIMEOUT = getattr(settings, 'PANTRY_ANALYTICS_CACHE_TIMEOUT', 60 * 60)
+CHUNK_SIZE = 10000
+# 보관 기간 분포는 일 단위 히스토그램으로 계산 (MAX_SHELF_LIFE_DAYS 이상은 마지막 칸)
+MAX_SHELF_LIFE_DAYS = 365
+
+
+def category_waste(today):
+    """
+    식재료 카테고리별 사용자 식재료 수, 유통기한이 지난(사용하지 않은) 식재료 수와 수량
+    """
+    expired = Q(end__lt=today)
+    return pd.DataFrame.from_records(
+        UserIngredient.objects.order_by().values('ingredient__category_id').annotate(
+            pantry_items=Count('id'), expired_items=Count('id', filter=expired),
+            total_quantity=Sum('quantity'), expired_quantity=Sum('quantity', filter=expired)),
+        columns=['ingredient__category_id', 'pantry_items', 'expired_items', 'total_quantity', 'expired_quantity'],
+    ).rename(columns={'ingredient__category_id': 'id'}).set_index('id')
+
+
+def cart_conversion():
+    """
+    식재료 카테고리별 장바구니 항목 수, 구매한(buy) 항목 수, 사용자 식재료로 등록된 항목 수
+    """
+    in_pantry = Exists(UserIngredient.objects.filter(
+        user_id=OuterRef('user_id'), ingredient_id=OuterRef('ingredient_id')))
+    return pd.DataFrame.from_records(
+        Cart.objects.order_by().values('ingredient__category_id').annotate(
+            cart_items=Count('id'), bought=Count('id', filter=Q(buy=True)),
+            in_pantry=Count('id', filter=Q(in_pantry))),
+        columns=['ingredient__category_id', 'cart_items', 'bought', 'in_pantry'],
+    ).rename(columns={'ingredient__category_id': 'id'}).set_index('id')
+
+
+def shelf_life(category_ids):
+    """
+    식재료 카테고리별 보관 기간(start -> end, 일) 평균, 중앙값, 90% 분위수
+    DB 에서 (카테고리, start, end) 별 개수로 줄인 뒤 CHUNK_SIZE 씩 히스토그램에 누적
+    """
+    positions = {category_id: pos for pos, category_id in enumerate(category_ids)}
+    histogram = np.zeros((len(category_ids), MAX_SHELF_LIFE_DAYS + 1), dtype=np.int64)
+    total_days = np.zeros(len(category_ids), dtype=np.float64)
+
+    rows = (UserIngredient.objects.order_by().values_list('ingredient__category_id', 'start', 'end')
+            .annotate(count=Count('id')).iterator(chunk_size=CHUNK_SIZE))
+    while True:
+        chunk = list(islice(rows, CHUNK_SIZE))
+        if not chunk:
+            break
+        category, start, end, count = zip(*chunk)
+        pos = np.array([positions[category_id] for category_id in category], dtype=np.int64)
+        days = (np.array(end, dtype='datetime64[D]') - np.array(start, dtype='datetime64[D]')).astype(np.int64)
+        count = np.array(count, dtype=np.int64)
+        np.add.at(histogram, (pos, np.clip(days, 0, MAX_SHELF_LIFE_DAYS)), count)
+        total_days += np.bincount(pos, weights=days * count, minlength=len(category_ids))
+
+    items = histogram.sum(axis=1)
+    cumulative = histogram.cumsum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = total_days / items
+
+    def quantile(q):
+        # 누적 개수가 처음으로 q 비율 이상이 되는 일 수 (항목이 없으면 NaN)
+        days = (cumulative < np.ceil(items * q)[:, None]).sum(axis=1).astype(np.float64)
+        days[items == 0] = np.nan
+        return days
+
+    return pd.DataFrame({'avg_shelf_life_days': mean, 'median_shelf_life_days': quantile(0.5),
+                         'p90_shelf_life_days': quantile(0.9)}, index=pd.Index(category_ids, name='id'))
+
+
+def top_ingredients(queryset, field, top):
+    return [{'id': ingredient_id, 'title': title, field: count}
+            for ingredient_id, title, count in queryset.order_by().values_list('ingredient_id', 'ingredient__title')
+            .annotate(count=Count('id')).order_by('-count', 'ingredient_id')[:top]]
+
+
+def ratio(numerator, denominator):
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (numerator / denominator).round(4)
+
+
+def compute_pantry_analytics(today=None, top=20):
+    today = today or timezone.localdate()
+    categories = pd.DataFrame.from_records(
+        IngredientCategory.objects.order_by('id').values_list('id', 'title'), columns=['id', 'title']).set_index('id')
+
+    report = (categories
+              .join(category_waste(today))
+              .join(shelf_life(categories.index.tolist()))
+              .join(cart_conversion()))
+    counts = ['pantry_items', 'expired_items', 'cart_items', 'bought', 'in_pantry']
+    report[counts] = report[counts].fillna(0).astype(np.int64)
+    for field in ['total_quantity', 'expired_quantity']:
+        report[field] = report[field].fillna(0).astype(float)
+    report['waste_rate'] = ratio(report['expired_items'], report['pantry_items'])
+    report['buy_rate'] = ratio(report['bought'], report['cart_items'])
+    report['conversion_rate'] = ratio(report['in_pantry'], report['cart_items'])
+    shelf_life_fields = ['avg_shelf_life_days', 'median_shelf_life_days', 'p90_shelf_life_days']
+    report[shelf_life_fields] = report[shelf_life_fields].round(2)
+
+    totals = report[counts].sum()
+    report = report.astype(object).where(report.notna(), None)
+    return {
+        'date': today.isoformat(),
+        'computed_at': timezone.now().isoformat(),
+        'totals': {
+            **{field: int(totals[field]) for field in counts},
+            'waste_rate': round(float(totals['expired_items'] / totals['pantry_items']), 4) if totals['pantry_items'] else None,
+            'buy_rate': round(float(totals['bought'] / totals['cart_items']), 4) if totals['cart_items'] else None,
+            'conversion_rate': round(float(totals['in_pantry'] / totals['cart_items']), 4) if totals['cart_items'] else None,
+        },
+        'categories': report.reset_index().to_dict('records'),
+        'most_wasted': top_ingredients(UserIngredient.objects.filter(end__lt=today), 'expired_items', top),
+        'most_bought': top_ingredients(Cart.objects.filter(buy=True), 'bought', top),
+    }
+
+
+def pantry_analytics(refresh=False):
+    """
+    캐시에 저장된 통계 반환, 없거나 refresh 이면 다시 계산해서 저장
+    """
+    report = None if refresh else cache.get(ANALYTICS_CACHE_KEY)
+    if report is None:
+        report = compute_pantry_analytics()
+        cache.set(ANALYTICS_CACHE_KEY, report, ANALYTICS_CACHE_TIMEOUT)
+    return report
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class FoodmanagementapiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'FoodManagementAPI'
+
+    def ready(self):
+        from . import signals, tasks  # noqa: F401
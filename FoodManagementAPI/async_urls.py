@@ -0,0 +1,24 @@
+from django.urls import path
+from . import async_views
+
+# 조회 전용 비동기 뷰 (ASGI 배포용)
+urlpatterns = [
+    path('ingredient', async_views.AsyncIngredientView.as_view()),
+    path('ingredient/<int:pk>', async_views.AsyncSingleIngredientView.as_view()),
+
+    path('user-ingredient', async_views.AsyncUserIngredientView.as_view()),
+    path('user-ingredient/<int:pk>',
+         async_views.AsyncSingleUserIngredientView.as_view()),
+
+    path('user-cart', async_views.AsyncCartView.as_view()),
+    path('user-cart/<int:pk>', async_views.AsyncSingleCartView.as_view()),
+
+    path('recipe', async_views.AsyncRecipeView.as_view()),
+    path('recipe/<int:pk>', async_views.AsyncSingleRecipeView.as_view()),
+
+    path('recipe-ingredient', async_views.AsyncRecipeIngredientView.as_view()),
+    path('recipe-ingredient/<int:pk>',
+         async_views.AsyncSingleRecipeIngredientView.as_view()),
+
+    path('ingredient-recipe', async_views.AsyncIngredientRecipeView.as_view()),
+]
@@ -0,0 +1,135 @@
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.http import Http404
+from django.views import View
+from rest_framework.response import Response
+
+from . import views
+from .db_router import use_primary
+from .catalog_cache import CatalogCacheMixin, CATALOG_CACHE_TIMEOUT, acatalog_version, catalog_cache_key, not_modified_response, set_cache_headers
+
+
+# 조회 전용 비동기(ASGI) 뷰
+# view_class 로 지정한 기존 DRF 뷰의 queryset, 필터링, 정렬, 페이지네이션, 인증, 권한 설정을 그대로 사용
+# 인증(JWT/세션 사용자 조회)과 페이지네이션은 기존 코드를 스레드에서 실행하고, 나머지 조회는 Django async ORM 사용
+# URL: /api/async/<기존 URL>
+class AsyncReadView(View):
+    view_class = None
+
+    async def get(self, request, *args, **kwargs):
+        # JSON 만 사용 (view_class 에 지정된 JSON 렌더러)
+        view = self.view_class(renderer_classes=self.view_class.renderer_classes[:1])
+        view.args, view.kwargs = args, kwargs
+        view.headers = {}
+        view.format_kwarg = None
+        drf_request = view.initialize_request(request, *args, **kwargs)
+        view.request = drf_request
+
+        try:
+            await sync_to_async(view.initial)(drf_request, *args, **kwargs)
+            if isinstance(view, CatalogCacheMixin):
+                response = await self.get_cached_response(view, drf_request)
+            else:
+                response = Response(await self.get_data(view, drf_request))
+        except Exception as exc:
+            response = view.handle_exception(exc)
+
+        response = view.finalize_response(drf_request, response, *args, **kwargs)
+        return response.render()
+
+    async def get_cached_response(self, view, request):
+        version = await acatalog_version()
+        cache_key, etag = catalog_cache_key(request, version)
+
+        response = not_modified_response(request, etag, version)
+        if response is None:
+            data = await cache.aget(cache_key)
+            if data is None:
+                # CatalogCacheMixin 과 같이 캐시에 저장할 데이터는 default 에서 조회
+                with use_primary():
+                    data = await self.get_data(view, request)
+                await cache.aset(cache_key, data, CATALOG_CACHE_TIMEOUT)
+            response = Response(data)
+        return set_cache_headers(response, etag, version)
+
+    async def get_data(self, view, request):
+        # ?since= 동기화처럼 목록 조회를 직접 구현한 경우는 기존 코드 사용
+        sync_query_param = getattr(view, 'sync_query_param', None)
+        if sync_query_param and sync_query_param in request.query_params:
+            return (await sync_to_async(view.list)(request)).data
+
+        queryset = view.filter_queryset(view.get_queryset())
+
+        lookup_url_kwarg = view.lookup_url_kwarg or view.lookup_field
+        if lookup_url_kwarg in view.kwargs:
+            try:
+                obj = await queryset.aget(**{view.lookup_field: view.kwargs[lookup_url_kwarg]})
+            except (queryset.model.DoesNotExist, TypeError, ValueError):
+                raise Http404
+            view.check_object_permissions(request, obj)
+            return await self.serializer_data(view.get_serializer(obj))
+
+        if view.paginator is not None:
+            page = await sync_to_async(view.paginator.paginate_queryset)(queryset, request, view)
+            if page is not None:
+                serializer = view.get_serializer(page, many=True)
+                return view.paginator.get_paginated_response(await self.serializer_data(serializer)).data
+
+        row_serializer_class = getattr(view, 'row_serializer_class', None)
+        if row_serializer_class is not None:
+            rows = [row async for row in queryset.values_list(*row_serializer_class.fields)]
+            return row_serializer_class(queryset).to_representation(rows)
+
+        objects = [obj async for obj in queryset]
+        return await self.serializer_data(view.get_serializer(objects, many=True))
+
+    @staticmethod
+    async def serializer_data(serializer):
+        # 조회 중 DB 를 사용할 수 있는 serializer 는 adata 사용 (예: 저장된 레시피 문서가 없는 경우 생성)
+        if hasattr(serializer, 'adata'):
+            return await serializer.adata()
+        return serializer.data
+
+
+class AsyncIngredientView(AsyncReadView):
+    view_class = views.IngredientView
+
+
+class AsyncSingleIngredientView(AsyncReadView):
+    view_class = views.SingleIngredientView
+
+
+class AsyncUserIngredientView(AsyncReadView):
+    view_class = views.UserIngredientView
+
+
+class AsyncSingleUserIngredientView(AsyncReadView):
+    view_class = views.SingleUserIngredientView
+
+
+class AsyncCartView(AsyncReadView):
+    view_class = views.CartView
+
+
+class AsyncSingleCartView(AsyncReadView):
+    view_class = views.SingleCartView
+
+
+class AsyncRecipeView(AsyncReadView):
+    view_class = views.RecipeView
+
+
+class AsyncSingleRecipeView(AsyncReadView):
+    view_class = views.SingleRecipeView
+
+
+class AsyncRecipeIngredientView(AsyncReadView):
+    view_class = views.RecipeIngredientView
+
+
+class AsyncSingleRecipeIngredientView(AsyncReadView):
+    view_class = views.SingleRecipeIngredientView
+
+
+class AsyncIngredientRecipeView(AsyncReadView):
+    view_class = views.IngredientRecipeView
@@ -0,0 +1,70 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+USER_CACHE_TIMEOUT = 60 * 5
+
+
+def user_cache_key(user_id):
+    return f'jwt-user:{user_id}'
+
+
+def user_cache_fields(user_model):
+    # Model.from_db 에 넘길 수 있도록 모델 필드 순서 유지
+    fields = {'id', api_settings.USER_ID_FIELD, 'username',
+              'is_active', 'is_staff', 'is_superuser'}
+    if api_settings.CHECK_REVOKE_TOKEN:
+        fields.add('password')
+    return [field.attname for field in user_model._meta.concrete_fields if field.attname in fields]
+
+
+def invalidate_cached_user(user):
+    cache.delete(user_cache_key(getattr(user, api_settings.USER_ID_FIELD)))
+
+
+# JWT 인증 시 매 요청마다 User 를 DB 에서 조회하지 않도록 필요한 필드만 캐시
+# 캐시된 값으로 만든 User 는 나머지 필드가 지연 로딩(deferred)되므로 email 등에 접근하면 그때 조회
+# User 저장/삭제(비활성화, 비밀번호 변경, staff 변경 포함) 시 signals 에서 캐시 삭제
+# 캐시를 공유하지 않는 다른 프로세스에는 최대 USER_CACHE_TIMEOUT 동안 이전 값이 남을 수 있음
+class CachedJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification"))
+
+        user_model = get_user_model()
+        fields = user_cache_fields(user_model)
+        key = user_cache_key(user_id)
+        values = cache.get(key)
+        if values is None:
+            values = user_model.objects.filter(
+                **{api_settings.USER_ID_FIELD: user_id}).values_list(*fields).first()
+            if values is None:
+                raise AuthenticationFailed(
+                    _("User not found"), code="user_not_found")
+            cache.set(key, values, USER_CACHE_TIMEOUT)
+
+        user = user_model.from_db(
+            router.db_for_read(user_model), fields, values)
+
+        if not user.is_active:
+            raise AuthenticationFailed(
+                _("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
@@ -0,0 +1,157 @@
+import re
+from bisect import bisect_left
+from collections import namedtuple
+
+import numpy as np
+from unidecode import unidecode
+
+from .models import Ingredient
+from .versioning import VersionedSnapshot
+
+
+CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+JUNGSEONG = 'ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ'
+JONGSEONG = ['', 'ㄱ', 'ㄲ', 'ㄳ', 'ㄴ', 'ㄵ', 'ㄶ', 'ㄷ', 'ㄹ', 'ㄺ', 'ㄻ', 'ㄼ', 'ㄽ', 'ㄾ', 'ㄿ', 'ㅀ',
+             'ㅁ', 'ㅂ', 'ㅄ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
+# 입력 중인 글자(예: '달' -> '닭', '도' -> '돼')도 앞부분이 일치하도록 겹모음, 겹받침은 나눔
+COMPOUND_JAMO = {
+    'ㅘ': 'ㅗㅏ', 'ㅙ': 'ㅗㅐ', 'ㅚ': 'ㅗㅣ', 'ㅝ': 'ㅜㅓ', 'ㅞ': 'ㅜㅔ', 'ㅟ': 'ㅜㅣ', 'ㅢ': 'ㅡㅣ',
+    'ㄳ': 'ㄱㅅ', 'ㄵ': 'ㄴㅈ', 'ㄶ': 'ㄴㅎ', 'ㄺ': 'ㄹㄱ', 'ㄻ': 'ㄹㅁ', 'ㄼ': 'ㄹㅂ', 'ㄽ': 'ㄹㅅ',
+    'ㄾ': 'ㄹㅌ', 'ㄿ': 'ㄹㅍ', 'ㅀ': 'ㄹㅎ', 'ㅄ': 'ㅂㅅ',
+}
+HANGUL_BASE, HANGUL_COUNT = 0xAC00, 11172
+
+WORD_SEPARATOR = re.compile(r'[\s()\[\],/·_-]+')
+
+# 색인 항목 종류 (순위: 앞의 종류가 먼저)
+# 제목 시작 / 단어 시작 x 자모 / 초성 / 로마자
+KINDS = ['jamo', 'word_jamo', 'choseong', 'word_choseong', 'roman', 'word_roman']
+
+
+def decompose(text):
+    """
+    한글 음절을 자모로 분리 (겹모음, 겹받침도 분리), 나머지 문자는 소문자
+    '닭갈비' -> 'ㄷㅏㄹㄱㄱㅏㄹㅂㅣ'
+    """
+    chars = []
+    for char in text.lower():
+        code = ord(char) - HANGUL_BASE
+        if 0 <= code < HANGUL_COUNT:
+            for jamo in (CHOSEONG[code // 588], JUNGSEONG[code % 588 // 28], JONGSEONG[code % 28]):
+                chars.append(COMPOUND_JAMO.get(jamo, jamo))
+        else:
+            chars.append(COMPOUND_JAMO.get(char, char))
+    return ''.join(chars)
+
+
+def choseong(text):
+    """
+    한글 음절을 초성으로 변환, 나머지 문자는 소문자
+    '돼지고기' -> 'ㄷㅈㄱㄱ'
+    """
+    chars = []
+    for char in text.lower():
+        code = ord(char) - HANGUL_BASE
+        chars.append(CHOSEONG[code // 588] if 0 <= code < HANGUL_COUNT else char)
+    return ''.join(chars)
+
+
+def romanize(text):
+    # 슬러그와 같은 unidecode 로마자 표기 ('돼지고기' -> 'dwaejigogi')
+    return unidecode(text).lower()
+
+
+def has_hangul(text):
+    return any(0 <= ord(char) - HANGUL_BASE < HANGUL_COUNT or 'ㄱ' <= char <= 'ㅣ' for char in text)
+
+
+def word_suffixes(title):
+    # 제목 전체와 각 단어부터 시작하는 부분 (공백, 구분 문자 제거)
+    words = [word for word in WORD_SEPARATOR.split(title) if word]
+    return [''.join(words[i:]) for i in range(len(words))]
+
+
+# keys: 정렬된 색인 키 (자모, 초성은 hangul_keys, 로마자는 roman_keys)
+# ranks: 키별 순위 (종류 x 식재료 수 + 식재료 순위, 작을수록 먼저)
+# positions: 키별 식재료 위치
+# ingredient_ids, titles: 위치별 식재료 id, 제목 (짧은 제목, 제목 순)
+AutocompleteSnapshot = namedtuple('AutocompleteSnapshot', [
+    'hangul_keys', 'hangul_ranks', 'hangul_positions',
+    'roman_keys', 'roman_ranks', 'roman_positions',
+    'ingredient_ids', 'titles'])
+
+
+# 식재료 자동완성용 앞부분 일치 색인
+# 식재료 제목 전체와 각 단어 시작 부분을 자모, 초성, 로마자 키로 정렬해 두고 이진 탐색
+# 식재료 변경 시 signals 에서 버전을 바꾸면 다음 조회 때 다시 생성
+class IngredientAutocompleteIndex(VersionedSnapshot):
+    VERSION_KEY = 'ingredient-autocomplete-index-version'
+
+    def build(self):
+        ingredients = sorted(Ingredient.objects.values_list('id', 'title'),
+                             key=lambda ingredient: (len(ingredient[1]), ingredient[1], ingredient[0]))
+        count = len(ingredients)
+
+        hangul, roman = [], []
+        for pos, (_, title) in enumerate(ingredients):
+            for word, suffix in enumerate(word_suffixes(title)):
+                first = 0 if word == 0 else 1
+                hangul.append((decompose(suffix), (KINDS.index('jamo') + first) * count + pos, pos))
+                hangul.append((choseong(suffix), (KINDS.index('choseong') + first) * count + pos, pos))
+                roman.append((romanize(suffix).replace(' ', ''), (KINDS.index('roman') + first) * count + pos, pos))
+
+        return AutocompleteSnapshot(
+            *self.sorted_entries(hangul), *self.sorted_entries(roman),
+            np.array([ingredient[0] for ingredient in ingredients], dtype=np.int64),
+            [ingredient[1] for ingredient in ingredients])
+
+    @staticmethod
+    def sorted_entries(entries):
+        entries.sort()
+        return ([entry[0] for entry in entries],
+                np.array([entry[1] for entry in entries], dtype=np.int64),
+                np.array([entry[2] for entry in entries], dtype=np.int64))
+
+    @staticmethod
+    def prefix_range(keys, prefix):
+        return bisect_left(keys, prefix), bisect_left(keys, prefix + '\U0010ffff')
+
+    def search(self, query, limit=10):
+        """
+        query 로 시작하는 식재료 (제목 전체 또는 단어 시작, 자모/초성/로마자)
+        반환: [(ingredient id, title)], 제목 시작 일치, 짧은 제목, 제목 순
+        """
+        words = [word for word in WORD_SEPARATOR.split(query) if word]
+        if not words:
+            return []
+        query = ''.join(words)
+        snapshot = self.snapshot()
+
+        ranks, positions = [], []
+        lo, hi = self.prefix_range(snapshot.hangul_keys, decompose(query))
+        ranks.append(snapshot.hangul_ranks[lo:hi])
+        positions.append(snapshot.hangul_positions[lo:hi])
+        # 한글이 없는 입력은 로마자 표기로도 검색
+        if not has_hangul(query):
+            lo, hi = self.prefix_range(snapshot.roman_keys, romanize(query))
+            ranks.append(snapshot.roman_ranks[lo:hi])
+            positions.append(snapshot.roman_positions[lo:hi])
+        ranks = np.concatenate(ranks)
+        positions = np.concatenate(positions)
+
+        # 한 식재료가 여러 키로 일치할 수 있으므로 여유있게 고른 뒤 중복 제거
+        candidates = min(len(ranks), limit * len(KINDS))
+        while True:
+            if candidates < len(ranks):
+                top = np.argpartition(ranks, candidates - 1)[:candidates]
+            else:
+                top = np.arange(len(ranks))
+            top = top[np.argsort(ranks[top], kind='stable')]
+            found = list(dict.fromkeys(positions[top].tolist()))
+            if len(found) >= limit or candidates >= len(ranks):
+                break
+            candidates = min(len(ranks), candidates * 4)
+        return [(int(snapshot.ingredient_ids[pos]), snapshot.titles[pos]) for pos in found[:limit]]
+
+
+ingredient_autocomplete_index = IngredientAutocompleteIndex()
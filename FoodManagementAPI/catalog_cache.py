@@ -0,0 +1,89 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag, urlencode
+from rest_framework.response import Response
+
+from .db_router import use_primary
+from .versioning import new_version, cache_version, acache_version
+
+
+# 카탈로그(식재료, 레시피, 카테고리) 버전
+# 카탈로그 모델이 저장/삭제될 때마다 signals 에서 새 버전으로 변경 (admin 포함)
+# 캐시가 비워져도 이전 ETag 와 겹치지 않도록 버전은 임의 문자열 사용 (versioning.py)
+CATALOG_VERSION_KEY = 'catalog-version'
+CATALOG_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def new_catalog_version(previous=None):
+    # Last-Modified 는 초 단위이므로 같은 초에 여러 번 변경되어도 증가하도록 함
+    modified = int(time.time())
+    if previous is not None:
+        modified = max(modified, previous['modified'] + 1)
+    return {'version': new_version(), 'modified': modified}
+
+
+def catalog_version():
+    return cache_version(CATALOG_VERSION_KEY, new_catalog_version)
+
+
+async def acatalog_version():
+    return await acache_version(CATALOG_VERSION_KEY, new_catalog_version)
+
+
+def bump_catalog_version():
+    cache.set(CATALOG_VERSION_KEY, new_catalog_version(
+        cache.get(CATALOG_VERSION_KEY)), None)
+
+
+def catalog_cache_key(request, version):
+    """
+    (응답 캐시 키, ETag) 반환
+    캐시 키: 카탈로그 버전 + URL + 정렬된 쿼리 파라미터
+    """
+    query = urlencode(sorted(request.GET.lists()), doseq=True)
+    key = hashlib.sha1('\n'.join(
+        [version['version'], request.path, query]).encode('utf-8')).hexdigest()
+    return f'catalog-response:{key}', quote_etag(key)
+
+
+def not_modified_response(request, etag, version):
+    """
+    If-None-Match / If-Modified-Since 가 현재 버전과 같으면 304 응답, 아니면 None
+    """
+    return get_conditional_response(
+        request, etag=etag, last_modified=version['modified'])
+
+
+def set_cache_headers(response, etag, version):
+    if response.status_code in (200, 304):
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(version['modified'])
+        # 인증된 사용자용 응답이므로 공유 캐시에는 저장하지 않고, 매번 재검증
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+# 카탈로그 조회(GET) 응답 캐시
+# 조건부 요청이 현재 버전과 같으면 DB 조회 없이 304 반환
+# 캐시에 없으면 default 에서 조회 (지연된 복제 DB 의 이전 데이터가 새 버전으로 저장되지 않도록)
+class CatalogCacheMixin:
+    def get(self, request, *args, **kwargs):
+        version = catalog_version()
+        cache_key, etag = catalog_cache_key(request, version)
+
+        response = not_modified_response(request, etag, version)
+        if response is None:
+            cached = cache.get(cache_key)
+            if cached is None:
+                with use_primary():
+                    response = super().get(request, *args, **kwargs)
+                # 스트리밍 응답(?stream=true)은 저장하지 않음
+                if response.status_code == 200 and not response.streaming:
+                    cache.set(cache_key, response.data, CATALOG_CACHE_TIMEOUT)
+            else:
+                response = Response(cached)
+
+        return set_cache_headers(response, etag, version)
@@ -0,0 +1,160 @@
+import base64
+import json
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# 현재 요청의 읽기 DB (ReplicaRoutingMiddleware 에서 설정, None 이면 default)
+read_database = ContextVar('read_database', default=None)
+
+
+def replica_aliases():
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+@contextmanager
+def use_primary():
+    """
+    블록 안의 읽기는 default(primary) 사용 (복제 지연이 있으면 안 되는 조회)
+    """
+    token = read_database.set(None)
+    try:
+        yield
+    finally:
+        read_database.reset(token)
+
+
+def client_key(request):
+    """
+    쓰기 후 읽기 일관성(read-your-writes)을 위한 클라이언트 구분 값 (GET 요청에서 default 를 사용할지 확인)
+    JWT: 서명 검증 없이 payload 의 사용자 id 만 읽음 (읽기 DB 선택에만 사용, 인증은 DRF 에서 따로 검증)
+    pin 은 인증된 사용자로만 설정하므로 (ReplicaRoutingMiddleware.pin_keys) 다른 사용자의 id 로는 설정할 수 없음
+    세션: 세션 키, 둘 다 없으면 None
+    """
+    auth = request.META.get('HTTP_AUTHORIZATION', '').split()
+    if len(auth) == 2 and auth[0] in jwt_settings.AUTH_HEADER_TYPES:
+        try:
+            payload = auth[1].split('.')[1]
+            claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+            return f'user:{claims[jwt_settings.USER_ID_CLAIM]}'
+        except (IndexError, KeyError, TypeError, ValueError):
+            return None
+    session_key = request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    return f'session:{session_key}' if session_key else None
+
+
+def pin_cache_key(key):
+    return f'replica-pin:{key}'
+
+
+# 읽기 전용 복제 DB 선택 미들웨어
+# GET/HEAD/OPTIONS 요청의 읽기는 DATABASE_REPLICAS 중 하나 (요청 안에서는 같은 복제 DB)
+# 쓰기 요청(POST/PUT/PATCH/DELETE)이 성공한 사용자는 REPLICA_STICKY_SECONDS 동안 모든 읽기를 default 에서 처리
+# DATABASE_REPLICAS 가 비어 있으면 아무것도 하지 않음
+# ASGI 에서는 비동기로 실행 (동기 미들웨어가 있으면 요청마다 스레드로 전환됨)
+class ReplicaRoutingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sticky_seconds = getattr(settings, 'REPLICA_STICKY_SECONDS', 5)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        replicas = replica_aliases()
+        if not replicas:
+            return self.get_response(request)
+
+        database = None
+        if request.method in SAFE_METHODS:
+            key = client_key(request)
+            if not (key and cache.get(pin_cache_key(key))):
+                database = random.choice(replicas)
+
+        token = read_database.set(database)
+        try:
+            response = self.get_response(request)
+        finally:
+            read_database.reset(token)
+
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            pins = self.pin_keys(request)
+            if pins:
+                cache.set_many(pins, self.sticky_seconds)
+        return response
+
+    async def __acall__(self, request):
+        replicas = replica_aliases()
+        if not replicas:
+            return await self.get_response(request)
+
+        database = None
+        if request.method in SAFE_METHODS:
+            key = client_key(request)
+            if not (key and await cache.aget(pin_cache_key(key))):
+                database = random.choice(replicas)
+
+        token = read_database.set(database)
+        try:
+            response = await self.get_response(request)
+        finally:
+            read_database.reset(token)
+
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            # 세션 사용자는 request.user 확인에 DB 조회가 필요할 수 있으므로 스레드에서 실행
+            pins = await sync_to_async(self.pin_keys)(request)
+            if pins:
+                await cache.aset_many(pins, self.sticky_seconds)
+        return response
+
+    @staticmethod
+    def pin_keys(request):
+        """
+        쓰기 요청 후 default 에서 읽을 클라이언트의 {pin 캐시 키: True}
+        인증된 사용자만 (DRF 가 인증한 사용자는 HttpRequest 의 request.user 에도 설정됨, 인증 실패는 AnonymousUser)
+        세션으로 로그인한 사용자는 세션 키도 함께 설정 (GET 요청에서는 인증 전에 client_key 로 확인)
+        """
+        user = getattr(request, 'user', None)
+        if user is None or not user.is_authenticated:
+            return {}
+        keys = [f'user:{user.pk}']
+        session = getattr(request, 'session', None)
+        if session is not None and session.session_key and session.get(SESSION_KEY) == str(user.pk):
+            keys.append(f'session:{session.session_key}')
+        return {pin_cache_key(key): True for key in keys}
+
+
+# 읽기는 ReplicaRoutingMiddleware 가 선택한 DB, 쓰기와 migrate 는 default
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return read_database.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in replica_aliases():
+            return False
+        return None
@@ -0,0 +1,189 @@
+import os
+import signal
+import socket
+import threading
+import time
+import traceback
+from collections import namedtuple
+from contextvars import ContextVar
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .models import Job
+
+
+# 실행 중인 worker 가 heartbeat 를 갱신하는 간격 (초)
+HEARTBEAT_SECONDS = getattr(settings, 'JOB_HEARTBEAT_SECONDS', 30)
+# heartbeat 가 이 시간(초) 이상 갱신되지 않은 running 작업은 worker 가 멈춘 것으로 보고 다시 queued
+STALE_SECONDS = getattr(settings, 'JOB_STALE_SECONDS', 300)
+# 진행 상황을 DB 에 쓰는 최소 간격 (초)
+PROGRESS_INTERVAL = getattr(settings, 'JOB_PROGRESS_INTERVAL', 1.0)
+
+# func: 작업 함수 (kwargs 를 받음, 반환값은 JSON 으로 저장)
+# max_attempts: 최대 실행 횟수, concurrency: 동시에 실행할 수 있는 최대 수 (None 이면 제한 없음)
+# retry_delay: 첫 재시도까지 기다리는 초 (재시도마다 2배)
+Task = namedtuple('Task', ['func', 'max_attempts', 'concurrency', 'retry_delay'])
+
+# 작업 이름 -> Task (tasks.py 에서 등록)
+tasks = {}
+
+# 현재 worker 가 실행 중인 작업 (report_progress 에서 사용)
+current_job = ContextVar('current_job', default=None)
+
+
+def task(name, max_attempts=3, concurrency=None, retry_delay=30):
+    def register(func):
+        tasks[name] = Task(func, max_attempts, concurrency, retry_delay)
+        return func
+    return register
+
+
+def enqueue(name, key='', delay=0, **kwargs):
+    """
+    작업 추가, 트랜잭션 안에서 호출하면 커밋 후에 실행됨 (롤백하면 함께 취소)
+    key: 같은 key 로 대기 중인 작업이 있으면 추가하지 않고 그 작업 반환
+    delay: 실행까지 기다리는 초
+    """
+    if name not in tasks:
+        raise KeyError(f'unknown job: {name}')
+    if key:
+        job = Job.objects.filter(key=key, status=Job.QUEUED).first()
+        if job is not None:
+            return job
+    return Job.objects.create(name=name, kwargs=kwargs, key=key, max_attempts=tasks[name].max_attempts,
+                              run_at=timezone.now() + timedelta(seconds=delay))
+
+
+def report_progress(done, total=None, message=''):
+    """
+    작업 함수에서 진행 상황 보고 (total 이 있으면 done / total, 없으면 done 을 0~1 값으로 사용)
+    PROGRESS_INTERVAL 마다 한 번만 저장, worker 밖에서 호출하면 무시
+    """
+    state = current_job.get()
+    if state is None:
+        return
+    now = time.monotonic()
+    progress = min(1.0, done / total if total else done)
+    if now - state['reported'] < PROGRESS_INTERVAL and progress < 1.0:
+        return
+    state['reported'] = now
+    Job.objects.filter(pk=state['job'].pk, status=Job.RUNNING).update(
+        progress=progress, message=message[:255], heartbeat=timezone.now())
+
+
+# 작업을 가져와서 실행하는 worker (run_jobs 명령에서 프로세스마다 하나씩 실행)
+# 작업 가져오기: status=queued 인 행을 조건부 UPDATE 로 running 으로 바꾼 worker 만 실행 (SELECT ... FOR UPDATE 없이 모든 DB 에서 동작)
+# 실패하면 traceback 을 저장하고 retry_delay x 2^(실행 횟수 - 1) 초 뒤에 다시 queued, max_attempts 를 넘으면 failed
+class Worker:
+    claim_batch_size = 10
+
+    def __init__(self, name=None, poll_interval=1.0):
+        self.name = name or f'{socket.gethostname()}:{os.getpid()}'
+        self.poll_interval = poll_interval
+        self.stopping = threading.Event()
+
+    def stop(self, *args):
+        # 실행 중인 작업은 끝까지 실행하고 종료
+        self.stopping.set()
+
+    def install_signal_handlers(self):
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+    def run(self, burst=False):
+        """
+        stop() 이 호출될 때까지 작업 실행, burst 이면 실행할 작업이 없을 때 종료
+        실행한 작업 수 반환
+        """
+        count = 0
+        while not self.stopping.is_set():
+            self.requeue_stale()
+            job = self.claim()
+            if job is None:
+                if burst:
+                    break
+                self.stopping.wait(self.poll_interval)
+                continue
+            self.execute(job)
+            count += 1
+        return count
+
+    def requeue_stale(self):
+        stale = Job.objects.filter(status=Job.RUNNING, heartbeat__lt=timezone.now() - timedelta(seconds=STALE_SECONDS))
+        stale.filter(attempts__gte=F('max_attempts')).update(
+            status=Job.FAILED, error='worker stopped responding', finished_at=timezone.now())
+        stale.update(status=Job.QUEUED, worker='', run_at=timezone.now())
+
+    def claim(self):
+        now = timezone.now()
+        running = dict(Job.objects.filter(status=Job.RUNNING).values('name').annotate(
+            count=Count('id')).values_list('name', 'count'))
+        available = [name for name, registered in tasks.items()
+                     if registered.concurrency is None or running.get(name, 0) < registered.concurrency]
+        candidates = Job.objects.filter(status=Job.QUEUED, run_at__lte=now, name__in=available).order_by(
+            'run_at', 'id').values_list('id', 'name')[:self.claim_batch_size]
+
+        for pk, name in candidates:
+            claimed = Job.objects.filter(pk=pk, status=Job.QUEUED).update(
+                status=Job.RUNNING, worker=self.name, attempts=F('attempts') + 1,
+                heartbeat=now, started_at=now, progress=0, message='')
+            if not claimed:
+                continue
+            # 다른 worker 가 같은 작업 종류를 동시에 가져가서 제한을 넘으면 되돌림
+            concurrency = tasks[name].concurrency
+            if concurrency is not None and Job.objects.filter(name=name, status=Job.RUNNING).count() > concurrency:
+                Job.objects.filter(pk=pk, worker=self.name).update(
+                    status=Job.QUEUED, worker='', attempts=F('attempts') - 1)
+                continue
+            return Job.objects.get(pk=pk)
+        return None
+
+    def execute(self, job):
+        registered = tasks[job.name]
+        mine = Job.objects.filter(pk=job.pk, status=Job.RUNNING, worker=self.name)
+        beating = threading.Event()
+        heartbeat = threading.Thread(target=self.heartbeat, args=(mine, beating), daemon=True)
+        heartbeat.start()
+
+        token = current_job.set({'job': job, 'reported': 0.0})
+        try:
+            result = registered.func(**job.kwargs)
+        except Exception:
+            error = traceback.format_exc()
+            if job.attempts < job.max_attempts:
+                retry_at = timezone.now() + timedelta(seconds=registered.retry_delay * 2 ** (job.attempts - 1))
+                mine.update(status=Job.QUEUED, worker='', run_at=retry_at, error=error)
+            else:
+                mine.update(status=Job.FAILED, error=error, finished_at=timezone.now())
+        else:
+            mine.update(status=Job.SUCCEEDED, progress=1.0, result=result, error='', finished_at=timezone.now())
+        finally:
+            current_job.reset(token)
+            beating.set()
+            heartbeat.join()
+
+    @staticmethod
+    def heartbeat(mine, beating):
+        # 진행 상황을 보고하지 않는 긴 작업도 STALE_SECONDS 안에 heartbeat 갱신 (스레드별 DB 연결 사용)
+        try:
+            while not beating.wait(HEARTBEAT_SECONDS):
+                mine.update(heartbeat=timezone.now())
+        finally:
+            connection.close()
+
+
+def run_worker(name, poll_interval, burst):
+    # run_jobs 명령의 worker 프로세스 (spawn 으로 시작한 프로세스는 django 초기화 필요)
+    import django
+    django.setup()
+
+    worker = Worker(name, poll_interval)
+    worker.install_signal_handlers()
+    try:
+        worker.run(burst=burst)
+    finally:
+        connection.close()
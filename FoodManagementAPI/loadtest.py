@@ -0,0 +1,50 @@
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+# 부하 테스트 도구
+# make_request(i) 로 만든 요청 requests 개를 concurrency 개의 스레드로 동시에 보내고 처리량, 지연 시간 백분위수 계산
+def run_requests(make_request, concurrency=16, requests=1000, timeout=30):
+    def fetch(i):
+        request = make_request(i)
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                response.read()
+                ok = 200 <= response.status < 400
+        except (urllib.error.URLError, OSError):
+            ok = False
+        return time.perf_counter() - started, ok
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(fetch, range(requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies = np.array([latency for latency, _ in results]) * 1000
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (0, 0, 0)
+    return {
+        'requests': requests,
+        'errors': sum(1 for _, ok in results if not ok),
+        'rps': requests / elapsed if elapsed else 0,
+        'p50': p50,
+        'p95': p95,
+        'p99': p99,
+        'max': latencies.max() if len(latencies) else 0,
+    }
+
+
+# url 에 같은 GET 요청 반복
+def run_load(url, headers=None, concurrency=16, requests=1000, timeout=30):
+    headers = headers or {}
+    return run_requests(lambda _: urllib.request.Request(url, headers=headers),
+                        concurrency, requests, timeout)
+
+
+def format_result(name, result):
+    return (f"{name:<40} {result['rps']:>9.1f} req/s  p50 {result['p50']:>8.1f}ms  "
+            f"p95 {result['p95']:>8.1f}ms  p99 {result['p99']:>8.1f}ms  errors {result['errors']}")
@@ -0,0 +1,45 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from FoodManagementAPI.loadtest import run_load, format_result
+
+
+DEFAULT_ROUTES = ['ingredient', 'recipe', 'recipe?cursor=', 'user-ingredient',
+                  'user-cart', 'ingredient-recipe?search=%EC%96%91%ED%8C%8C']
+
+
+# 설명: 같은 조회 요청을 WSGI 서버(/api/...)와 ASGI 서버(/api/async/...)에 동시에 보내고 처리량, p99 지연 시간 비교
+# 사용법:
+#   gunicorn FoodManagement.wsgi -w 4 -b 127.0.0.1:8000
+#   uvicorn FoodManagement.asgi:application --workers 4 --port 8001
+#   python manage.py benchmark_async --username <str> --wsgi-url http://127.0.0.1:8000 --asgi-url http://127.0.0.1:8001
+class Command(BaseCommand):
+    help = 'Compare read endpoint throughput and latency between WSGI and ASGI deployments'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--wsgi-url', default='http://127.0.0.1:8000')
+        parser.add_argument('--asgi-url', default='http://127.0.0.1:8001')
+        parser.add_argument('--username', help='user to issue a JWT for')
+        parser.add_argument('--token', help='JWT access token')
+        parser.add_argument('--concurrency', type=int, default=32)
+        parser.add_argument('--requests', type=int, default=1000)
+        parser.add_argument('--routes', nargs='+', default=DEFAULT_ROUTES)
+
+    def handle(self, *args, **options):
+        token = options['token']
+        if token is None:
+            if not options['username']:
+                raise CommandError('--username or --token is required')
+            try:
+                token = str(AccessToken.for_user(
+                    User.objects.get(username=options['username'])))
+            except User.DoesNotExist:
+                raise CommandError(f"user '{options['username']}' does not exist")
+        headers = {'Authorization': f'Bearer {token}'}
+
+        for route in options['routes']:
+            for name, url in [('wsgi', f"{options['wsgi_url']}/api/{route}"),
+                              ('asgi', f"{options['asgi_url']}/api/async/{route}")]:
+                result = run_load(url, headers, options['concurrency'], options['requests'])
+                self.stdout.write(format_result(f'{name} {route}', result))
@@ -0,0 +1,188 @@
+import json
+import random
+import urllib.request
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.permissions import IsAdminUser
+from rest_framework_simplejwt.tokens import AccessToken
+
+from FoodManagementAPI import urls
+from FoodManagementAPI.loadtest import run_requests, format_result
+from FoodManagementAPI.models import IngredientCategory, Ingredient, UserIngredient, RecipeCategory, Recipe, RecipeIngredient, Cart
+
+
+# 목록 URL 의 쿼리 파라미터별 추가 측정
+EXTRA_ROUTES = ['recipe?cursor=', 'recipe?page=50', 'recipe?search=%EB%B3%B6%EC%9D%8C',
+                'ingredient?search=%EC%96%91%ED%8C%8C', 'ingredient-recipe?search=%EC%96%91%ED%8C%8C',
+                'ingredient/autocomplete?q=%EC%96%91', 'ingredient/autocomplete?q=%E3%84%B7%E3%85%8D']
+
+# 쓰기 전용 URL 의 요청 본문 (--include-writes), 같은 요청을 반복해도 데이터가 계속 늘지 않도록 구성
+WRITE_BODIES = {
+    'user-ingredient/batch': lambda sample: [
+        {'ingredient_id': sample['pantry'].ingredient_id, 'quantity': str(sample['pantry'].quantity),
+         'start': sample['pantry'].start.isoformat(), 'end': sample['pantry'].end.isoformat()}],
+    'user-cart/batch': lambda sample: [
+        {'ingredient_id': sample['cart'].ingredient_id, 'buy': sample['cart'].buy}],
+    'user-cart/recipe': lambda sample: {'recipe_ids': [sample['recipe_id']]},
+}
+
+
+# 설명: FoodManagementAPI/urls.py 의 모든 URL 에 JWT 인증 요청을 보내고 URL 별 처리량, 지연 시간 백분위수 출력
+# 사용법:
+#   python manage.py seed_data --seed 0
+#   gunicorn FoodManagement.wsgi -w 4 -b 127.0.0.1:8000 (또는 python manage.py runserver --noreload)
+#   python manage.py benchmark_routes [--staff-username <str>] [--include-writes] [--save result.json] [--baseline old.json]
+# 서버와 같은 DB 설정으로 실행 (요청에 사용할 사용자, id 를 DB 에서 선택)
+# SQLite 는 DB_ENGINE=sqlite, MySQL 은 DB_* 환경 변수로 서버와 이 명령을 함께 실행해서 비교
+# 요청은 --users 명의 사용자가 번갈아 보냄, <int:pk> 는 해당 사용자의 데이터 또는 임의의 카탈로그 id 사용
+# staff 권한이 필요한 URL 은 --staff-username, 쓰기 전용 URL 은 --include-writes 가 있을 때만 측정
+# SQLite 는 동시 쓰기를 하나씩 처리하므로 --include-writes 결과는 MySQL 과 차이가 큼
+# throttle(throttling.py)에 거부된 요청(429)도 errors 에 포함, 처리량을 측정할 때는 서버의 THROTTLE_* 예산을 늘려서 실행
+class Command(BaseCommand):
+    help = 'Load test every API route with authenticated JWT traffic'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000/api')
+        parser.add_argument('--username-prefix', default='seed-user-')
+        parser.add_argument('--users', type=int, default=50,
+                            help='number of users sending requests')
+        parser.add_argument('--staff-username')
+        parser.add_argument('--concurrency', type=int, default=16)
+        parser.add_argument('--requests', type=int, default=500,
+                            help='requests per route')
+        parser.add_argument('--routes', nargs='+',
+                            help='only routes containing one of these strings')
+        parser.add_argument('--include-writes', action='store_true')
+        parser.add_argument('--save', help='write results to a JSON file')
+        parser.add_argument('--baseline', help='compare with a JSON file written by --save')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        self.base_url = options['base_url'].rstrip('/')
+
+        self.samples = self.user_samples(options['username_prefix'], options['users'])
+        self.staff_samples = None
+        if options['staff_username']:
+            try:
+                staff = User.objects.get(username=options['staff_username'], is_staff=True)
+            except User.DoesNotExist:
+                raise CommandError(f"staff user '{options['staff_username']}' does not exist")
+            self.staff_samples = [dict(self.samples[0], headers=self.auth_headers(staff))]
+        self.catalog = {
+            model: self.sample_ids(model)
+            for model in [IngredientCategory, Ingredient, RecipeCategory, Recipe, RecipeIngredient]
+        }
+
+        baseline = {}
+        if options['baseline']:
+            with open(options['baseline'], encoding='utf-8') as f:
+                baseline = json.load(f)
+
+        results = {}
+        for route, view_class in self.routes():
+            if options['routes'] and not any(name in route for name in options['routes']):
+                continue
+            targets = self.targets(route, view_class, options['include_writes'])
+            if isinstance(targets, str):
+                self.stdout.write(f'{route:<40} skipped ({targets})')
+                continue
+
+            result = run_requests(lambda i: targets[i % len(targets)](),
+                                  options['concurrency'], options['requests'])
+            results[route] = {key: float(value) for key, value in result.items()}
+            line = format_result(route, result)
+            if route in baseline:
+                line += '  ' + self.compare(result, baseline[route])
+            self.stdout.write(line)
+
+        if options['save']:
+            with open(options['save'], 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+
+    @staticmethod
+    def auth_headers(user):
+        return {'Authorization': f'Bearer {AccessToken.for_user(user)}'}
+
+    def sample_ids(self, model, size=1000):
+        ids = list(model.objects.order_by('?').values_list('id', flat=True)[:size])
+        if not ids:
+            raise CommandError(f'no {model._meta.model_name} rows, run seed_data first')
+        return ids
+
+    def user_samples(self, prefix, count):
+        users = list(User.objects.filter(
+            username__startswith=prefix, is_staff=False).order_by('id')[:count])
+        recipe_ids = self.sample_ids(Recipe)
+        samples = []
+        for user in users:
+            pantry = UserIngredient.objects.filter(user=user).order_by('?').first()
+            cart = Cart.objects.filter(user=user).order_by('?').first()
+            if pantry is None or cart is None:
+                continue
+            samples.append({'headers': self.auth_headers(user), 'pantry': pantry, 'cart': cart,
+                            'recipe_id': self.random.choice(recipe_ids)})
+        if not samples:
+            raise CommandError(
+                f"no users named '{prefix}*' with pantry and cart items, run seed_data first")
+        return samples
+
+    def routes(self):
+        view_classes = {str(pattern.pattern): pattern.callback.view_class
+                        for pattern in urls.urlpatterns}
+        yield from view_classes.items()
+        for route in EXTRA_ROUTES:
+            yield route, view_classes[route.split('?')[0]]
+
+    def targets(self, route, view_class, include_writes):
+        """
+        요청을 만드는 함수 목록 반환, 측정하지 않는 URL 이면 이유(str) 반환
+        """
+        path = route.split('?')[0]
+        if hasattr(view_class, 'get'):
+            method, body = 'GET', None
+        elif path in WRITE_BODIES:
+            if not include_writes:
+                return 'write-only, use --include-writes'
+            method, body = 'POST', WRITE_BODIES[path]
+        else:
+            return 'no GET handler'
+
+        samples = self.samples
+        if IsAdminUser in getattr(view_class, 'permission_classes', []):
+            if self.staff_samples is None:
+                return 'staff only, use --staff-username'
+            samples = self.staff_samples
+
+        model = getattr(getattr(view_class.serializer_class, 'Meta', None), 'model', None)
+        targets = []
+        for i in range(max(len(samples), 20)):
+            sample = samples[i % len(samples)]
+            url = route
+            if '<int:pk>' in route:
+                if model is UserIngredient:
+                    pk = sample['pantry'].pk
+                elif model is Cart:
+                    pk = sample['cart'].pk
+                else:
+                    pk = self.random.choice(self.catalog[model])
+                url = route.replace('<int:pk>', str(pk))
+            targets.append(self.request_factory(
+                f'{self.base_url}/{url}', method, sample, body))
+        return targets
+
+    @staticmethod
+    def request_factory(url, method, sample, body):
+        headers = dict(sample['headers'])
+        data = None
+        if body is not None:
+            data = json.dumps(body(sample)).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+        return lambda: urllib.request.Request(url, data=data, headers=headers, method=method)
+
+    @staticmethod
+    def compare(result, baseline):
+        rps = (result['rps'] / baseline['rps'] - 1) * 100 if baseline['rps'] else 0
+        p95 = (result['p95'] / baseline['p95'] - 1) * 100 if baseline['p95'] else 0
+        return f'(rps {rps:+.0f}%, p95 {p95:+.0f}%)'
@@ -0,0 +1,64 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from FoodManagementAPI import views
+from FoodManagementAPI.renderers import FastJSONRenderer
+
+
+VIEWS = {
+    'ingredient': views.IngredientView,
+    'recipe-ingredient': views.RecipeIngredientView,
+}
+
+
+# 설명: 목록 조회 직렬화 속도 비교 (ModelSerializer + JSONRenderer / RowSerializer + FastJSONRenderer)
+# 사용법: python manage.py benchmark_serialization [--views ingredient recipe-ingredient] [--limit 100000] [--repeat 3]
+# 두 방식의 출력이 같은 바이트인지 확인하고, 단계별(조회+직렬화, 렌더링) 초당 행 수 출력 (repeat 중 가장 빠른 값)
+# 데이터가 없으면 seed_data 먼저 실행
+class Command(BaseCommand):
+    help = 'Compare rows/second of ModelSerializer and row serialization for list endpoints'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--views', nargs='+', choices=list(VIEWS), default=list(VIEWS))
+        parser.add_argument('--limit', type=int, default=100000)
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def handle(self, *args, **options):
+        for name in options['views']:
+            view_class = VIEWS[name]
+            queryset = view_class.queryset.order_by(*view_class.ordering)[:options['limit']]
+
+            def serializer_path():
+                return view_class.serializer_class(queryset, many=True).data
+
+            def row_path():
+                return view_class.row_serializer_class(queryset).data
+
+            results = {}
+            for path, serialize, renderer in [('serializer', serializer_path, JSONRenderer()),
+                                              ('row', row_path, FastJSONRenderer())]:
+                serialize_time, render_time = float('inf'), float('inf')
+                for _ in range(options['repeat']):
+                    started = time.perf_counter()
+                    data = serialize()
+                    serialized = time.perf_counter()
+                    content = renderer.render(data)
+                    serialize_time = min(serialize_time, serialized - started)
+                    render_time = min(render_time, time.perf_counter() - serialized)
+                results[path] = (len(data), serialize_time, render_time, content)
+
+            rows = results['serializer'][0]
+            if not rows:
+                raise CommandError(f'no {name} rows, run seed_data first')
+            if results['serializer'][3] != results['row'][3]:
+                raise CommandError(f'{name}: row serialization output differs from serializer output')
+
+            for path, (_, serialize_time, render_time, _) in results.items():
+                self.stdout.write(
+                    f'{name:<18} {path:<10} rows={rows}  serialize {rows / serialize_time:>10.0f} rows/s  '
+                    f'render {rows / render_time:>10.0f} rows/s  total {rows / (serialize_time + render_time):>10.0f} rows/s')
+            old, new = results['serializer'], results['row']
+            self.stdout.write(self.style.SUCCESS(
+                f'{name:<18} speedup x{(old[1] + old[2]) / (new[1] + new[2]):.1f} (identical output, {len(new[3])} bytes)'))
@@ -0,0 +1,101 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from FoodManagementAPI.models import Recipe, RecipeIngredient
+from FoodManagementAPI.recipe_index import recipe_ingredient_index
+from FoodManagementAPI.similarity_index import (
+    BANDS, EMPTY_SIGNATURE, NUM_PERM, RecipeSimilarityIndex, compute_signatures, recipe_similarity_index,
+    save_signatures)
+
+
+# 설명: 전체 레시피의 MinHash 서명(RecipeSignature) 생성
+# 사용법: python manage.py build_similarity_index [--batch-size 5000] [--evaluate 200] [--bands 64] [--min-similarity 0.1]
+# --evaluate N: 임의의 레시피 N 개에 대해 전체 레시피와 정확한 Jaccard 유사도를 계산한 결과와 비교해서
+#               top-10 재현율과 조회 시간 출력 (--bands, --min-similarity 로 설정별 비교)
+# 이후에는 레시피 식재료가 변경될 때 signals 에서 해당 레시피만 갱신
+class Command(BaseCommand):
+    help = 'Build MinHash signatures for the similar recipe index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--evaluate', type=int, default=0, metavar='N')
+        parser.add_argument('--bands', type=int, default=BANDS)
+        parser.add_argument('--min-similarity', type=float, default=0.1)
+        parser.add_argument('--skip-build', action='store_true',
+                            help='only evaluate the existing signatures')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+
+        if not options['skip_build']:
+            self.build(options['batch_size'], options['verbosity'])
+        if options['evaluate']:
+            self.evaluate(options['evaluate'], options['bands'], options['min_similarity'])
+
+    def build(self, batch_size, verbosity):
+        started = time.monotonic()
+        last_id, count = 0, 0
+        while True:
+            recipe_ids = list(Recipe.objects.filter(id__gt=last_id).order_by(
+                'id').values_list('id', flat=True)[:batch_size])
+            if not recipe_ids:
+                break
+            last_id = recipe_ids[-1]
+
+            pairs = list(RecipeIngredient.objects.filter(recipe_id__gte=recipe_ids[0], recipe_id__lte=last_id)
+                         .order_by('recipe_id').values_list('recipe_id', 'ingredient_id'))
+            found_ids, sizes, signatures = compute_signatures(pairs)
+            empty_ids = np.setdiff1d(np.array(recipe_ids, dtype=np.int64), found_ids)
+            with transaction.atomic():
+                save_signatures(found_ids, sizes, signatures)
+                save_signatures(empty_ids, np.zeros(len(empty_ids), dtype=np.int64),
+                                np.tile(EMPTY_SIGNATURE, (len(empty_ids), 1)))
+            count += len(recipe_ids)
+            if verbosity > 1:
+                self.stdout.write(f'{count} recipes')
+
+        RecipeSimilarityIndex.invalidate()
+        self.stdout.write(self.style.SUCCESS(
+            f'{count} recipes, num_perm={NUM_PERM}, bands={BANDS}, elapsed={time.monotonic() - started:.2f}s'))
+
+    def evaluate(self, sample_size, bands, min_similarity, k=10):
+        started = time.perf_counter()
+        recipe_similarity_index.snapshot()
+        self.stdout.write(f'index load {(time.perf_counter() - started) * 1000:.0f}ms')
+
+        # 정확한 Jaccard 유사도는 레시피 x 식재료 역색인으로 계산
+        snapshot = recipe_ingredient_index.snapshot()
+        if not len(snapshot.recipe_ids):
+            raise CommandError('no recipe ingredients')
+        rng = np.random.default_rng(0)
+        sample = rng.choice(len(snapshot.recipe_ids), min(sample_size, len(snapshot.recipe_ids)), replace=False)
+
+        recalls, latencies = [], []
+        for pos in sample.tolist():
+            recipe_id = int(snapshot.recipe_ids[pos])
+            ingredients = snapshot.recipe_ingredients[snapshot.recipe_indptr[pos]:snapshot.recipe_indptr[pos + 1]]
+            shared = np.bincount(np.concatenate([snapshot.postings[int(i)] for i in ingredients]),
+                                 minlength=len(snapshot.recipe_ids))
+            jaccard = shared / (snapshot.recipe_sizes + len(ingredients) - shared)
+            jaccard[pos] = 0
+            # 유사도가 k 번째와 같은 레시피는 모두 정답으로 인정
+            candidates = np.flatnonzero(jaccard >= min_similarity)
+            if len(candidates) > k:
+                candidates = candidates[jaccard[candidates] >= np.sort(jaccard[candidates])[-k]]
+            exact = set(snapshot.recipe_ids[candidates].tolist())
+
+            started = time.perf_counter()
+            found = recipe_similarity_index.similar(recipe_id, limit=k, min_similarity=min_similarity, bands=bands)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if exact:
+                recalls.append(len(exact & {found_id for found_id, _ in found}) / min(len(exact), k))
+
+        p50, p99 = np.percentile(latencies, [50, 99])
+        recall = np.mean(recalls) if recalls else float('nan')
+        self.stdout.write(self.style.SUCCESS(
+            f'bands={bands} min_similarity={min_similarity}: recall@{k} {recall:.3f} '
+            f'({len(recalls)} recipes with neighbours), lookup p50 {p50:.2f}ms p99 {p99:.2f}ms'))
@@ -0,0 +1,38 @@
+import time
+from datetime import date
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from FoodManagementAPI.analytics import ANALYTICS_CACHE_KEY, ANALYTICS_CACHE_TIMEOUT, compute_pantry_analytics
+
+
+# 설명: 사용자 식재료/장바구니 통계를 계산해서 캐시에 저장 (/api/stats/pantry)
+# 사용법: python manage.py compute_pantry_analytics [--date YYYY-MM-DD] [--top 20]
+# cron 등으로 PANTRY_ANALYTICS_CACHE_TIMEOUT(기본 1시간)보다 짧은 주기로 실행하면 조회 시 계산하지 않음
+# --date 가 오늘이 아니면 결과만 출력하고 캐시에는 저장하지 않음 (/api/stats/pantry 는 오늘 기준)
+class Command(BaseCommand):
+    help = 'Compute pantry waste, shelf life and cart conversion analytics'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', type=date.fromisoformat,
+                            help='reference date for expiry (default: today)')
+        parser.add_argument('--top', type=int, default=20)
+
+    def handle(self, *args, **options):
+        if options['top'] < 1:
+            raise CommandError('--top must be positive')
+
+        started = time.monotonic()
+        report_date = options['date']
+        report = compute_pantry_analytics(report_date, options['top'])
+        cached = report_date is None or report_date == timezone.localdate()
+        if cached:
+            cache.set(ANALYTICS_CACHE_KEY, report, ANALYTICS_CACHE_TIMEOUT)
+
+        totals = report['totals']
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(report['categories'])} categories, pantry_items={totals['pantry_items']}, "
+            f"waste_rate={totals['waste_rate']}, conversion_rate={totals['conversion_rate']}, "
+            f'elapsed={time.monotonic() - started:.2f}s' + ('' if cached else ' (not cached)')))
@@ -0,0 +1,258 @@
+import csv
+import json
+import sys
+import time
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.text import slugify
+
+from unidecode import unidecode
+
+from FoodManagementAPI.models import IngredientCategory, Ingredient, RecipeCategory, Recipe, RecipeIngredient
+from FoodManagementAPI.recipe_index import RecipeIngredientIndex
+from FoodManagementAPI.autocomplete import IngredientAutocompleteIndex
+from FoodManagementAPI.similarity_index import update_recipe_signatures
+from FoodManagementAPI.recipe_documents import invalidate_recipe_documents
+from FoodManagementAPI.search import update_title_index
+from FoodManagementAPI.catalog_cache import bump_catalog_version
+
+
+FIELDS = ['recipe_code', 'recipe_title', 'recipe_category',
+          'ingredient_title', 'ingredient_category']
+
+
+# 설명: 레시피/식재료 카탈로그 일괄 등록
+# 사용법: python manage.py import_catalog <path> [--format csv|jsonl] [--batch-size 1000]
+# 한 줄에 레시피 식재료 하나: recipe_code, recipe_title, recipe_category, ingredient_title, ingredient_category
+# 레시피 항목만 있으면 레시피만, 식재료 항목만 있으면 식재료만 등록
+# Recipe 는 code, Ingredient 는 title 기준으로 추가 또는 수정 (변경 없는 행은 쓰지 않음)
+# 잘못된 줄은 건너뛰고 줄 번호와 함께 stderr 에 출력 (나머지 줄은 계속 등록, 결과의 errors)
+class Command(BaseCommand):
+    help = 'Import recipe/ingredient catalog from CSV or JSONL'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="input file path, '-' for stdin")
+        parser.add_argument('--format', choices=['csv', 'jsonl'],
+                            help='input format (default: from file extension)')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or ('jsonl' if path.endswith(
+            ('.jsonl', '.json')) else 'csv')
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be positive')
+
+        # 카테고리, 식재료는 전체를 메모리에 올려서 행마다 조회하지 않음
+        self.ingredient_categories = self.category_map(IngredientCategory)
+        self.recipe_categories = self.category_map(RecipeCategory)
+        self.ingredients = {
+            title: [pk, category_id]
+            for pk, title, category_id in Ingredient.objects.values_list('id', 'title', 'category_id')
+        }
+        self.stats = dict.fromkeys(
+            ['rows', 'categories', 'ingredients_created', 'ingredients_updated',
+             'recipes_created', 'recipes_updated', 'recipe_ingredients_created', 'errors'], 0)
+
+        started = time.monotonic()
+        stream = sys.stdin if path == '-' else open(
+            path, encoding='utf-8', newline='')
+        try:
+            rows = self.read_rows(stream, fmt)
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+                with transaction.atomic():
+                    self.import_batch(batch)
+                self.stats['rows'] += len(batch)
+                if options['verbosity'] > 1:
+                    self.stdout.write(f"{self.stats['rows']} rows")
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        if self.stats['recipe_ingredients_created']:
+            RecipeIngredientIndex.invalidate()
+        if self.stats['ingredients_created']:
+            IngredientAutocompleteIndex.invalidate()
+        if any(value for key, value in self.stats.items() if key not in ('rows', 'errors')):
+            bump_catalog_version()
+
+        elapsed = time.monotonic() - started
+        rate = self.stats['rows'] / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            ', '.join(f'{key}={value}' for key, value in self.stats.items()) +
+            f', elapsed={elapsed:.2f}s, rows/s={rate:.0f}'))
+
+    @staticmethod
+    def category_map(model):
+        categories = {}
+        for pk, title in model.objects.order_by('id').values_list('id', 'title'):
+            categories.setdefault(title, pk)
+        return categories
+
+    def report_error(self, line, message):
+        self.stats['errors'] += 1
+        self.stderr.write(f'line {line}: {message}')
+
+    def read_rows(self, stream, fmt):
+        if fmt == 'csv':
+            records = enumerate(csv.DictReader(stream), start=1)
+        else:
+            records = self.read_jsonl(stream)
+
+        for line, row in records:
+            try:
+                yield self.parse_row(line, row)
+            except ValueError as e:
+                self.report_error(line, e)
+
+    def read_jsonl(self, stream):
+        for line, text in enumerate(stream, start=1):
+            if not text.strip():
+                continue
+            try:
+                row = json.loads(text)
+            except ValueError:
+                self.report_error(line, 'invalid JSON')
+                continue
+            if not isinstance(row, dict):
+                self.report_error(line, 'expected a JSON object')
+                continue
+            yield line, row
+
+    @staticmethod
+    def parse_row(line, row):
+        row = {field: str(row.get(field) or '').strip()
+               for field in FIELDS}
+        if not row['recipe_code']:
+            row['recipe_code'] = None
+        elif not (row['recipe_title'] and row['recipe_category']):
+            raise ValueError('recipe_title and recipe_category are required')
+        else:
+            try:
+                row['recipe_code'] = int(row['recipe_code'])
+            except ValueError:
+                raise ValueError(f"invalid recipe_code '{row['recipe_code']}'")
+        row['line'] = line
+        return row
+
+    def resolve_categories(self, model, categories, titles):
+        new = [model(title=title, slug=slugify(unidecode(title), allow_unicode=True))
+               for title in dict.fromkeys(titles) if title and title not in categories]
+        if new:
+            # bulk_create 는 save() 를 거치지 않으므로 slug 를 직접 생성
+            model.objects.bulk_create(new)
+            if new[0].pk is None:
+                categories.update(self.category_map(model))
+            else:
+                categories.update({category.title: category.pk for category in new})
+            update_title_index(
+                model, [(categories[category.title], category.title) for category in new])
+            self.stats['categories'] += len(new)
+
+    def import_batch(self, batch):
+        self.resolve_categories(IngredientCategory, self.ingredient_categories,
+                                [row['ingredient_category'] for row in batch])
+        self.resolve_categories(RecipeCategory, self.recipe_categories,
+                                [row['recipe_category'] for row in batch])
+
+        # 식재료: title 기준 추가/수정
+        new_ingredients, changed_ingredients = {}, {}
+        for row in batch:
+            title = row['ingredient_title']
+            if not title or not row['ingredient_category']:
+                continue
+            category_id = self.ingredient_categories[row['ingredient_category']]
+            if title in self.ingredients:
+                if self.ingredients[title][1] != category_id:
+                    self.ingredients[title][1] = category_id
+                    changed_ingredients[title] = Ingredient(
+                        id=self.ingredients[title][0], title=title, category_id=category_id)
+            else:
+                new_ingredients[title] = Ingredient(
+                    title=title, category_id=category_id)
+        if new_ingredients:
+            Ingredient.objects.bulk_create(new_ingredients.values())
+            for ingredient in Ingredient.objects.filter(title__in=new_ingredients).values_list('id', 'title', 'category_id'):
+                self.ingredients[ingredient[1]] = [ingredient[0], ingredient[2]]
+            # bulk_create 는 signals 를 보내지 않으므로 검색 색인 직접 갱신
+            update_title_index(
+                Ingredient, [(self.ingredients[title][0], title) for title in new_ingredients])
+            self.stats['ingredients_created'] += len(new_ingredients)
+        if changed_ingredients:
+            Ingredient.objects.bulk_update(
+                changed_ingredients.values(), ['category'])
+            self.stats['ingredients_updated'] += len(changed_ingredients)
+            # 식재료 카테고리가 바뀐 레시피 문서 갱신
+            invalidate_recipe_documents(RecipeIngredient.objects.filter(
+                ingredient__in=changed_ingredients.values()).values_list('recipe_id', flat=True))
+
+        # 카테고리 없이 새 식재료를 참조하는 행은 건너뜀
+        valid = []
+        for row in batch:
+            if row['ingredient_title'] and row['ingredient_title'] not in self.ingredients:
+                self.report_error(row['line'], 'ingredient_category is required for new ingredient')
+            else:
+                valid.append(row)
+        batch = valid
+
+        # 레시피: code 기준 추가/수정
+        recipes = {}
+        for row in batch:
+            if row['recipe_code'] is not None:
+                recipes[row['recipe_code']] = (
+                    row['recipe_title'], self.recipe_categories[row['recipe_category']])
+        if not recipes:
+            return
+
+        existing = {
+            code: (pk, title, category_id)
+            for pk, code, title, category_id in Recipe.objects.filter(code__in=recipes).values_list('id', 'code', 'title', 'category_id')
+        }
+        new_recipes, changed_recipes = [], []
+        for code, (title, category_id) in recipes.items():
+            if code not in existing:
+                new_recipes.append(
+                    Recipe(code=code, title=title, category_id=category_id))
+            elif existing[code][1:] != (title, category_id):
+                changed_recipes.append(Recipe(
+                    id=existing[code][0], code=code, title=title, category_id=category_id))
+        if new_recipes:
+            Recipe.objects.bulk_create(new_recipes)
+            self.stats['recipes_created'] += len(new_recipes)
+        if changed_recipes:
+            Recipe.objects.bulk_update(changed_recipes, ['title', 'category'])
+            self.stats['recipes_updated'] += len(changed_recipes)
+
+        recipe_ids = dict(Recipe.objects.filter(
+            code__in=recipes).values_list('code', 'id'))
+        if new_recipes or changed_recipes:
+            update_title_index(Recipe, [(recipe_ids[recipe.code], recipe.title)
+                                        for recipe in new_recipes + changed_recipes])
+
+        # 레시피 식재료: 없는 조합만 추가
+        pairs = {
+            (recipe_ids[row['recipe_code']],
+             self.ingredients[row['ingredient_title']][0])
+            for row in batch if row['recipe_code'] is not None and row['ingredient_title']
+        }
+        if pairs:
+            pairs -= set(RecipeIngredient.objects.filter(
+                recipe_id__in={recipe_id for recipe_id, _ in pairs}).values_list('recipe_id', 'ingredient_id'))
+        if pairs:
+            RecipeIngredient.objects.bulk_create(
+                [RecipeIngredient(recipe_id=recipe_id, ingredient_id=ingredient_id)
+                 for recipe_id, ingredient_id in pairs])
+            self.stats['recipe_ingredients_created'] += len(pairs)
+            # 비슷한 레시피 검색용 서명 갱신
+            update_recipe_signatures({recipe_id for recipe_id, _ in pairs})
+
+        # 레시피 조회용 문서 생성/갱신
+        invalidate_recipe_documents(
+            [recipe_ids[recipe.code] for recipe in new_recipes + changed_recipes]
+            + [recipe_id for recipe_id, _ in pairs])
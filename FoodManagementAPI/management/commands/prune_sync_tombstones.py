@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from FoodManagementAPI.sync import prune_tombstones
+
+
+# 설명: 보관 기간이 지난 동기화용 삭제 기록 정리
+# 사용법: python manage.py prune_sync_tombstones
+class Command(BaseCommand):
+    help = 'Delete sync tombstones older than the retention period'
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS(
+            f'{prune_tombstones()} tombstones deleted'))
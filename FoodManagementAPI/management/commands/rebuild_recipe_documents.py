@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from FoodManagementAPI.models import Recipe
+from FoodManagementAPI.recipe_documents import rebuild_recipe_documents
+
+
+# 설명: 레시피 조회용 문서(RecipeDocument) 전체 생성
+# 사용법: python manage.py rebuild_recipe_documents [--batch-size 500] [--missing]
+# --missing: 문서가 없는 레시피만 생성 (signals 를 보내지 않는 bulk 작업 이후 등)
+# 이후에는 레시피, 레시피 식재료, 식재료, 카테고리가 변경될 때 signals 에서 해당 레시피만 갱신
+class Command(BaseCommand):
+    help = 'Rebuild the stored recipe documents served by /api/recipe'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--missing', action='store_true',
+                            help='only build recipes without a document')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be positive')
+
+        recipes = Recipe.objects.all()
+        if options['missing']:
+            recipes = recipes.filter(document__isnull=True)
+
+        started = time.monotonic()
+        last_id, count = 0, 0
+        while True:
+            recipe_ids = list(recipes.filter(id__gt=last_id).order_by(
+                'id').values_list('id', flat=True)[:batch_size])
+            if not recipe_ids:
+                break
+            last_id = recipe_ids[-1]
+
+            count += len(rebuild_recipe_documents(recipe_ids, batch_size=batch_size))
+            if options['verbosity'] > 1:
+                self.stdout.write(f'{count} recipes')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{count} recipe documents, elapsed={time.monotonic() - started:.2f}s'))
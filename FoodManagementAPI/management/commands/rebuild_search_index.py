@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from FoodManagementAPI.models import IngredientCategory, Ingredient, RecipeCategory, Recipe, TitleNgram
+from FoodManagementAPI.search import update_title_index
+
+
+MODELS = [IngredientCategory, Ingredient, RecipeCategory, Recipe]
+
+
+# 설명: 제목 검색용 n-gram 색인 전체 재생성
+# 사용법: python manage.py rebuild_search_index [--batch-size 1000]
+class Command(BaseCommand):
+    help = 'Rebuild the title n-gram search index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        TitleNgram.objects.all().delete()
+
+        for model in MODELS:
+            # id 기준으로 나눠서 조회 (테이블 전체를 메모리에 올리지 않음)
+            last_id, count = 0, 0
+            while True:
+                batch = list(model.objects.filter(id__gt=last_id).order_by(
+                    'id').values_list('id', 'title')[:options['batch_size']])
+                if not batch:
+                    break
+                with transaction.atomic():
+                    update_title_index(model, batch)
+                last_id = batch[-1][0]
+                count += len(batch)
+            self.stdout.write(f'{model._meta.model_name}: {count}')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{TitleNgram.objects.count()} grams, elapsed={time.monotonic() - started:.2f}s'))
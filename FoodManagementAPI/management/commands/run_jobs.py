@@ -0,0 +1,56 @@
+import multiprocessing
+import os
+import signal
+import socket
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from FoodManagementAPI.jobs import Worker, run_worker
+
+
+# 설명: 백그라운드 작업(Job) 실행 worker (별도 브로커 없이 DB 를 작업 큐로 사용)
+# 사용법: python manage.py run_jobs [--processes 4] [--poll-interval 1] [--burst]
+# --processes: worker 프로세스 수 (기본 CPU 수), 작업 종류별 동시 실행 수는 tasks.py 의 concurrency
+# --burst: 실행할 작업이 없으면 종료 (cron, 배포 스크립트 등)
+# SIGTERM/SIGINT 를 받으면 실행 중인 작업을 끝내고 종료
+class Command(BaseCommand):
+    help = 'Run queued background jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=os.cpu_count() or 1)
+        parser.add_argument('--poll-interval', type=float, default=1.0)
+        parser.add_argument('--burst', action='store_true',
+                            help='exit when no job is ready to run')
+
+    def handle(self, *args, **options):
+        processes = options['processes']
+        if processes < 1:
+            raise CommandError('--processes must be positive')
+        poll_interval, burst = options['poll_interval'], options['burst']
+
+        if processes == 1:
+            worker = Worker(poll_interval=poll_interval)
+            worker.install_signal_handlers()
+            count = worker.run(burst=burst)
+            self.stdout.write(self.style.SUCCESS(f'{count} jobs'))
+            return
+
+        # 자식 프로세스가 부모의 DB 연결을 공유하지 않도록 닫은 뒤 시작
+        connections.close_all()
+        host = socket.gethostname()
+        workers = [multiprocessing.Process(target=run_worker, args=(f'{host}:{os.getpid()}-{i}', poll_interval, burst))
+                   for i in range(processes)]
+        for process in workers:
+            process.start()
+
+        def stop(signum, frame):
+            for process in workers:
+                if process.is_alive():
+                    os.kill(process.pid, signal.SIGTERM)
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        for process in workers:
+            process.join()
+        self.stdout.write(self.style.SUCCESS(f'{processes} workers stopped'))
@@ -0,0 +1,216 @@
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+import numpy as np
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.text import slugify
+
+from unidecode import unidecode
+
+from FoodManagementAPI.models import IngredientCategory, Ingredient, UserIngredient, RecipeCategory, Recipe, RecipeIngredient, Cart
+from FoodManagementAPI.recipe_index import RecipeIngredientIndex
+from FoodManagementAPI.autocomplete import IngredientAutocompleteIndex
+from FoodManagementAPI.similarity_index import RecipeSimilarityIndex, compute_signatures, save_signatures
+from FoodManagementAPI.recipe_documents import rebuild_recipe_documents
+from FoodManagementAPI.search import update_title_index
+from FoodManagementAPI.catalog_cache import bump_catalog_version
+
+
+INGREDIENT_WORDS = ['양파', '대파', '마늘', '감자', '당근', '애호박', '두부', '돼지고기', '소고기', '닭고기',
+                    '계란', '우유', '버터', '치즈', '김치', '고추장', '된장', '간장', '설탕', '소금',
+                    '버섯', '시금치', '콩나물', '고등어', '오징어', '새우', '쌀', '밀가루', '토마토', '양배추']
+INGREDIENT_MODIFIERS = ['국산', '유기농', '냉동', '손질', '다진', '슬라이스', '큰', '작은', '햇', '건']
+CATEGORY_WORDS = ['채소', '육류', '해산물', '유제품', '양념', '곡류', '과일', '가공식품', '음료', '냉동식품']
+RECIPE_STYLES = ['볶음', '조림', '구이', '찌개', '국', '전', '무침', '샐러드', '덮밥', '파스타']
+RECIPE_CATEGORY_WORDS = ['한식', '양식', '중식', '일식', '반찬', '간식', '국물요리', '도시락', '다이어트', '야식']
+
+
+# 설명: 부하 테스트용 가상 데이터 생성 (카탈로그, 사용자, 사용자 식재료, 장바구니)
+# 사용법: python manage.py seed_data [--recipes 100000] [--users 1000] [--seed 0] ...
+# 기존 데이터는 그대로 두고 추가만 함 (레시피 code 는 현재 최대값 다음부터 사용)
+# 식재료는 인기 순 분포(Zipf)로 선택해서 자주 쓰이는 식재료가 몰리도록 생성
+# 생성된 사용자 비밀번호는 모두 --password (기본값: password)
+class Command(BaseCommand):
+    help = 'Generate synthetic catalog and user data for load testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ingredient-categories', type=int, default=2000)
+        parser.add_argument('--ingredients', type=int, default=20000)
+        parser.add_argument('--recipe-categories', type=int, default=1000)
+        parser.add_argument('--recipes', type=int, default=100000)
+        parser.add_argument('--ingredients-per-recipe', type=float, default=10,
+                            help='mean number of ingredients per recipe')
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--pantry-size', type=float, default=30,
+                            help='mean number of user ingredients per user')
+        parser.add_argument('--cart-size', type=float, default=10,
+                            help='mean number of cart items per user')
+        parser.add_argument('--username-prefix', default='seed-user-')
+        parser.add_argument('--password', default='password')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, help='random seed')
+
+    def handle(self, *args, **options):
+        counts = ['ingredient_categories', 'ingredients', 'recipe_categories', 'recipes', 'users']
+        if any(options[name] < 0 for name in counts) or options['batch_size'] < 1:
+            raise CommandError('counts must not be negative and --batch-size must be positive')
+
+        self.rng = np.random.default_rng(options['seed'])
+        self.batch_size = options['batch_size']
+        self.verbosity = options['verbosity']
+        self.stats = {}
+        started = time.monotonic()
+
+        ingredient_categories = self.create_categories(
+            IngredientCategory, CATEGORY_WORDS, options['ingredient_categories'])
+        recipe_categories = self.create_categories(
+            RecipeCategory, RECIPE_CATEGORY_WORDS, options['recipe_categories'])
+
+        if options['ingredients']:
+            if not len(ingredient_categories):
+                raise CommandError('ingredient categories are required')
+            self.create_ingredients(ingredient_categories, options['ingredients'])
+        ingredients = np.array(
+            Ingredient.objects.order_by('id').values_list('id', flat=True), dtype=np.int64)
+
+        if options['recipes']:
+            if not len(recipe_categories) or not len(ingredients):
+                raise CommandError('recipe categories and ingredients are required')
+            self.create_recipes(recipe_categories, ingredients,
+                                options['recipes'], options['ingredients_per_recipe'])
+
+        if options['users']:
+            if not len(ingredients):
+                raise CommandError('ingredients are required')
+            self.create_users(ingredients, options)
+
+        if any(self.stats.get(model._meta.model_name) for model in
+               [IngredientCategory, Ingredient, RecipeCategory, Recipe, RecipeIngredient]):
+            RecipeIngredientIndex.invalidate()
+            RecipeSimilarityIndex.invalidate()
+            IngredientAutocompleteIndex.invalidate()
+            bump_catalog_version()
+
+        self.stdout.write(self.style.SUCCESS(
+            ', '.join(f'{key}={value}' for key, value in self.stats.items()) +
+            f', elapsed={time.monotonic() - started:.2f}s'))
+
+    def log(self, message):
+        if self.verbosity > 1:
+            self.stdout.write(message)
+
+    def popularity(self, size):
+        # 앞쪽 항목일수록 자주 선택되는 분포
+        weights = 1 / np.arange(1, size + 1) ** 0.8
+        return weights / weights.sum()
+
+    def sample_pairs(self, owner_ids, candidates, mean):
+        """
+        owner 마다 평균 mean 개의 candidates 를 중복 없이 선택, (owner_id, candidate_id) 배열 반환
+        """
+        sizes = np.maximum(self.rng.poisson(mean, len(owner_ids)), 1)
+        owners = np.repeat(owner_ids, sizes)
+        picked = candidates[self.rng.choice(
+            len(candidates), len(owners), p=self.popularity(len(candidates)))]
+        base = int(candidates.max()) + 1
+        keys = np.unique(owners * base + picked)
+        return np.column_stack([keys // base, keys % base])
+
+    def bulk_create(self, model, objects):
+        """
+        batch_size 단위로 저장하고 새로 생긴 객체의 queryset 반환
+        MySQL 은 bulk_create 후 pk 를 채우지 않으므로 저장 전 최대 id 이후를 다시 조회
+        """
+        last_id = model.objects.aggregate(last_id=Max('id'))['last_id'] or 0
+        for start in range(0, len(objects), self.batch_size):
+            with transaction.atomic():
+                model.objects.bulk_create(objects[start:start + self.batch_size])
+            self.log(f'{model._meta.model_name}: {min(start + self.batch_size, len(objects))}/{len(objects)}')
+        name = model._meta.model_name
+        self.stats[name] = self.stats.get(name, 0) + len(objects)
+        return model.objects.filter(id__gt=last_id).order_by('id')
+
+    def create_categories(self, model, words, count):
+        offset = model.objects.count()
+        titles = [f'{words[i % len(words)]} {i + 1}' for i in range(offset, offset + count)]
+        # bulk_create 는 save() 를 거치지 않으므로 slug 를 직접 생성
+        created = self.bulk_create(model, [
+            model(title=title, slug=slugify(unidecode(title), allow_unicode=True)) for title in titles])
+        update_title_index(model, created.values_list('id', 'title'))
+        return np.array(model.objects.order_by('id').values_list('id', flat=True), dtype=np.int64)
+
+    def create_ingredients(self, categories, count):
+        offset = Ingredient.objects.aggregate(last_id=Max('id'))['last_id'] or 0
+        words = self.rng.integers(len(INGREDIENT_WORDS), size=count)
+        modifiers = self.rng.integers(len(INGREDIENT_MODIFIERS), size=count)
+        category_ids = categories[self.rng.integers(len(categories), size=count)]
+        # title 은 unique 이므로 번호를 붙임
+        created = self.bulk_create(Ingredient, [
+            Ingredient(title=f'{INGREDIENT_MODIFIERS[modifier]} {INGREDIENT_WORDS[word]} {offset + i + 1}',
+                       category_id=category_id)
+            for i, (word, modifier, category_id) in enumerate(zip(words, modifiers, category_ids.tolist()))])
+        update_title_index(Ingredient, created.values_list('id', 'title'))
+
+    def create_recipes(self, categories, ingredients, count, mean):
+        code = (Recipe.objects.aggregate(last_code=Max('code'))['last_code'] or 0) + 1
+        # 레시피와 레시피 식재료를 batch 단위로 함께 생성 (전체 레시피를 메모리에 올리지 않음)
+        for start in range(0, count, self.batch_size):
+            size = min(self.batch_size, count - start)
+            words = self.rng.integers(len(INGREDIENT_WORDS), size=size)
+            styles = self.rng.integers(len(RECIPE_STYLES), size=size)
+            category_ids = categories[self.rng.integers(len(categories), size=size)]
+            recipes = [
+                Recipe(code=code + start + i, title=f'{INGREDIENT_WORDS[word]} {RECIPE_STYLES[style]}',
+                       category_id=category_id)
+                for i, (word, style, category_id) in enumerate(zip(words, styles, category_ids.tolist()))]
+            created = list(self.bulk_create(Recipe, recipes).values_list('id', 'title'))
+            update_title_index(Recipe, created)
+
+            pairs = self.sample_pairs(
+                np.array([pk for pk, _ in created], dtype=np.int64), ingredients, mean)
+            self.bulk_create(RecipeIngredient, [
+                RecipeIngredient(recipe_id=recipe_id, ingredient_id=ingredient_id)
+                for recipe_id, ingredient_id in pairs.tolist()])
+            # 비슷한 레시피 검색용 서명 (pairs 는 레시피 순으로 정렬되어 있음)
+            with transaction.atomic():
+                save_signatures(*compute_signatures(pairs))
+            # 레시피 조회용 문서
+            rebuild_recipe_documents([pk for pk, _ in created])
+
+    def create_users(self, ingredients, options):
+        offset = User.objects.filter(
+            username__startswith=options['username_prefix']).count()
+        # 비밀번호 해시는 느리므로 한 번만 만들어서 모든 사용자에게 사용
+        password = make_password(options['password'])
+        users = self.bulk_create(User, [
+            User(username=f"{options['username_prefix']}{offset + i + 1}", password=password)
+            for i in range(options['users'])])
+        user_ids = np.array(users.values_list('id', flat=True), dtype=np.int64)
+
+        today = timezone.localdate()
+        pairs = self.sample_pairs(user_ids, ingredients, options['pantry_size'])
+        starts = self.rng.integers(0, 30, size=len(pairs))
+        # 일부는 이미 유통기한이 지난 식재료
+        ends = self.rng.integers(-5, 60, size=len(pairs))
+        quantities = self.rng.integers(1, 100, size=len(pairs))
+        for start in range(0, len(pairs), self.batch_size):
+            chunk = slice(start, start + self.batch_size)
+            self.bulk_create(UserIngredient, [
+                UserIngredient(user_id=user_id, ingredient_id=ingredient_id, quantity=Decimal(quantity),
+                               start=today - timedelta(days=days), end=today + timedelta(days=end_days))
+                for (user_id, ingredient_id), quantity, days, end_days in
+                zip(pairs[chunk].tolist(), quantities[chunk].tolist(), starts[chunk].tolist(), ends[chunk].tolist())])
+
+        pairs = self.sample_pairs(user_ids, ingredients, options['cart_size'])
+        buys = self.rng.random(len(pairs)) < 0.2
+        for start in range(0, len(pairs), self.batch_size):
+            chunk = slice(start, start + self.batch_size)
+            self.bulk_create(Cart, [
+                Cart(user_id=user_id, ingredient_id=ingredient_id, buy=buy)
+                for (user_id, ingredient_id), buy in zip(pairs[chunk].tolist(), buys[chunk].tolist())])
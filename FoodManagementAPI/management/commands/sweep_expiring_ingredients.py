@@ -0,0 +1,84 @@
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from FoodManagementAPI.models import UserIngredient, ExpiryDigest
+
+
+# 설명: 전체 사용자의 유통기한 임박 식재료를 모아 사용자별 알림(ExpiryDigest) 생성
+# 사용법: python manage.py sweep_expiring_ingredients [--days 3] [--chunk-size 1000] [--date YYYY-MM-DD]
+# (user, end, id) 순서로 chunk-size 만큼씩 이어서 조회 (OFFSET, 테이블 전체 조회, 잠금 없음)
+# 같은 날짜로 다시 실행하면 알림 내용을 덮어씀
+class Command(BaseCommand):
+    help = 'Write per-user digests of soon-to-expire pantry items'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=3)
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument('--date', type=date.fromisoformat,
+                            help='digest date (default: today)')
+
+    def handle(self, *args, **options):
+        if options['days'] < 0 or options['chunk_size'] < 1:
+            raise CommandError('--days and --chunk-size must be positive')
+
+        today = options['date'] or timezone.localdate()
+        until = today + timedelta(days=options['days'])
+        chunk_size = options['chunk_size']
+        started = time.monotonic()
+
+        queryset = (UserIngredient.objects
+                    .filter(end__gte=today, end__lte=until)
+                    .order_by('user_id', 'end', 'id')
+                    .values_list('id', 'user_id', 'end', 'ingredient_id', 'ingredient__title'))
+
+        # 마지막 사용자의 항목은 다음 chunk 에 이어질 수 있으므로 들고 있다가 함께 저장
+        pending_user, pending_items = None, []
+        last = None
+        rows_count, digests_count = 0, 0
+        while True:
+            chunk = queryset
+            if last is not None:
+                user_id, end, pk = last
+                chunk = chunk.filter(
+                    Q(user_id__gt=user_id) |
+                    Q(user_id=user_id, end__gt=end) |
+                    Q(user_id=user_id, end=end, id__gt=pk))
+            rows = list(chunk[:chunk_size])
+            if not rows:
+                break
+            last = rows[-1][1], rows[-1][2], rows[-1][0]
+            rows_count += len(rows)
+
+            digests = {}
+            for pk, user_id, end, ingredient_id, title in rows:
+                if user_id != pending_user:
+                    if pending_user is not None:
+                        digests[pending_user] = pending_items
+                    pending_user, pending_items = user_id, []
+                pending_items.append(
+                    {'id': pk, 'ingredient_id': ingredient_id, 'title': title, 'end': end.isoformat()})
+            digests_count += self.write_digests(digests, today)
+
+        if pending_user is not None:
+            digests_count += self.write_digests(
+                {pending_user: pending_items}, today)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{rows_count} items, {digests_count} digests, elapsed={time.monotonic() - started:.2f}s'))
+
+    def write_digests(self, digests, today):
+        if not digests:
+            return 0
+        # MySQL 은 충돌 대상(unique_fields)을 지정하지 않음
+        unique_fields = ['user', 'date'] if connection.features.supports_update_conflicts_with_target else None
+        with transaction.atomic():
+            ExpiryDigest.objects.bulk_create(
+                [ExpiryDigest(user_id=user_id, date=today, items=items)
+                 for user_id, items in digests.items()],
+                update_conflicts=True, unique_fields=unique_fields, update_fields=['items'])
+        return len(digests)
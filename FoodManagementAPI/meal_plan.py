@@ -0,0 +1,124 @@
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+from django.conf import settings
+
+from .recipe_index import recipe_ingredient_index
+
+
+# 유통기한까지 남은 일 수가 MEAL_PLAN_HALF_LIFE_DAYS 늘 때마다 식재료 가중치가 절반 (오늘 만료: 1)
+HALF_LIFE_DAYS = getattr(settings, 'MEAL_PLAN_HALF_LIFE_DAYS', 7)
+# 교체 탐색 시간 제한 (초), 탐욕 선택은 항상 끝까지 실행
+TIME_LIMIT = getattr(settings, 'MEAL_PLAN_TIME_LIMIT', 0.5)
+
+# recipe_ids: 선택한 레시피 id (가장 급한 식재료를 사용하는 레시피부터)
+# used: 레시피별 사용하는 보유 식재료 id, missing: 레시피별 보유/장바구니에 없는 식재료 id
+# shopping: 새로 사야 하는 식재료 id (중복 제거), score: 사용한 보유 식재료 가중치 합 - penalty x 새 식재료 수
+# complete: 제한 시간 안에 더 나은 교체가 없을 때까지 탐색했는지 여부
+MealPlan = namedtuple('MealPlan', ['recipe_ids', 'used', 'missing', 'shopping', 'score', 'complete'])
+
+
+def expiry_weights(pantry, today):
+    """
+    pantry: [(ingredient id, 유통기한)] -> {ingredient id: 가중치}, 이미 지난 식재료 제외
+    """
+    return {ingredient_id: 0.5 ** ((end - today).days / HALF_LIFE_DAYS)
+            for ingredient_id, end in pantry if end >= today}
+
+
+# 레시피 식재료 역색인(recipe_index.py)의 CSR 항목을 식재료 열 번호로 변환한 값 (색인이 바뀔 때만 다시 계산)
+_columns_lock = threading.Lock()
+_columns = (None, None, None)
+
+
+def snapshot_columns(snapshot):
+    global _columns
+    cached_snapshot, columns, entry_columns = _columns
+    if cached_snapshot is not snapshot:
+        with _columns_lock:
+            columns, entry_columns = np.unique(snapshot.recipe_ingredients, return_inverse=True)
+            _columns = (snapshot, columns, entry_columns)
+    return columns, entry_columns
+
+
+def column_mask(columns, ingredient_ids):
+    ingredient_ids = np.fromiter(ingredient_ids, dtype=np.int64)
+    pos = np.searchsorted(columns, ingredient_ids).clip(max=max(len(columns) - 1, 0))
+    found = columns[pos] == ingredient_ids if len(columns) else np.zeros(0, dtype=bool)
+    return pos[found], found
+
+
+def plan_meals(weights, cart_ingredient_ids, count, penalty, time_limit=TIME_LIMIT):
+    """
+    가중 최대 커버리지(weighted set cover) 문제를 탐욕 선택 + 제한 시간 교체 탐색으로 근사
+    weights: {보유 식재료 id: 가중치}, cart_ingredient_ids: 장바구니 식재료 id (새로 추가할 필요 없음)
+    목적 함수: 선택한 레시피가 사용하는 보유 식재료 가중치 합 - penalty x 새로 사야 하는 식재료 수 (식재료별 한 번만 계산)
+    """
+    deadline = time.monotonic() + time_limit
+    snapshot = recipe_ingredient_index.snapshot()
+    if not len(snapshot.recipe_ids):
+        return MealPlan([], {}, {}, [], 0.0, True)
+
+    columns, entry_columns = snapshot_columns(snapshot)
+    starts = snapshot.recipe_indptr[:-1]
+
+    # 식재료 열별 값: 보유 식재료는 가중치, 보유/장바구니에 없는 식재료는 -penalty, 장바구니 식재료는 0
+    value = np.full(len(columns), -float(penalty))
+    pos, found = column_mask(columns, cart_ingredient_ids)
+    value[pos] = 0.0
+    pos, found = column_mask(columns, weights.keys())
+    value[pos] = np.fromiter(weights.values(), dtype=np.float64)[found]
+
+    def recipe_columns(recipe):
+        return entry_columns[snapshot.recipe_indptr[recipe]:snapshot.recipe_indptr[recipe + 1]]
+
+    def gains(cover):
+        # 레시피별 추가 점수 (이미 선택한 레시피가 사용하는 식재료는 0), 모든 레시피를 한 번에 계산
+        return np.add.reduceat(np.where(cover == 0, value, 0.0)[entry_columns], starts)
+
+    # 탐욕 선택: 추가 점수가 가장 큰 레시피부터 (같으면 recipe id 가 작은 레시피)
+    cover = np.zeros(len(columns), dtype=np.int64)
+    chosen = []
+    for _ in range(min(count, len(snapshot.recipe_ids))):
+        gain = gains(cover)
+        gain[chosen] = -np.inf
+        best = int(np.argmax(gain))
+        chosen.append(best)
+        np.add.at(cover, recipe_columns(best), 1)
+
+    # 교체 탐색: 레시피 하나를 빼고 나머지 기준 추가 점수가 가장 큰 레시피로 바꿔서 점수가 오르면 교체
+    complete = False
+    while time.monotonic() < deadline:
+        improved = False
+        for i, recipe in enumerate(chosen):
+            if time.monotonic() >= deadline:
+                break
+            np.subtract.at(cover, recipe_columns(recipe), 1)
+            gain = gains(cover)
+            current = gain[recipe]
+            gain[chosen] = -np.inf
+            best = int(np.argmax(gain))
+            if gain[best] > current + 1e-9:
+                chosen[i] = recipe = best
+                improved = True
+            np.add.at(cover, recipe_columns(recipe), 1)
+        else:
+            if not improved:
+                complete = True
+                break
+
+    score = float(value[cover > 0].sum())
+    shopping = columns[(cover > 0) & (value < 0)].tolist()
+    # 가장 급한(가중치가 큰) 보유 식재료를 사용하는 레시피부터
+    urgency = [max((value[c] for c in recipe_columns(recipe) if value[c] > 0), default=0.0) for recipe in chosen]
+    chosen = [recipe for _, recipe in sorted(zip(urgency, chosen), key=lambda item: (-item[0], item[1]))]
+
+    recipe_ids = [int(snapshot.recipe_ids[recipe]) for recipe in chosen]
+    used, missing = {}, {}
+    for recipe_id, recipe in zip(recipe_ids, chosen):
+        ingredient_columns = np.unique(recipe_columns(recipe))
+        used[recipe_id] = columns[ingredient_columns[value[ingredient_columns] > 0]].tolist()
+        missing[recipe_id] = columns[ingredient_columns[value[ingredient_columns] < 0]].tolist()
+    return MealPlan(recipe_ids, used, missing, shopping, round(score, 4), complete)
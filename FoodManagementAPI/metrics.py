@@ -0,0 +1,98 @@
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+
+import numpy as np
+
+
+# 요청별 성능 측정값 (PerformanceMiddleware 에서 생성)
+class RequestMetrics:
+    def __init__(self):
+        self.queries = 0
+        self.query_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+
+
+current_metrics = ContextVar('current_metrics', default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    DB 쿼리 수/시간 측정 (signals 에서 연결마다 한 번 등록하는 execute_wrapper)
+    비동기 뷰의 쿼리는 sync_to_async 스레드의 연결에서 실행되지만 current_metrics 는 함께 전달됨
+    """
+    metrics = current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.query_time += time.perf_counter() - started
+
+
+# 직렬화 시간 측정
+# 중첩된 serializer 는 바깥 serializer 시간에 포함되므로 가장 바깥 serializer 만 측정
+class TimedSerializerMixin:
+    def to_representation(self, instance):
+        metrics = current_metrics.get()
+        if metrics is None or metrics.serializer_depth:
+            return super().to_representation(instance)
+
+        metrics.serializer_depth += 1
+        started = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            metrics.serializer_time += time.perf_counter() - started
+            metrics.serializer_depth -= 1
+
+
+# URL 별 최근 요청 측정값 (프로세스 메모리)
+# 최근 sample_size 개 요청으로 백분위수 계산
+class RouteStats:
+    FIELDS = ['total', 'view', 'db', 'serializer', 'queries', 'size']
+
+    def __init__(self, sample_size=1000):
+        self.sample_size = sample_size
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def record(self, route, **values):
+        with self._lock:
+            route_stats = self._routes.get(route)
+            if route_stats is None:
+                route_stats = self._routes[route] = {
+                    'count': 0, 'samples': deque(maxlen=self.sample_size)}
+            route_stats['count'] += 1
+            route_stats['samples'].append(
+                tuple(values[field] for field in self.FIELDS))
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+    def summary(self):
+        with self._lock:
+            routes = {route: (route_stats['count'], list(route_stats['samples']))
+                      for route, route_stats in self._routes.items()}
+
+        summary = {}
+        for route, (count, samples) in sorted(routes.items()):
+            samples = np.array(samples, dtype=float)
+            percentiles = np.percentile(samples, [50, 95, 99], axis=0)
+            summary[route] = {'count': count, 'samples': len(samples)}
+            for i, field in enumerate(self.FIELDS):
+                summary[route][field] = {
+                    'p50': round(percentiles[0][i], 2),
+                    'p95': round(percentiles[1][i], 2),
+                    'p99': round(percentiles[2][i], 2),
+                    'max': round(samples[:, i].max(), 2),
+                }
+        return summary
+
+
+route_stats = RouteStats()
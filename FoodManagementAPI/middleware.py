@@ -0,0 +1,96 @@
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .metrics import RequestMetrics, current_metrics, route_stats
+
+
+logger = logging.getLogger(__name__)
+
+
+# 요청별 성능 측정 미들웨어
+# DB 쿼리 수/시간, 직렬화 시간, 뷰 실행 시간, 전체 시간, 응답 크기를 측정해서
+# Server-Timing 헤더로 반환하고 URL 별로 집계 (/api/stats/performance)
+# PERFORMANCE_QUERY_BUDGET, PERFORMANCE_LATENCY_BUDGET_MS 를 넘는 요청은 경고 로그
+# ASGI 에서는 비동기로 실행 (동기 미들웨어가 있으면 요청마다 스레드로 전환됨)
+class PerformanceMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.query_budget = getattr(settings, 'PERFORMANCE_QUERY_BUDGET', None)
+        self.latency_budget = getattr(
+            settings, 'PERFORMANCE_LATENCY_BUDGET_MS', None)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        metrics, token, started = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.finish(request, response, metrics, started)
+
+    async def __acall__(self, request):
+        metrics, token, started = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.finish(request, response, metrics, started)
+
+    @staticmethod
+    def start(request):
+        # 쿼리는 signals 에서 연결마다 등록한 record_query 가 current_metrics 에 기록
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        request._performance_view_time = None
+        return metrics, token, time.perf_counter()
+
+    def finish(self, request, response, metrics, started):
+        total = (time.perf_counter() - started) * 1000
+
+        view = request._performance_view_time
+        if view is None:
+            view = total
+        db = metrics.query_time * 1000
+        serializer = metrics.serializer_time * 1000
+        size = len(response.content) if not response.streaming else 0
+
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={db:.1f};desc="{metrics.queries} queries"',
+            f'serializer;dur={serializer:.1f}',
+            f'view;dur={view:.1f}',
+            f'total;dur={total:.1f}',
+        ])
+
+        match = request.resolver_match
+        route = f'{request.method} /{match.route}' if match else f'{request.method} (unresolved)'
+        route_stats.record(route, total=total, view=view, db=db,
+                           serializer=serializer, queries=metrics.queries, size=size)
+
+        if ((self.query_budget is not None and metrics.queries > self.query_budget) or
+                (self.latency_budget is not None and total > self.latency_budget)):
+            logger.warning('over budget: %s %s status=%s queries=%d db=%.1fms serializer=%.1fms total=%.1fms size=%d',
+                           request.method, request.get_full_path(), response.status_code,
+                           metrics.queries, db, serializer, total, size)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._performance_view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # DRF Response 는 렌더링 전에 여기를 거치므로 렌더링 시간을 제외한 뷰 시간 측정
+        started = getattr(request, '_performance_view_started', None)
+        if started is not None:
+            request._performance_view_time = (
+                time.perf_counter() - started) * 1000
+        return response
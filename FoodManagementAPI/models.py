@@ -33,9 +33,15 @@ class UserIngredient(models.Model):
     start = models.DateField(default=timezone.now)
     end = models.DateField(default=timezone.now)
     memo = models.CharField(max_length=255, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ('user', 'ingredient')
+        indexes = [
+            models.Index(fields=['user', 'updated_at']),
+            # 유통기한 임박 조회, 만료 알림 집계
+            models.Index(fields=['user', 'end']),
+        ]
 
     def __str__(self):
         return self.user.username + "_" + self.ingredient.title + "_" + str(self.quantity)
@@ -77,9 +83,130 @@ class Cart(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     ingredient = models.ForeignKey(Ingredient, on_delete=models.CASCADE)
     buy = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ('user', 'ingredient')
+        indexes = [
+            models.Index(fields=['user', 'updated_at']),
+        ]
 
     def __str__(self):
         return self.user.username + "_" + self.ingredient.title
+
+
+# 유통기한 임박 식재료 알림 (사용자별, 날짜별 1건)
+# items: [{'id', 'ingredient_id', 'title', 'end'}]
+# notified_at: 알림 발송 시각, 발송 전에는 null
+class ExpiryDigest(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    date = models.DateField()
+    items = models.JSONField(default=list)
+    notified_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ('user', 'date')
+
+    def __str__(self):
+        return self.user.username + "_" + str(self.date)
+
+
+# 사용자 식재료/장바구니 삭제 기록 (동기화용)
+# 사용자 삭제 중에도 기록할 수 있도록 DB 외래키 제약은 두지 않음
+class SyncTombstone(models.Model):
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, db_constraint=False)
+    kind = models.CharField(max_length=32)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'kind', 'deleted_at']),
+        ]
+
+    def __str__(self):
+        return self.kind + "_" + str(self.object_id)
+
+
+# 제목 검색용 n-gram 색인
+# kind: 색인 대상 모델 (ingredient, ingredientcategory, recipe, recipecategory)
+# 단어별 1-gram, 2-gram 을 저장하고 검색어의 n-gram 을 모두 가진 object_id 를 찾음
+class TitleNgram(models.Model):
+    kind = models.CharField(max_length=32)
+    object_id = models.BigIntegerField()
+    gram = models.CharField(max_length=2)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['kind', 'gram', 'object_id']),
+            models.Index(fields=['kind', 'object_id']),
+        ]
+
+    def __str__(self):
+        return self.kind + "_" + str(self.object_id) + "_" + self.gram
+
+
+# 비슷한 레시피 검색용 레시피별 MinHash 서명 (similarity_index.py)
+# signature: uint32 x NUM_PERM (little endian), size: 식재료 수 (0 이면 식재료 없음)
+# build_similarity_index 명령으로 전체 생성, 레시피 식재료 변경 시 signals 에서 해당 레시피만 갱신
+class RecipeSignature(models.Model):
+    recipe = models.OneToOneField(
+        Recipe, on_delete=models.CASCADE, primary_key=True)
+    signature = models.BinaryField()
+    size = models.IntegerField()
+    updated_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return str(self.recipe_id) + "_" + str(self.size)
+
+
+# 레시피 조회(/api/recipe, /api/recipe/<pk>)용으로 미리 만들어 둔 RecipeSerializer 출력 (recipe_documents.py)
+# document: JSON 문자열 (MySQL JSON 타입은 키 순서가 바뀌므로 JSONField 대신 문자열로 저장)
+# 레시피, 레시피 식재료, 식재료, 카테고리가 변경되면 signals 에서 해당 레시피 문서 다시 생성
+class RecipeDocument(models.Model):
+    recipe = models.OneToOneField(
+        Recipe, on_delete=models.CASCADE, primary_key=True, related_name='document')
+    document = models.TextField()
+    updated_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return str(self.recipe_id)
+
+
+# 백그라운드 작업 (jobs.py, run_jobs 명령으로 실행)
+# name: 등록된 작업 이름 (tasks.py), kwargs: 작업 인자
+# status: queued -> running -> succeeded / failed, 실패하면 max_attempts 까지 run_at 을 늦춰서 다시 queued
+# key: 같은 key 로 대기 중인 작업이 있으면 새로 추가하지 않음
+# progress: 0~1, message: 진행 상황, heartbeat: 실행 중인 worker 가 주기적으로 갱신 (멈춘 worker 의 작업은 다시 queued)
+class Job(models.Model):
+    QUEUED, RUNNING, SUCCEEDED, FAILED = 'queued', 'running', 'succeeded', 'failed'
+    STATUS_CHOICES = [(QUEUED, 'queued'), (RUNNING, 'running'), (SUCCEEDED, 'succeeded'), (FAILED, 'failed')]
+
+    name = models.CharField(max_length=64)
+    kwargs = models.JSONField(default=dict, blank=True)
+    key = models.CharField(max_length=255, blank=True, db_index=True)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=QUEUED)
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=3)
+    run_at = models.DateTimeField(default=timezone.now)
+    worker = models.CharField(max_length=64, blank=True)
+    heartbeat = models.DateTimeField(null=True, blank=True)
+    progress = models.FloatField(default=0)
+    message = models.CharField(max_length=255, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # 실행할 작업 조회
+            models.Index(fields=['status', 'run_at']),
+            # 작업별 동시 실행 수
+            models.Index(fields=['name', 'status']),
+        ]
+
+    def __str__(self):
+        return self.name + "_" + str(self.pk) + "_" + self.status
@@ -0,0 +1,176 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from functools import reduce
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+# 페이지 번호 방식 + 선택적 커서(keyset) 방식 페이지네이션
+# ?cursor= 가 있으면 커서 방식으로 동작
+# 커서 방식은 OFFSET, COUNT(*) 없이 마지막 행의 정렬 값 다음부터 조회하므로 깊은 페이지도 첫 페이지와 비용이 같음
+# 정렬 필드에 id 를 추가해서 값이 같은 행의 순서를 고정
+# 전체 개수는 ?count=true 일 때만 계산
+class KeysetPagination(PageNumberPagination):
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.cursor_query_param in request.query_params
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        ordering = self.get_keyset_ordering(queryset)
+        values, reverse = self.decode_cursor(request, len(ordering))
+
+        self.count = None
+        if request.query_params.get(self.count_query_param, '').lower() in ('1', 'true'):
+            self.count = queryset.count()
+
+        if values is not None:
+            queryset = queryset.filter(
+                self.keyset_filter(ordering, values, reverse))
+        order_by = [('-' if desc != reverse else '') + field
+                    for field, desc in ordering]
+        rows = list(queryset.order_by(*order_by)[:page_size + 1])
+
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, values is not None
+
+        self.next_values = self.row_values(
+            rows[-1], ordering) if rows and self.has_next else None
+        self.previous_values = self.row_values(
+            rows[0], ordering) if rows and self.has_previous else None
+        return rows
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+
+        response = {}
+        if self.count is not None:
+            response['count'] = self.count
+        response['next'] = self.get_cursor_link(self.next_values, False)
+        response['previous'] = self.get_cursor_link(
+            self.previous_values, True)
+        response['results'] = data
+        return Response(response)
+
+    @staticmethod
+    def get_keyset_ordering(queryset):
+        """
+        (필드, 내림차순 여부) 리스트, 마지막은 항상 id
+        """
+        ordering = []
+        for field in queryset.query.order_by or queryset.model._meta.ordering:
+            if not isinstance(field, str):
+                continue
+            desc = field.startswith('-')
+            field = field.lstrip('-')
+            if field == 'pk':
+                field = 'id'
+            ordering.append((field, desc))
+            if field == 'id':
+                return ordering
+        ordering.append(('id', False))
+        return ordering
+
+    @staticmethod
+    def keyset_filter(ordering, values, reverse):
+        """
+        (f1, f2, ...) > (v1, v2, ...) 를 필드별 정렬 방향에 맞춰 Q 로 변환
+        """
+        conditions = []
+        for i, (field, desc) in enumerate(ordering):
+            lookup = 'lt' if desc != reverse else 'gt'
+            condition = Q(**{f'{field}__{lookup}': values[i]})
+            for j, (prev_field, _) in enumerate(ordering[:i]):
+                condition &= Q(**{prev_field: values[j]})
+            conditions.append(condition)
+        return reduce(lambda a, b: a | b, conditions)
+
+    @staticmethod
+    def row_values(row, ordering):
+        values = []
+        for field, _ in ordering:
+            value = row
+            for attr in field.split('__'):
+                value = getattr(value, attr)
+            values.append(value)
+        return values
+
+    def decode_cursor(self, request, length):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            cursor = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            values, reverse = cursor['v'], bool(cursor.get('r'))
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != length:
+            raise NotFound(self.invalid_cursor_message)
+        return values, reverse
+
+    def get_cursor_link(self, values, reverse):
+        if values is None:
+            return None
+        cursor = {'v': values}
+        if reverse:
+            cursor['r'] = 1
+        encoded = urlsafe_b64encode(json.dumps(
+            cursor, ensure_ascii=False, default=str).encode('utf-8')).decode('ascii')
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+
+# 관리자 화면 목록용 Paginator
+# 필터/검색이 없는 전체 목록은 DB 통계의 추정 행 수 사용 (MySQL information_schema, PostgreSQL pg_class)
+# 추정 값이 ADMIN_ESTIMATED_COUNT_THRESHOLD 보다 작거나 추정할 수 없으면(SQLite) 정확한 COUNT(*)
+# 필터/검색 결과는 ADMIN_COUNT_LIMIT 개까지만 세므로 그 이후 페이지는 표시하지 않음
+class EstimatedCountPaginator(Paginator):
+    estimate_threshold = getattr(settings, 'ADMIN_ESTIMATED_COUNT_THRESHOLD', 100000)
+    count_limit = getattr(settings, 'ADMIN_COUNT_LIMIT', 10000)
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if queryset.query.where:
+            return queryset.order_by()[:self.count_limit].count()
+
+        estimate = self.estimated_count(queryset)
+        if estimate is not None and estimate >= self.estimate_threshold:
+            return estimate
+        return queryset.count()
+
+    @staticmethod
+    def estimated_count(queryset):
+        connection = connections[queryset.db]
+        table = queryset.model._meta.db_table
+        with connection.cursor() as cursor:
+            if connection.vendor == 'mysql':
+                cursor.execute('SELECT TABLE_ROWS FROM information_schema.TABLES '
+                               'WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s', [table])
+            elif connection.vendor == 'postgresql':
+                cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)',
+                               [connection.ops.quote_name(table)])
+            else:
+                return None
+            row = cursor.fetchone()
+        return int(row[0]) if row and row[0] is not None and row[0] >= 0 else None
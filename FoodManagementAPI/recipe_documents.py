@@ -0,0 +1,168 @@
+import threading
+from collections import defaultdict
+
+import orjson
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Prefetch
+from django.http import Http404
+from django.utils import timezone
+
+from .db_router import use_primary
+from .jobs import enqueue
+from .metrics import TimedSerializerMixin
+from .models import Recipe, RecipeIngredient, RecipeDocument
+from .row_serializers import RecipeIngredientRowSerializer
+
+
+# RecipeSerializer 로 직렬화할 때 사용하는 queryset (생성, 수정 응답)
+# 레시피 식재료는 (recipe, ingredient) unique 색인 순서로 정렬 (저장된 문서와 같은 순서)
+recipe_queryset = Recipe.objects.select_related('category').prefetch_related(
+    Prefetch('recipeingredient_set', queryset=RecipeIngredient.objects.select_related(
+        'ingredient__category').order_by('recipe_id', 'ingredient_id')))
+
+# 레시피 조회용 queryset, 저장된 문서를 같은 쿼리로 가져옴
+document_queryset = Recipe.objects.select_related('document')
+
+REBUILD_BATCH_SIZE = 500
+
+def build_documents(recipe_ids):
+    """
+    RecipeSerializer 와 같은 JSON 구조(키 순서 포함)의 문서를 values_list 행으로 생성 (row_serializers.py)
+    {recipe id: 문서} 반환
+    """
+    rows = list(RecipeIngredient.objects.filter(recipe_id__in=recipe_ids).order_by(
+        'recipe_id', 'ingredient_id').values_list(*RecipeIngredientRowSerializer.fields))
+    recipe_ingredients = defaultdict(list)
+    for row, data in zip(rows, RecipeIngredientRowSerializer(None).to_representation(rows)):
+        recipe_ingredients[row[5]].append(data)
+
+    return {
+        pk: {'id': pk, 'code': code, 'title': title, 'category': {'id': category_id, 'title': category_title},
+             'recipe_ingredients': recipe_ingredients[pk]}
+        for pk, code, title, category_id, category_title in Recipe.objects.filter(id__in=recipe_ids).values_list(
+            'id', 'code', 'title', 'category_id', 'category__title')
+    }
+
+
+def rebuild_recipe_documents(recipe_ids, batch_size=REBUILD_BATCH_SIZE):
+    """
+    해당 레시피들의 문서를 다시 만들어서 저장 (삭제된 레시피는 건너뜀)
+    {recipe id: RecipeDocument} 반환
+    """
+    recipe_ids = sorted(set(recipe_ids))
+    documents = {}
+    # MySQL 은 충돌 대상(unique_fields)을 지정하지 않음
+    unique_fields = ['recipe'] if connection.features.supports_update_conflicts_with_target else None
+    for start in range(0, len(recipe_ids), batch_size):
+        now = timezone.now()
+        batch = [RecipeDocument(recipe_id=pk, document=orjson.dumps(data).decode('utf-8'), updated_at=now)
+                 for pk, data in build_documents(recipe_ids[start:start + batch_size]).items()]
+        RecipeDocument.objects.bulk_create(
+            batch, update_conflicts=True, unique_fields=unique_fields, update_fields=['document', 'updated_at'])
+        documents.update((document.recipe_id, document) for document in batch)
+    return documents
+
+
+# 트랜잭션 안에서 변경된 레시피 id 를 모아서 커밋 후 한 번에 다시 생성
+# (식재료 삭제로 레시피 식재료가 cascade 삭제되는 경우 등 같은 레시피가 여러 번 변경되어도 한 번만 생성)
+# 무효화할 때마다 on_commit 을 등록하고, 커밋 후 처음 실행되는 콜백이 모인 id 를 모두 가져가서 생성 (나머지 콜백은 할 일 없음)
+# 롤백된 트랜잭션에서 모은 id 는 문서도 함께 복구되므로 문서가 없는 레시피만 생성
+# DB 연결이 스레드별이므로 모으는 id 도 스레드별로 관리
+_pending = threading.local()
+
+
+def _pending_recipe_ids():
+    if not hasattr(_pending, 'recipe_ids'):
+        _pending.recipe_ids = set()
+    return _pending.recipe_ids
+
+
+# RECIPE_DOCUMENTS_DEFER_THRESHOLD 개 이상이면 응답을 기다리게 하지 않도록 백그라운드 작업으로 생성 (tasks.py)
+def _rebuild_pending():
+    pending = _pending_recipe_ids()
+    if not pending:
+        return
+    recipe_ids = set(Recipe.objects.filter(id__in=pending, document__isnull=True).values_list('id', flat=True))
+    pending.clear()
+    if not recipe_ids:
+        return
+    if len(recipe_ids) >= getattr(settings, 'RECIPE_DOCUMENTS_DEFER_THRESHOLD', 1000):
+        enqueue('rebuild_recipe_documents', recipe_ids=sorted(recipe_ids))
+    else:
+        rebuild_recipe_documents(recipe_ids)
+
+
+def invalidate_recipe_documents(recipe_ids):
+    """
+    해당 레시피들의 문서를 삭제하고 커밋 후 다시 생성
+    커밋 전이나 다시 생성하기 전에 조회하면 조회할 때 생성 (RecipeDocumentSerializer)
+    """
+    recipe_ids = set(recipe_ids)
+    if not recipe_ids:
+        return
+    RecipeDocument.objects.filter(recipe_id__in=recipe_ids).delete()
+    _pending_recipe_ids().update(recipe_ids)
+    transaction.on_commit(_rebuild_pending)
+
+
+# document_queryset 으로 가져온 레시피를 저장된 문서로 직렬화 (RecipeSerializer 와 같은 출력)
+# 문서가 없는 레시피는 RecipeSerializer 로 만들어서 저장
+class DocumentSerializer:
+    def __init__(self, instance=None, many=False, **kwargs):
+        self.instance = instance
+        self.many = many
+
+    @property
+    def data(self):
+        recipes = self.instance if self.many else [self.instance]
+        documents = self.to_representation(recipes)
+        if self.many:
+            return documents
+        if not documents:
+            raise Http404
+        return documents[0]
+
+    async def adata(self):
+        # 비동기 뷰에서 사용, 문서가 없는 레시피가 있으면 스레드에서 생성
+        if all(hasattr(recipe, 'document') for recipe in (self.instance if self.many else [self.instance])):
+            return self.data
+        return await sync_to_async(lambda: self.data)()
+
+    def to_representation(self, recipes):
+        missing = [recipe.pk for recipe in recipes if not hasattr(recipe, 'document')]
+        rebuilt = {}
+        if missing:
+            # 저장할 문서는 default 에서 읽어서 생성 (지연된 복제 DB 의 이전 데이터를 저장하지 않도록)
+            with use_primary():
+                rebuilt = rebuild_recipe_documents(missing)
+        documents = []
+        for recipe in recipes:
+            document = rebuilt.get(recipe.pk) or getattr(recipe, 'document', None)
+            # 조회 도중 삭제된 레시피는 제외
+            if document is not None:
+                documents.append(orjson.loads(document.document))
+        return documents
+
+
+class RecipeDocumentSerializer(TimedSerializerMixin, DocumentSerializer):
+    pass
+
+
+# 레시피 조회(GET)는 저장된 문서로 응답 (레시피 + 문서 한 번의 쿼리)
+# 생성, 수정, 삭제는 기존 queryset, serializer 사용
+class RecipeDocumentMixin:
+    def use_documents(self):
+        request = getattr(self, 'request', None)
+        return request is not None and request.method in ('GET', 'HEAD')
+
+    def get_queryset(self):
+        if self.use_documents():
+            return document_queryset.all()
+        return super().get_queryset()
+
+    def get_serializer(self, *args, **kwargs):
+        if self.use_documents():
+            return RecipeDocumentSerializer(*args, **kwargs)
+        return super().get_serializer(*args, **kwargs)
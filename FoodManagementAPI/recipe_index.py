@@ -0,0 +1,104 @@
+from collections import namedtuple
+
+import numpy as np
+
+from .models import RecipeIngredient
+from .versioning import VersionedSnapshot
+
+
+# recipe_ids: 레시피 위치 -> recipe id
+# recipe_sizes: 레시피 위치별 식재료 수
+# recipe_indptr, recipe_ingredients: 레시피 위치별 식재료 id (CSR)
+# postings: 식재료 id -> 해당 식재료가 포함된 레시피 위치 (역색인)
+IndexSnapshot = namedtuple('IndexSnapshot', [
+    'recipe_ids', 'recipe_sizes', 'recipe_indptr', 'recipe_ingredients', 'postings'])
+
+
+# 순위가 매겨진 레시피 목록
+# 페이지네이션에서 자른 구간만 (recipe id, 보유 식재료 수, 전체 식재료 수) 튜플로 변환
+class RankedRecipes:
+    def __init__(self, recipe_ids, matched, sizes):
+        self.recipe_ids = recipe_ids
+        self.matched = matched
+        self.sizes = sizes
+
+    def __len__(self):
+        return len(self.recipe_ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(zip(self.recipe_ids[index].tolist(), self.matched[index].tolist(), self.sizes[index].tolist()))
+        return int(self.recipe_ids[index]), int(self.matched[index]), int(self.sizes[index])
+
+
+# 레시피 x 식재료 역색인
+# RecipeIngredient 전체를 메모리에 올려두고, 사용자 식재료 목록으로 레시피별 보유 식재료 수를 한 번에 계산
+# RecipeIngredient 변경 시 signals 에서 버전을 올리면 다음 조회 때 다시 생성
+class RecipeIngredientIndex(VersionedSnapshot):
+    VERSION_KEY = 'recipe-ingredient-index-version'
+
+    def build(self):
+        values = RecipeIngredient.objects.order_by().values_list(
+            'recipe_id', 'ingredient_id').iterator(chunk_size=10000)
+        rows = np.fromiter(
+            (value for row in values for value in row), dtype=np.int64).reshape(-1, 2)
+
+        order = np.lexsort((rows[:, 1], rows[:, 0]))
+        recipe_col = rows[order, 0]
+        ingredient_col = rows[order, 1]
+
+        recipe_ids, recipe_pos, recipe_sizes = np.unique(
+            recipe_col, return_inverse=True, return_counts=True)
+        recipe_indptr = np.zeros(len(recipe_ids) + 1, dtype=np.int64)
+        np.cumsum(recipe_sizes, out=recipe_indptr[1:])
+
+        # 식재료 기준으로 다시 정렬해서 식재료별 레시피 위치 목록 생성
+        by_ingredient = np.argsort(ingredient_col, kind='stable')
+        sorted_ingredients = ingredient_col[by_ingredient]
+        sorted_recipe_pos = recipe_pos[by_ingredient]
+        ingredient_ids, starts, counts = np.unique(
+            sorted_ingredients, return_index=True, return_counts=True)
+        postings = {
+            int(ingredient_id): sorted_recipe_pos[start:start + count]
+            for ingredient_id, start, count in zip(ingredient_ids, starts, counts)
+        }
+
+        return IndexSnapshot(recipe_ids, recipe_sizes, recipe_indptr, ingredient_col, postings)
+
+    def rank(self, ingredient_ids):
+        """
+        보유 식재료 id 목록으로 레시피 순위 계산
+        반환: 보유 비율이 높은 순으로 정렬된 RankedRecipes
+        """
+        snapshot = self.snapshot()
+
+        postings = [snapshot.postings[i]
+                    for i in set(ingredient_ids) if i in snapshot.postings]
+        if not postings:
+            return RankedRecipes(*(np.empty(0, dtype=np.int64),) * 3)
+
+        matched = np.bincount(np.concatenate(postings),
+                              minlength=len(snapshot.recipe_ids))
+        candidates = np.flatnonzero(matched)
+        matched = matched[candidates]
+        sizes = snapshot.recipe_sizes[candidates]
+        recipe_ids = snapshot.recipe_ids[candidates]
+
+        # 보유 비율 내림차순, 부족한 식재료 수 오름차순, recipe id 오름차순
+        order = np.lexsort((recipe_ids, sizes - matched, -matched / sizes))
+        return RankedRecipes(recipe_ids[order], matched[order], sizes[order])
+
+    def missing_ingredients(self, recipe_id, ingredient_ids):
+        """
+        해당 레시피의 식재료 중 ingredient_ids 에 없는 식재료 id 목록
+        """
+        snapshot = self.snapshot()
+
+        pos = np.searchsorted(snapshot.recipe_ids, recipe_id)
+        if pos >= len(snapshot.recipe_ids) or snapshot.recipe_ids[pos] != recipe_id:
+            return []
+        start, end = snapshot.recipe_indptr[pos], snapshot.recipe_indptr[pos + 1]
+        return [int(i) for i in snapshot.recipe_ingredients[start:end] if int(i) not in ingredient_ids]
+
+
+recipe_ingredient_index = RecipeIngredientIndex()
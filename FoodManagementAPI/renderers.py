@@ -0,0 +1,23 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+# orjson 을 사용하는 JSONRenderer
+# JSONRenderer 기본 설정(UNICODE_JSON, COMPACT_JSON)과 같은 바이트를 출력
+# datetime, Decimal 등은 DRF JSONEncoder 로 변환, orjson 이 처리하지 못하는 값(64bit 초과 정수, 문자열이 아닌 키 등)이나
+# 들여쓰기 요청은 JSONRenderer 사용
+# float 는 지수 표기가 다를 수 있으므로 (1e+16 / 1e16) float 가 없는 응답에 사용
+class FastJSONRenderer(JSONRenderer):
+    encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.encoder.default,
+                               option=orjson.OPT_PASSTHROUGH_DATETIME)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # JSONRenderer 와 같이 JavaScript 에서 줄바꿈으로 처리되는 문자 escape
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
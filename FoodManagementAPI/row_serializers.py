@@ -0,0 +1,79 @@
+from itertools import islice
+
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.response import Response
+
+from .metrics import TimedSerializerMixin
+from .renderers import FastJSONRenderer
+
+
+# 조회 전용 직렬화
+# 모델 객체, 중첩 serializer 를 만들지 않고 values_list 행으로 serializers.py 와 같은 JSON 구조(키 순서 포함)를 생성
+# serializers.py 의 serializer 를 변경하면 같이 변경해야 함 (tests.py 에서 출력 비교)
+# 레시피 조회용 문서(recipe_documents.py)도 RecipeIngredientRowSerializer 로 생성
+class RowSerializer:
+    fields = []
+
+    def __init__(self, queryset):
+        self.queryset = queryset
+
+    @property
+    def data(self):
+        return self.to_representation(list(self.queryset.values_list(*self.fields)))
+
+    def iter_chunks(self, chunk_size):
+        # StreamingListMixin 에서 사용, chunk_size 행씩 직렬화
+        rows = self.queryset.values_list(*self.fields).iterator(chunk_size=chunk_size)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            yield self.to_representation(chunk)
+
+    def to_representation(self, rows):
+        return [self.row_representation(row) for row in rows]
+
+    def row_representation(self, row):
+        raise NotImplementedError
+
+
+# IngredientSerializer
+class IngredientRowSerializer(TimedSerializerMixin, RowSerializer):
+    fields = ['id', 'title', 'category_id', 'category__title']
+
+    def row_representation(self, row):
+        pk, title, category_id, category_title = row
+        return {'id': pk, 'title': title, 'category': {'id': category_id, 'title': category_title}}
+
+
+# RecipeIngredientSerializer
+class RecipeIngredientRowSerializer(TimedSerializerMixin, RowSerializer):
+    fields = ['id', 'ingredient_id', 'ingredient__title', 'ingredient__category_id', 'ingredient__category__title',
+              'recipe_id', 'recipe__code', 'recipe__title', 'recipe__category__title']
+
+    def row_representation(self, row):
+        (pk, ingredient_id, ingredient_title, category_id, category_title,
+         recipe_id, recipe_code, recipe_title, recipe_category_title) = row
+        return {
+            'id': pk,
+            'ingredient': {'id': ingredient_id, 'title': ingredient_title,
+                           'category': {'id': category_id, 'title': category_title}},
+            'recipe': {'id': recipe_id, 'code': recipe_code, 'title': recipe_title, 'category': recipe_category_title},
+        }
+
+
+# 페이지네이션을 사용하지 않는 목록 조회(GET)는 row_serializer_class 와 FastJSONRenderer 로 응답
+# 페이지네이션을 사용하면 기존 serializer 사용
+class RowListMixin:
+    row_serializer_class = None
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        return Response(self.row_serializer_class(queryset).data)
@@ -0,0 +1,126 @@
+from functools import reduce
+
+from django.db.models import Case, Count, IntegerField, Q, Value, When
+from rest_framework import filters
+
+from .models import TitleNgram
+
+
+# 제목 n-gram 색인
+# 한국어 제목은 짧고 부분 문자열 검색이 필요해서 LIKE '%검색어%' 대신 2-gram 색인 사용
+# 제목은 공백 기준 단어로 나누고 단어별 1-gram, 2-gram 저장
+def title_grams(title):
+    grams = set()
+    for word in title.lower().split():
+        grams.update(word)
+        grams.update(word[i:i + 2] for i in range(len(word) - 1))
+    return grams
+
+
+def term_grams(term):
+    term = term.lower()
+    if len(term) == 1:
+        return {term}
+    return {term[i:i + 2] for i in range(len(term) - 1)}
+
+
+def index_kind(model):
+    return model._meta.model_name
+
+
+def update_title_index(model, objects):
+    """
+    objects: (id, title) 목록, 해당 객체의 n-gram 을 다시 생성
+    """
+    kind = index_kind(model)
+    objects = list(objects)
+    TitleNgram.objects.filter(
+        kind=kind, object_id__in=[pk for pk, _ in objects]).delete()
+    TitleNgram.objects.bulk_create(
+        [TitleNgram(kind=kind, object_id=pk, gram=gram)
+         for pk, title in objects for gram in title_grams(title)],
+        batch_size=1000)
+
+
+def delete_title_index(model, ids):
+    TitleNgram.objects.filter(kind=index_kind(model), object_id__in=ids).delete()
+
+
+def matching_ids(model, term):
+    """
+    검색어의 n-gram 을 모두 가진 object_id 서브쿼리
+    """
+    grams = term_grams(term)
+    return (TitleNgram.objects
+            .filter(kind=index_kind(model), gram__in=grams)
+            .values('object_id')
+            .annotate(matched=Count('gram', distinct=True))
+            .filter(matched=len(grams))
+            .values('object_id'))
+
+
+# search_fields 의 title 필드를 n-gram 색인으로 검색하는 SearchFilter
+# 예: 'title', 'category__title', 'ingredient__title', 'recipe__title'
+# title 이 아닌 필드나 ^, =, @, $ 접두사가 붙은 필드는 기존 SearchFilter 와 같이 동작
+# ?ordering= 이 없으면 정확히 일치 > 앞부분 일치 > 부분 일치 순으로 정렬
+class NgramSearchFilter(filters.SearchFilter):
+    def get_title_model(self, queryset, search_field):
+        """
+        n-gram 색인 대상이면 (title 을 가진 모델, 해당 모델 id 경로) 반환
+        """
+        parts = search_field.split('__')
+        if parts[-1] != 'title' or search_field[0] in self.lookup_prefixes:
+            return None
+        model = queryset.model
+        for part in parts[:-1]:
+            model = model._meta.get_field(part).related_model
+            if model is None:
+                return None
+        return model, '__'.join(parts[:-1] + ['id'])
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        search_terms = self.get_search_terms(request)
+
+        if not search_fields or not search_terms:
+            return queryset
+
+        conditions = []
+        for term in search_terms:
+            queries = []
+            for search_field in search_fields:
+                title_model = self.get_title_model(queryset, search_field)
+                if title_model is None:
+                    lookup = self.construct_search(str(search_field))
+                    queries.append(Q(**{lookup: term}))
+                    continue
+                model, id_path = title_model
+                query = Q(**{f'{id_path}__in': matching_ids(model, term)})
+                # 3글자 이상은 2-gram 이 모두 있어도 연속하지 않을 수 있으므로 후보 안에서 다시 확인
+                if len(term) > 2:
+                    query &= Q(**{f'{search_field}__icontains': term})
+                queries.append(query)
+            conditions.append(reduce(lambda a, b: a | b, queries))
+        queryset = queryset.filter(reduce(lambda a, b: a & b, conditions))
+
+        if not request.query_params.get(filters.OrderingFilter.ordering_param):
+            queryset = self.order_by_rank(queryset, search_fields, search_terms)
+        return queryset
+
+    def order_by_rank(self, queryset, search_fields, search_terms):
+        # 첫 번째 title 필드 기준 관련도
+        search_field = next((field for field in search_fields
+                             if self.get_title_model(queryset, field)), None)
+        if search_field is None:
+            return queryset
+        rank = Value(0)
+        for term in search_terms:
+            rank += Case(
+                When(**{f'{search_field}__iexact': term}, then=Value(3)),
+                When(**{f'{search_field}__istartswith': term}, then=Value(2)),
+                When(**{f'{search_field}__icontains': term}, then=Value(1)),
+                default=Value(0),
+                output_field=IntegerField(),
+            )
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        return queryset.annotate(search_rank=rank).order_by('-search_rank', *ordering)
@@ -1,22 +1,26 @@
+import inspect
+
 from rest_framework import serializers
 from django.contrib.auth.models import User
 
-from .models import IngredientCategory, Ingredient, UserIngredient, RecipeCategory, Recipe, RecipeIngredient, Cart
+from .models import IngredientCategory, Ingredient, UserIngredient, RecipeCategory, Recipe, RecipeIngredient, Cart, Job
+from .jobs import tasks
+from .metrics import TimedSerializerMixin
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'username', 'email']
 
 
-class IngredientCategorySerializer(serializers.ModelSerializer):
+class IngredientCategorySerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = IngredientCategory
         fields = ['id', 'title']
 
 
-class IngredientSerializer(serializers.ModelSerializer):
+class IngredientSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     category = IngredientCategorySerializer(read_only=True)
 
     category_id = serializers.PrimaryKeyRelatedField(
@@ -27,7 +31,7 @@ class IngredientSerializer(serializers.ModelSerializer):
         fields = ['id', 'title', 'category', 'category_id']
 
 
-class UserIngredientSerializer(serializers.ModelSerializer):
+class UserIngredientSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
     ingredient = IngredientSerializer(read_only=True)
 
@@ -40,13 +44,13 @@ class UserIngredientSerializer(serializers.ModelSerializer):
                   'ingredient_id', 'quantity', 'start', 'end', 'memo']
 
 
-class RecipeCategorySerializer(serializers.ModelSerializer):
+class RecipeCategorySerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = RecipeCategory
         fields = ['id', 'title']
 
 
-class RecipeSerializer(serializers.ModelSerializer):
+class RecipeSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     category = RecipeCategorySerializer(read_only=True)
 
     category_id = serializers.PrimaryKeyRelatedField(
@@ -55,7 +59,8 @@ class RecipeSerializer(serializers.ModelSerializer):
     recipe_ingredients = serializers.SerializerMethodField(read_only=True)
 
     def get_recipe_ingredients(self, obj):
-        recipe_ingredients = RecipeIngredient.objects.filter(recipe=obj)
+        # 뷰에서 prefetch_related 로 미리 가져온 레시피 식재료 사용
+        recipe_ingredients = obj.recipeingredient_set.all()
         serializer = RecipeIngredientSerializer(recipe_ingredients, many=True)
         return serializer.data
 
@@ -65,7 +70,7 @@ class RecipeSerializer(serializers.ModelSerializer):
                   'category_id', 'recipe_ingredients']
 
 
-class RecipeIngredientSerializer(serializers.ModelSerializer):
+class RecipeIngredientSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     recipe = serializers.SerializerMethodField(read_only=True)
     ingredient = IngredientSerializer(read_only=True)
 
@@ -97,7 +102,7 @@ class RecipeIngredientSerializer(serializers.ModelSerializer):
 #                   'user_id', 'ingredient_id', 'buy']
 
 
-class CartSerializer(serializers.ModelSerializer):
+class CartSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
     ingredient = IngredientSerializer(read_only=True)
 
@@ -107,3 +112,118 @@ class CartSerializer(serializers.ModelSerializer):
     class Meta:
         model = Cart
         fields = ['id', 'user', 'ingredient', 'ingredient_id', 'buy']
+
+
+# 일괄 추가/수정 요청 항목 검증용
+# ingredient_id 존재 여부는 뷰에서 한 번의 쿼리로 확인
+class UserIngredientBatchSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(required=False)
+    ingredient_id = serializers.IntegerField()
+
+    class Meta:
+        model = UserIngredient
+        fields = ['id', 'ingredient_id', 'quantity', 'start', 'end', 'memo']
+
+
+class CartBatchSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(required=False)
+    ingredient_id = serializers.IntegerField()
+
+    class Meta:
+        model = Cart
+        fields = ['id', 'ingredient_id', 'buy']
+
+
+# 보유 식재료 기준 레시피 추천 결과
+class CookableRecipeSerializer(TimedSerializerMixin, serializers.Serializer):
+    recipe = serializers.SerializerMethodField(read_only=True)
+    matched_count = serializers.IntegerField(read_only=True)
+    total_count = serializers.IntegerField(read_only=True)
+    coverage = serializers.FloatField(read_only=True)
+    missing_ingredients = IngredientSerializer(many=True, read_only=True)
+
+    def get_recipe(self, obj):
+        recipe = obj['recipe']
+        return {'id': recipe.id, 'code': recipe.code, 'title': recipe.title, 'category': recipe.category.title}
+
+
+# 식단 계획 레시피 (meal_plan.py)
+# used_ingredients: 사용하는 보유 식재료, missing_ingredients: 보유/장바구니에 없어 새로 사야 하는 식재료
+class MealPlanRecipeSerializer(TimedSerializerMixin, serializers.Serializer):
+    recipe = serializers.SerializerMethodField(read_only=True)
+    used_ingredients = UserIngredientSerializer(many=True, read_only=True)
+    missing_ingredients = IngredientSerializer(many=True, read_only=True)
+
+    def get_recipe(self, obj):
+        recipe = obj['recipe']
+        return {'id': recipe.id, 'code': recipe.code, 'title': recipe.title, 'category': recipe.category.title}
+
+
+# 식단 계획 결과
+# shopping_list: 전체 레시피에서 새로 사야 하는 식재료 (중복 제거)
+# complete: 제한 시간 안에 교체 탐색을 끝까지 실행했는지 여부
+class MealPlanSerializer(TimedSerializerMixin, serializers.Serializer):
+    recipes = MealPlanRecipeSerializer(many=True, read_only=True)
+    shopping_list = IngredientSerializer(many=True, read_only=True)
+    used_count = serializers.IntegerField(read_only=True)
+    score = serializers.FloatField(read_only=True)
+    complete = serializers.BooleanField(read_only=True)
+
+
+# 비슷한 레시피 결과
+class SimilarRecipeSerializer(TimedSerializerMixin, serializers.Serializer):
+    recipe = serializers.SerializerMethodField(read_only=True)
+    similarity = serializers.FloatField(read_only=True)
+
+    def get_recipe(self, obj):
+        recipe = obj['recipe']
+        return {'id': recipe.id, 'code': recipe.code, 'title': recipe.title, 'category': recipe.category.title}
+
+
+# 식재료 자동완성 조건 (쿼리 파라미터)
+class IngredientAutocompleteQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(default='', allow_blank=True, max_length=100)
+    limit = serializers.IntegerField(default=10, min_value=1, max_value=50)
+
+
+# 식단 계획 조건 (쿼리 파라미터)
+# penalty: 새로 사야 하는 식재료 하나당 감점 (오늘 만료되는 보유 식재료 하나의 가중치가 1)
+class MealPlanQuerySerializer(serializers.Serializer):
+    recipes = serializers.IntegerField(default=7, min_value=1, max_value=21)
+    penalty = serializers.FloatField(default=0.3, min_value=0, max_value=10)
+
+
+# 비슷한 레시피 조회 조건 (쿼리 파라미터)
+class SimilarRecipeQuerySerializer(serializers.Serializer):
+    limit = serializers.IntegerField(default=10, min_value=1, max_value=50)
+    min_similarity = serializers.FloatField(default=0.1, min_value=0, max_value=1)
+    bands = serializers.IntegerField(required=False, min_value=1)
+
+
+class JobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Job
+        fields = ['id', 'name', 'kwargs', 'key', 'status', 'attempts', 'max_attempts', 'run_at', 'worker',
+                  'progress', 'message', 'result', 'error', 'created_at', 'started_at', 'finished_at']
+        read_only_fields = fields
+
+
+# 백그라운드 작업 추가 (name: tasks.py 에 등록된 작업, delay: 실행까지 기다리는 초)
+class JobCreateSerializer(serializers.Serializer):
+    name = serializers.CharField()
+    kwargs = serializers.DictField(default=dict)
+    key = serializers.CharField(default='', allow_blank=True, max_length=255)
+    delay = serializers.IntegerField(default=0, min_value=0)
+
+    def validate_name(self, value):
+        if value not in tasks:
+            raise serializers.ValidationError(f'unknown job: {value}')
+        return value
+
+    def validate(self, attrs):
+        # 작업 함수가 받지 않는 인자는 worker 에서 실패하므로 추가할 때 확인
+        try:
+            inspect.signature(tasks[attrs['name']].func).bind(**attrs['kwargs'])
+        except TypeError as e:
+            raise serializers.ValidationError({'kwargs': str(e)})
+        return attrs
@@ -0,0 +1,134 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import IngredientCategory, Ingredient, UserIngredient, RecipeCategory, Recipe, RecipeIngredient, Cart
+from .recipe_index import RecipeIngredientIndex
+from .similarity_index import RecipeSimilarityIndex, invalidate_recipe_signatures
+from .recipe_documents import invalidate_recipe_documents
+from .autocomplete import IngredientAutocompleteIndex
+from .search import update_title_index, delete_title_index
+from .catalog_cache import bump_catalog_version
+from .sync import record_tombstone
+from .authentication import invalidate_cached_user
+from .metrics import record_query
+
+
+# 레시피 식재료 변경 시 레시피 x 식재료 역색인 갱신
+# 레시피/식재료 삭제로 인한 cascade 삭제도 post_delete 로 전달됨
+@receiver(post_save, sender=RecipeIngredient)
+@receiver(post_delete, sender=RecipeIngredient)
+def invalidate_recipe_ingredient_index(sender, **kwargs):
+    RecipeIngredientIndex.invalidate()
+
+
+# 레시피 식재료 변경 시 해당 레시피의 MinHash 서명 갱신
+# 레시피 삭제 중(cascade)에는 서명도 함께 삭제되므로 커밋 후에 갱신 (삭제된 레시피는 건너뜀)
+# 같은 트랜잭션의 변경은 커밋 후 한 번에 갱신
+@receiver(post_save, sender=RecipeIngredient)
+@receiver(post_delete, sender=RecipeIngredient)
+def update_recipe_signature(sender, instance, **kwargs):
+    invalidate_recipe_signatures([instance.recipe_id])
+
+
+# 레시피 삭제 시 비슷한 레시피 색인에서 제외 (서명은 cascade 삭제, 식재료가 없는 레시피 포함)
+@receiver(post_delete, sender=Recipe)
+def invalidate_recipe_similarity_index(sender, **kwargs):
+    transaction.on_commit(RecipeSimilarityIndex.invalidate)
+
+
+# 레시피 조회용 문서 갱신 (문서에 포함된 레시피, 카테고리, 식재료, 식재료 카테고리가 변경된 레시피)
+# 레시피/식재료 삭제로 인한 레시피 식재료 cascade 삭제도 post_delete 로 전달됨 (레시피 삭제 시 문서는 cascade 삭제)
+@receiver(post_save, sender=Recipe)
+def invalidate_recipe_document(sender, instance, **kwargs):
+    invalidate_recipe_documents([instance.pk])
+
+
+@receiver(post_save, sender=RecipeIngredient)
+@receiver(post_delete, sender=RecipeIngredient)
+def invalidate_recipe_ingredient_document(sender, instance, **kwargs):
+    invalidate_recipe_documents([instance.recipe_id])
+
+
+@receiver(post_save, sender=RecipeCategory)
+def invalidate_recipe_category_documents(sender, instance, created, **kwargs):
+    if not created:
+        invalidate_recipe_documents(Recipe.objects.filter(
+            category=instance).values_list('id', flat=True))
+
+
+@receiver(post_save, sender=Ingredient)
+def invalidate_ingredient_documents(sender, instance, created, **kwargs):
+    if not created:
+        invalidate_recipe_documents(RecipeIngredient.objects.filter(
+            ingredient=instance).values_list('recipe_id', flat=True))
+
+
+@receiver(post_save, sender=IngredientCategory)
+def invalidate_ingredient_category_documents(sender, instance, created, **kwargs):
+    if not created:
+        invalidate_recipe_documents(RecipeIngredient.objects.filter(
+            ingredient__category=instance).values_list('recipe_id', flat=True))
+
+
+# 식재료 추가/변경/삭제 시 자동완성 색인 갱신
+@receiver(post_save, sender=Ingredient)
+@receiver(post_delete, sender=Ingredient)
+def invalidate_ingredient_autocomplete_index(sender, **kwargs):
+    IngredientAutocompleteIndex.invalidate()
+
+
+# 제목 변경 시 검색용 n-gram 색인 갱신
+@receiver(post_save, sender=IngredientCategory)
+@receiver(post_save, sender=Ingredient)
+@receiver(post_save, sender=RecipeCategory)
+@receiver(post_save, sender=Recipe)
+def update_title_ngrams(sender, instance, **kwargs):
+    update_title_index(sender, [(instance.pk, instance.title)])
+
+
+@receiver(post_delete, sender=IngredientCategory)
+@receiver(post_delete, sender=Ingredient)
+@receiver(post_delete, sender=RecipeCategory)
+@receiver(post_delete, sender=Recipe)
+def delete_title_ngrams(sender, instance, **kwargs):
+    delete_title_index(sender, [instance.pk])
+
+
+# 카탈로그 변경 시 조회 응답 캐시 버전 변경
+@receiver(post_save, sender=IngredientCategory)
+@receiver(post_save, sender=Ingredient)
+@receiver(post_save, sender=RecipeCategory)
+@receiver(post_save, sender=Recipe)
+@receiver(post_save, sender=RecipeIngredient)
+@receiver(post_delete, sender=IngredientCategory)
+@receiver(post_delete, sender=Ingredient)
+@receiver(post_delete, sender=RecipeCategory)
+@receiver(post_delete, sender=Recipe)
+@receiver(post_delete, sender=RecipeIngredient)
+def invalidate_catalog_cache(sender, **kwargs):
+    bump_catalog_version()
+
+
+# 사용자 식재료/장바구니 삭제 기록 (동기화용)
+@receiver(post_delete, sender=UserIngredient)
+@receiver(post_delete, sender=Cart)
+def record_sync_tombstone(sender, instance, **kwargs):
+    record_tombstone(instance)
+
+
+# 사용자 변경(비활성화, 비밀번호 변경, 권한 변경) 시 JWT 인증용 사용자 캐시 삭제
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_jwt_user_cache(sender, instance, **kwargs):
+    invalidate_cached_user(instance)
+
+
+# 요청별 DB 쿼리 수/시간 측정 (PerformanceMiddleware)
+# 비동기 뷰의 쿼리는 요청을 처리하는 스레드와 다른 스레드의 연결에서 실행되므로 연결마다 등록
+@receiver(connection_created)
+def install_query_metrics(sender, connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
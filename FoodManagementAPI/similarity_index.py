@@ -0,0 +1,267 @@
+import threading
+from collections import namedtuple
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .jobs import enqueue
+from .models import Recipe, RecipeIngredient, RecipeSignature
+from .versioning import VersionedSnapshot
+
+
+# MinHash 설정
+# NUM_PERM: 서명 길이, BANDS: LSH 밴드 수 (밴드당 NUM_PERM / BANDS 개 값)
+# 밴드가 많을수록(밴드당 값이 적을수록) 유사도가 낮은 레시피도 후보로 찾음 (재현율 증가, 후보 증가)
+# 후보가 될 확률이 1/2 인 유사도는 약 (1 / BANDS) ** (BANDS / NUM_PERM), 기본값 128/64 는 약 0.125
+# (레시피는 식재료가 적어서 비슷한 레시피도 Jaccard 유사도가 0.2~0.4 정도)
+# NUM_PERM 을 바꾸면 build_similarity_index 로 다시 생성해야 함, BANDS 는 서명을 다시 만들 필요 없음
+NUM_PERM = getattr(settings, 'SIMILAR_RECIPE_NUM_PERM', 128)
+BANDS = getattr(settings, 'SIMILAR_RECIPE_BANDS', 64)
+if NUM_PERM % BANDS:
+    raise ImproperlyConfigured('SIMILAR_RECIPE_NUM_PERM must be divisible by SIMILAR_RECIPE_BANDS')
+
+# 해시 함수 (a * x + b) mod PRIME, 모든 프로세스에서 같은 값을 사용하도록 seed 고정
+PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(20240101)
+HASH_A = _rng.integers(1, PRIME, size=NUM_PERM, dtype=np.int64)
+HASH_B = _rng.integers(0, PRIME, size=NUM_PERM, dtype=np.int64)
+BAND_MULTIPLIERS = _rng.integers(1, 1 << 63, size=NUM_PERM // BANDS, dtype=np.uint64) | np.uint64(1)
+
+EMPTY_SIGNATURE = np.full(NUM_PERM, PRIME, dtype=np.uint32)
+
+# 다른 프로세스의 변경을 놓치지 않도록 마지막 조회 시각보다 앞당겨서 다시 조회
+SAFETY_WINDOW = timedelta(seconds=5)
+
+
+def compute_signatures(pairs):
+    """
+    pairs: recipe_id 순으로 정렬된 (recipe_id, ingredient_id) 배열
+    반환: (recipe_ids, sizes, signatures)
+    """
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    if not len(pairs):
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty((0, NUM_PERM), dtype=np.uint32)
+    recipe_ids, starts, sizes = np.unique(pairs[:, 0], return_index=True, return_counts=True)
+    # 식재료별 해시를 먼저 계산하고 레시피별 최솟값
+    ingredient_ids, inverse = np.unique(pairs[:, 1], return_inverse=True)
+    hashes = (ingredient_ids[:, None] * HASH_A + HASH_B) % PRIME
+    signatures = np.minimum.reduceat(hashes[inverse], starts, axis=0).astype(np.uint32)
+    return recipe_ids, sizes, signatures
+
+
+def band_keys(signatures):
+    """
+    (N, NUM_PERM) 서명 -> (BANDS, N) 밴드별 해시
+    """
+    bands = signatures.reshape(len(signatures), BANDS, NUM_PERM // BANDS).astype(np.uint64)
+    return (bands * BAND_MULTIPLIERS).sum(axis=2, dtype=np.uint64).T
+
+
+def save_signatures(recipe_ids, sizes, signatures):
+    if not len(recipe_ids):
+        return
+    now = timezone.now()
+    # MySQL 은 충돌 대상(unique_fields)을 지정하지 않음
+    unique_fields = ['recipe'] if connection.features.supports_update_conflicts_with_target else None
+    RecipeSignature.objects.bulk_create(
+        [RecipeSignature(recipe_id=recipe_id, size=size, signature=signature.astype('<u4').tobytes(), updated_at=now)
+         for recipe_id, size, signature in zip(recipe_ids.tolist(), sizes.tolist(), signatures)],
+        update_conflicts=True, unique_fields=unique_fields, update_fields=['signature', 'size', 'updated_at'],
+        batch_size=1000)
+
+
+def update_recipe_signatures(recipe_ids):
+    """
+    해당 레시피들의 서명을 다시 계산해서 저장 (식재료가 없어진 레시피는 size=0)
+    """
+    recipe_ids = sorted(set(recipe_ids))
+    pairs = list(RecipeIngredient.objects.filter(recipe_id__in=recipe_ids)
+                 .order_by('recipe_id').values_list('recipe_id', 'ingredient_id'))
+    found_ids, sizes, signatures = compute_signatures(pairs)
+
+    empty_ids = np.setdiff1d(np.array(recipe_ids, dtype=np.int64), found_ids)
+    # cascade 로 삭제된 레시피는 제외
+    empty_ids = np.array(list(Recipe.objects.filter(id__in=empty_ids.tolist()).values_list('id', flat=True)),
+                         dtype=np.int64)
+    with transaction.atomic():
+        save_signatures(found_ids, sizes, signatures)
+        save_signatures(empty_ids, np.zeros(len(empty_ids), dtype=np.int64),
+                        np.tile(EMPTY_SIGNATURE, (len(empty_ids), 1)))
+    RecipeSimilarityIndex.invalidate()
+
+
+# 트랜잭션 안에서 식재료가 변경된 레시피 id 를 모아서 커밋 후 한 번에 서명 갱신
+# (식재료, 카테고리 삭제로 레시피 식재료가 cascade 삭제되어도 커밋마다 한 번만 갱신)
+# 변경할 때마다 on_commit 을 등록하고, 커밋 후 처음 실행되는 콜백이 모인 id 를 모두 가져가서 갱신 (나머지 콜백은 할 일 없음)
+# 롤백된 트랜잭션에서 모은 id 는 다음 커밋 때 함께 갱신 (현재 식재료로 다시 계산하므로 결과는 같음)
+# DB 연결이 스레드별이므로 모으는 id 도 스레드별로 관리
+_pending = threading.local()
+
+
+def _pending_recipe_ids():
+    if not hasattr(_pending, 'recipe_ids'):
+        _pending.recipe_ids = set()
+    return _pending.recipe_ids
+
+
+# SIMILAR_RECIPE_DEFER_THRESHOLD 개 이상이면 응답을 기다리게 하지 않도록 백그라운드 작업으로 갱신 (tasks.py)
+def _update_pending():
+    pending = _pending_recipe_ids()
+    if not pending:
+        return
+    recipe_ids = set(pending)
+    pending.clear()
+    if len(recipe_ids) >= getattr(settings, 'SIMILAR_RECIPE_DEFER_THRESHOLD', 1000):
+        enqueue('update_recipe_signatures', recipe_ids=sorted(recipe_ids))
+    else:
+        update_recipe_signatures(recipe_ids)
+
+
+def invalidate_recipe_signatures(recipe_ids):
+    """
+    해당 레시피들의 서명을 커밋 후 다시 계산 (레시피 삭제 중 cascade 로 서명이 삭제되는 경우도 커밋 후에 확인)
+    """
+    _pending_recipe_ids().update(recipe_ids)
+    transaction.on_commit(_update_pending)
+
+
+# recipe_ids, sizes, signatures: 위치별 레시피 id, 식재료 수, 서명
+# positions: recipe id -> 위치
+# sorted_keys, sorted_positions: 밴드별로 정렬된 밴드 해시와 위치 (BANDS, M)
+# pending: 밴드 해시를 만든 뒤 추가/변경된 위치 (조회할 때 모두 후보로 비교)
+# loaded_at: 마지막으로 조회한 RecipeSignature.updated_at
+SimilaritySnapshot = namedtuple('SimilaritySnapshot', [
+    'recipe_ids', 'sizes', 'signatures', 'positions', 'sorted_keys', 'sorted_positions', 'pending', 'loaded_at'])
+
+
+# 비슷한 레시피 LSH 색인
+# RecipeSignature 를 메모리에 올려두고 밴드 해시가 같은 레시피만 후보로 MinHash 유사도(Jaccard 추정값) 계산
+# 서명이 변경되거나 레시피가 삭제되면 signals 에서 버전을 올리고, 다음 조회 때 변경된 서명만 읽고 삭제된 레시피는 제외
+# 변경된 서명이 많아지면 (전체의 REBUILD_RATIO, 최소 REBUILD_MIN 개 이상) 밴드 해시를 다시 생성
+# 추정 유사도 상위 limit * RERANK_FACTOR 개는 DB 에서 식재료를 조회해서 정확한 Jaccard 유사도로 다시 정렬
+class RecipeSimilarityIndex(VersionedSnapshot):
+    VERSION_KEY = 'recipe-similarity-index-version'
+    REBUILD_RATIO = 0.05
+    REBUILD_MIN = 100
+    RERANK_FACTOR = 5
+
+    def clear(self):
+        # 다음 조회 때 전체 다시 로드
+        with self._lock:
+            self._snapshot = None
+
+    def load(self, since=None):
+        queryset = RecipeSignature.objects.order_by()
+        if since is not None:
+            queryset = queryset.filter(updated_at__gte=since - SAFETY_WINDOW)
+        rows = list(queryset.values_list('recipe_id', 'size', 'signature', 'updated_at'))
+        recipe_ids = np.array([row[0] for row in rows], dtype=np.int64)
+        sizes = np.array([row[1] for row in rows], dtype=np.int64)
+        signatures = np.frombuffer(b''.join(bytes(row[2]) for row in rows), dtype='<u4').reshape(-1, NUM_PERM)
+        loaded_at = max((row[3] for row in rows), default=since)
+        return recipe_ids, sizes, signatures.astype(np.uint32), loaded_at
+
+    def build(self, recipe_ids, sizes, signatures, loaded_at):
+        keys = band_keys(signatures)
+        order = np.argsort(keys, axis=1, kind='stable')
+        return SimilaritySnapshot(
+            recipe_ids, sizes, signatures,
+            {recipe_id: pos for pos, recipe_id in enumerate(recipe_ids.tolist())},
+            np.take_along_axis(keys, order, axis=1), order,
+            np.empty(0, dtype=np.int64), loaded_at)
+
+    def refresh(self, snapshot):
+        if snapshot is None or snapshot.loaded_at is None:
+            return self.build(*self.load())
+
+        recipe_ids, sizes, signatures, loaded_at = self.load(snapshot.loaded_at)
+        # 삭제된 레시피 (서명이 cascade 삭제됨)
+        present = np.fromiter(RecipeSignature.objects.order_by().values_list('pk', flat=True).iterator(),
+                              dtype=np.int64)
+        deleted = np.setdiff1d(np.fromiter(snapshot.positions, dtype=np.int64, count=len(snapshot.positions)),
+                               present)
+        if not len(recipe_ids) and not len(deleted):
+            return snapshot
+
+        # 변경된 서명은 기존 위치에 덮어쓰고, 새 레시피는 뒤에 추가 (진행 중인 조회가 사용하는 배열은 그대로 둠)
+        positions = dict(snapshot.positions)
+        all_recipe_ids = snapshot.recipe_ids
+        all_sizes = snapshot.sizes.copy()
+        all_signatures = snapshot.signatures.copy()
+        # 삭제된 레시피는 식재료 수를 0 으로 바꿔서 후보에서 제외 (위치는 다시 생성할 때 정리)
+        all_sizes[[positions.pop(recipe_id) for recipe_id in deleted.tolist()]] = 0
+        new = [i for i, recipe_id in enumerate(recipe_ids.tolist()) if recipe_id not in positions]
+        if new:
+            for offset, i in enumerate(new):
+                positions[int(recipe_ids[i])] = len(all_recipe_ids) + offset
+            all_recipe_ids = np.concatenate([all_recipe_ids, recipe_ids[new]])
+            all_sizes = np.concatenate([all_sizes, sizes[new]])
+            all_signatures = np.concatenate([all_signatures, signatures[new]])
+        changed = np.array([positions[recipe_id] for recipe_id in recipe_ids.tolist()], dtype=np.int64)
+        all_sizes[changed] = sizes
+        all_signatures[changed] = signatures
+
+        pending = np.union1d(snapshot.pending, changed)
+        stale = len(pending) + len(all_recipe_ids) - len(positions)
+        if stale > max(len(all_recipe_ids) * self.REBUILD_RATIO, self.REBUILD_MIN):
+            # 삭제된 레시피의 위치를 빼고 다시 생성
+            keep = np.fromiter(sorted(positions.values()), dtype=np.int64, count=len(positions))
+            return self.build(all_recipe_ids[keep], all_sizes[keep], all_signatures[keep], loaded_at)
+        return snapshot._replace(recipe_ids=all_recipe_ids, sizes=all_sizes, signatures=all_signatures,
+                                 positions=positions, pending=pending, loaded_at=loaded_at)
+
+    def similar(self, recipe_id, limit=10, min_similarity=0.0, bands=None):
+        """
+        비슷한 레시피 (recipe id, 유사도) 목록, 유사도 내림차순
+        bands: 후보를 찾을 밴드 수 (적을수록 빠르지만 재현율 감소)
+        """
+        snapshot = self.snapshot()
+        pos = snapshot.positions.get(recipe_id)
+        if pos is None or not snapshot.sizes[pos]:
+            return []
+
+        signature = snapshot.signatures[pos]
+        keys = band_keys(signature[None, :])[:, 0]
+        candidates = [snapshot.pending]
+        for band in range(min(bands or BANDS, BANDS)):
+            sorted_keys = snapshot.sorted_keys[band]
+            start, end = np.searchsorted(sorted_keys, keys[band], 'left'), np.searchsorted(sorted_keys, keys[band], 'right')
+            candidates.append(snapshot.sorted_positions[band, start:end])
+        candidates = np.unique(np.concatenate(candidates))
+        candidates = candidates[(candidates != pos) & (snapshot.sizes[candidates] > 0)]
+
+        # 변경 전 밴드 해시로 찾은 후보도 현재 서명으로 다시 계산하므로 결과에는 영향 없음
+        # 추정값 오차를 고려해서 min_similarity 보다 조금 낮은 후보까지 포함
+        similarity = (snapshot.signatures[candidates] == signature).mean(axis=1)
+        keep = similarity >= min_similarity - 0.05
+        candidates, similarity = candidates[keep], similarity[keep]
+        recipe_ids = snapshot.recipe_ids[candidates]
+        order = np.lexsort((recipe_ids, -similarity))[:limit * self.RERANK_FACTOR]
+        return self.rerank(recipe_id, recipe_ids[order].tolist(), limit, min_similarity)
+
+    def rerank(self, recipe_id, candidate_ids, limit, min_similarity):
+        if not candidate_ids:
+            return []
+        ingredients = {}
+        for pk, ingredient_id in RecipeIngredient.objects.filter(
+                recipe_id__in=[recipe_id] + candidate_ids).values_list('recipe_id', 'ingredient_id'):
+            ingredients.setdefault(pk, set()).add(ingredient_id)
+
+        target = ingredients.get(recipe_id, set())
+        results = []
+        for candidate_id in candidate_ids:
+            candidate = ingredients.get(candidate_id)
+            if not candidate or not target:
+                continue
+            similarity = len(target & candidate) / len(target | candidate)
+            if similarity >= min_similarity:
+                results.append((candidate_id, similarity))
+        results.sort(key=lambda result: (-result[1], result[0]))
+        return results[:limit]
+
+
+recipe_similarity_index = RecipeSimilarityIndex()
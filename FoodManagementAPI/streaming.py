@@ -0,0 +1,108 @@
+import re
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence
+
+
+STREAMING_CHUNK_SIZE = getattr(settings, 'STREAMING_CHUNK_SIZE', 2000)
+STREAMING_GZIP = getattr(settings, 'STREAMING_GZIP', True)
+accepts_gzip = re.compile(r'\bgzip\b')
+
+
+def json_array(chunks, render):
+    """
+    리스트 chunk 들을 하나의 JSON 배열로 이어서 출력 (render: 리스트 -> JSON 배열 bytes)
+    첫 chunk 를 조회하기 전에 '[' 를 먼저 보냄
+    """
+    yield b'['
+    first = True
+    for chunk in chunks:
+        if not chunk:
+            continue
+        body = render(chunk).strip()[1:-1]
+        yield body if first else b',' + body
+        first = False
+    yield b']'
+
+
+async def async_chunks(chunks):
+    """
+    동기 iterator 를 한 chunk 씩 스레드에서 실행하는 비동기 iterator (ASGI)
+    thread_sensitive 로 뷰와 같은 스레드(같은 DB 연결)에서 실행
+    """
+    chunks = iter(chunks)
+    done = object()
+    next_chunk = sync_to_async(next)
+    try:
+        while True:
+            chunk = await next_chunk(chunks, done)
+            if chunk is done:
+                break
+            yield chunk
+    finally:
+        # 클라이언트 연결이 끊기면 DB cursor 를 닫도록 generator 종료
+        if hasattr(chunks, 'close'):
+            await sync_to_async(chunks.close)()
+
+
+# 페이지네이션을 사용하지 않는 목록 조회에 ?stream=true 를 붙이면 StreamingHttpResponse 로 응답
+# 쿼리셋을 iterator 로 STREAMING_CHUNK_SIZE 행씩 가져와 직렬화한 뒤 바로 전송하므로 전체 목록, 전체 응답 본문을 메모리에 만들지 않음
+# (MySQL 은 드라이버가 결과 행을 버퍼링하지만 모델 객체, 직렬화 결과는 chunk 단위로만 생성)
+# 응답 본문은 스트리밍하지 않을 때와 같음 (들여쓰기 요청 제외)
+# row_serializer_class 가 있으면 values_list 행으로, 없으면 serializer_class 로 chunk 별 직렬화
+# Accept-Encoding 에 gzip 이 있으면 gzip 으로 압축 (STREAMING_GZIP)
+# 응답을 보내는 중에 발생한 DB 오류는 상태 코드로 알릴 수 없으므로 응답이 잘린 채로 끝남
+# ASGI 에서는 비동기 iterator 로 응답 (동기 iterator 는 Django 가 전체 본문을 메모리에 모은 뒤 전송)
+class StreamingListMixin:
+    stream_query_param = 'stream'
+    stream_chunk_size = STREAMING_CHUNK_SIZE
+
+    def list(self, request, *args, **kwargs):
+        if not self.should_stream(request):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        # 응답 본문은 미들웨어를 지난 뒤에 생성되므로 요청에서 선택된 읽기 DB 를 고정
+        queryset = queryset.using(queryset.db)
+
+        renderer = request.accepted_renderer
+        renderer_context = self.get_renderer_context()
+        content = json_array(self.stream_chunks(queryset), lambda chunk: renderer.render(
+            chunk, request.accepted_media_type, renderer_context))
+
+        gzip = STREAMING_GZIP and accepts_gzip.search(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if gzip:
+            content = compress_sequence(content)
+        if isinstance(request._request, ASGIRequest):
+            content = async_chunks(content)
+        response = StreamingHttpResponse(content, content_type=request.accepted_media_type)
+        if gzip:
+            response['Content-Encoding'] = 'gzip'
+        patch_vary_headers(response, ('Accept-Encoding',))
+        return response
+
+    def should_stream(self, request):
+        if request.query_params.get(self.stream_query_param, '').lower() not in ('1', 'true'):
+            return False
+        # 브라우저용 API 화면, 페이지네이션 요청은 기존 응답
+        if request.accepted_renderer.format != 'json':
+            return False
+        return self.paginator is None or self.paginator.get_page_size(request) is None
+
+    def stream_chunks(self, queryset):
+        row_serializer_class = getattr(self, 'row_serializer_class', None)
+        if row_serializer_class is not None:
+            yield from row_serializer_class(queryset).iter_chunks(self.stream_chunk_size)
+            return
+
+        objects = queryset.iterator(chunk_size=self.stream_chunk_size)
+        while True:
+            chunk = list(islice(objects, self.stream_chunk_size))
+            if not chunk:
+                break
+            yield self.get_serializer(chunk, many=True).data
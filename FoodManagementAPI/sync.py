@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .models import SyncTombstone
+from .db_router import use_primary
+
+
+# 동기화 토큰은 다음 요청에서 사용할 기준 시각(마이크로초)
+# 요청 중에 커밋되는 트랜잭션을 놓치지 않도록 SAFETY_WINDOW 만큼 앞당겨서 발급 (중복 전달 가능, 클라이언트는 id 기준 덮어쓰기)
+# 삭제 기록은 TOMBSTONE_RETENTION 동안 보관, 그보다 오래된 토큰은 전체 목록을 다시 받음 (full=true)
+SAFETY_WINDOW = timedelta(seconds=5)
+TOMBSTONE_RETENTION = timedelta(days=30)
+
+
+def encode_token(moment):
+    return str(int(moment.timestamp() * 1000000))
+
+
+def decode_token(token):
+    try:
+        return datetime.fromtimestamp(int(token) / 1000000, tz=dt_timezone.utc)
+    except (TypeError, ValueError, OverflowError, OSError):
+        raise ValidationError({'since': ['Invalid sync token.']})
+
+
+def record_tombstone(instance):
+    SyncTombstone.objects.create(
+        user_id=instance.user_id, kind=instance._meta.model_name, object_id=instance.pk)
+
+
+def prune_tombstones():
+    return SyncTombstone.objects.filter(deleted_at__lt=timezone.now() - TOMBSTONE_RETENTION).delete()[0]
+
+
+# 목록 조회에 ?since=<token> 을 붙이면 변경분만 반환
+# ?since= (빈 값)은 전체 목록 + 토큰
+# 응답: {'token': 다음 토큰, 'full': 전체 목록 여부, 'changed': 추가/수정된 항목, 'deleted': 삭제된 id}
+class DeltaSyncMixin:
+    sync_query_param = 'since'
+
+    def list(self, request, *args, **kwargs):
+        if self.sync_query_param not in request.query_params:
+            return super().list(request, *args, **kwargs)
+
+        # 토큰 기준 시각 이전의 변경이 복제 지연으로 빠지지 않도록 default 에서 조회
+        with use_primary():
+            return self.sync_list(request)
+
+    def sync_list(self, request):
+        now = timezone.now()
+        token = request.query_params[self.sync_query_param]
+        since = decode_token(token) if token else None
+        full = since is None or since < now - TOMBSTONE_RETENTION
+
+        queryset = self.filter_queryset(self.get_queryset())
+        deleted = []
+        if not full:
+            queryset = queryset.filter(updated_at__gt=since)
+            deleted = list(SyncTombstone.objects.filter(
+                user=request.user, kind=queryset.model._meta.model_name, deleted_at__gt=since
+            ).values_list('object_id', flat=True).distinct())
+
+        serializer = self.get_serializer(queryset, many=True)
+        return Response({
+            'token': encode_token(now - SAFETY_WINDOW),
+            'full': full,
+            'changed': serializer.data,
+            'deleted': deleted,
+        })
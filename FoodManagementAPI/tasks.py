@@ -0,0 +1,85 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils.text import slugify
+from unidecode import unidecode
+
+from .jobs import task, report_progress
+from .models import IngredientCategory, RecipeCategory, Recipe
+from .recipe_documents import rebuild_recipe_documents, REBUILD_BATCH_SIZE
+from .similarity_index import update_recipe_signatures
+
+
+# 백그라운드 작업 (jobs.py, python manage.py run_jobs 로 실행)
+# 뷰, signals, 관리자는 jobs.enqueue('작업 이름', **kwargs) 로 추가하고 바로 응답
+
+
+# 레시피 조회용 문서 다시 생성 (recipe_ids 가 없으면 전체)
+# signals 에서 RECIPE_DOCUMENTS_DEFER_THRESHOLD 개 이상의 레시피 문서를 무효화하면 커밋 후 바로 생성하지 않고 이 작업으로 생성
+@task('rebuild_recipe_documents')
+def rebuild_documents(recipe_ids=None):
+    if recipe_ids is None:
+        recipe_ids = list(Recipe.objects.order_by('id').values_list('id', flat=True))
+    recipe_ids = sorted(set(recipe_ids))
+    count = 0
+    for start in range(0, len(recipe_ids), REBUILD_BATCH_SIZE):
+        count += len(rebuild_recipe_documents(recipe_ids[start:start + REBUILD_BATCH_SIZE]))
+        report_progress(start + REBUILD_BATCH_SIZE, len(recipe_ids), f'{count} recipe documents')
+    return {'count': count}
+
+
+# 레시피 MinHash 서명 갱신
+# signals 에서 SIMILAR_RECIPE_DEFER_THRESHOLD 개 이상의 레시피 식재료가 변경되면 커밋 후 바로 갱신하지 않고 이 작업으로 갱신
+@task('update_recipe_signatures')
+def update_signatures(recipe_ids):
+    recipe_ids = sorted(set(recipe_ids))
+    for start in range(0, len(recipe_ids), REBUILD_BATCH_SIZE):
+        update_recipe_signatures(recipe_ids[start:start + REBUILD_BATCH_SIZE])
+        report_progress(start + REBUILD_BATCH_SIZE, len(recipe_ids), 'recipe signatures')
+    return {'count': len(recipe_ids)}
+
+
+SLUG_MODELS = {'IngredientCategory': IngredientCategory, 'RecipeCategory': RecipeCategory}
+
+
+# 카테고리 slug 일괄 재생성 (save() 를 거치지 않은 bulk 등록, unidecode 변경 이후 등)
+# 변경된 행만 bulk_update
+@task('regenerate_slugs', concurrency=1)
+def regenerate_slugs(models=None, batch_size=1000):
+    models = [SLUG_MODELS[name] for name in (models or SLUG_MODELS)]
+    total = sum(model.objects.count() for model in models)
+    done, updated = 0, 0
+    for model in models:
+        last_id = 0
+        while True:
+            rows = list(model.objects.filter(id__gt=last_id).order_by('id').values_list(
+                'id', 'title', 'slug')[:batch_size])
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            changed = [model(id=pk, slug=slug) for pk, slug, old in (
+                (pk, slugify(unidecode(title), allow_unicode=True), old) for pk, title, old in rows) if slug != old]
+            model.objects.bulk_update(changed, ['slug'])
+            done += len(rows)
+            updated += len(changed)
+            report_progress(done, total, f'{model.__name__}: {updated} updated')
+    return {'count': done, 'updated': updated}
+
+
+def command_task(name, concurrency=1, **options):
+    """
+    관리 명령을 작업으로 등록, kwargs 의 args 는 명령줄 인자 목록 (예: ['--days', '3'])
+    출력은 result['output'] 에 저장 (마지막 10000자)
+    """
+    @task(name, concurrency=concurrency, **options)
+    def run_command(args=()):
+        stdout = StringIO()
+        call_command(name, *args, stdout=stdout)
+        return {'output': stdout.getvalue()[-10000:]}
+    return run_command
+
+
+# 같은 명령은 한 번에 하나만 실행
+for command in ['import_catalog', 'build_similarity_index', 'rebuild_search_index', 'sweep_expiring_ingredients',
+                'compute_pantry_analytics', 'prune_sync_tombstones']:
+    command_task(command)
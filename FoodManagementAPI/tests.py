@@ -1,3 +1,1639 @@
-from django.test import TestCase
+import gzip
+import json
+import os
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.contrib.auth import SESSION_KEY
+from django.contrib.auth.models import AnonymousUser, User
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import transaction
+from django.db.models import Q
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .models import IngredientCategory, Ingredient, UserIngredient, RecipeCategory, Recipe, RecipeIngredient, Cart, ExpiryDigest, RecipeDocument, Job, SyncTombstone, TitleNgram, RecipeSignature
+from .analytics import ANALYTICS_CACHE_KEY
+from .metrics import route_stats
+from .middleware import PerformanceMiddleware
+from .search import index_kind, title_grams
+from .renderers import FastJSONRenderer
+from .db_router import ReplicaRouter, ReplicaRoutingMiddleware, read_database
+from .pagination import EstimatedCountPaginator
+from .jobs import Task, Worker, enqueue, report_progress, tasks
+from .throttling import local_bucket_store, throttle_stats
+from .serializers import RecipeSerializer
+from .similarity_index import RecipeSimilarityIndex, recipe_similarity_index, update_recipe_signatures
+from .recipe_documents import rebuild_recipe_documents, recipe_queryset
+from .views import IngredientView, RecipeIngredientView, UserIngredientView
+
+
+# throttle 버킷은 프로세스 메모리에 남고 테스트마다 같은 사용자 id 가 다시 사용되므로
+# ThrottleTest 외의 테스트에서는 예산을 넉넉하게 설정
+unlimited_throttle = override_settings(THROTTLE_USER_BUDGET=(10 ** 6, 10 ** 6), THROTTLE_ROUTE_BUDGETS={})
+
+
+def setUpModule():
+    unlimited_throttle.enable()
+
+
+def tearDownModule():
+    unlimited_throttle.disable()
+
+
+# 엔드포인트별 쿼리 수 회귀 테스트
+# 조회 결과 수와 관계없이 쿼리 수가 고정되어야 함 (N+1 방지)
+class QueryCountTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('user', password='password')
+        cls.staff = User.objects.create_user(
+            'staff', password='password', is_staff=True)
+
+        cls.ingredient_categories = [IngredientCategory.objects.create(
+            title=f'식재료 카테고리{i}') for i in range(3)]
+        cls.ingredients = [Ingredient.objects.create(
+            title=f'식재료{i}', category=cls.ingredient_categories[i % 3]) for i in range(30)]
+
+        cls.recipe_categories = [RecipeCategory.objects.create(
+            title=f'레시피 카테고리{i}') for i in range(3)]
+        cls.recipes = [Recipe.objects.create(
+            title=f'레시피{i}', code=i, category=cls.recipe_categories[i % 3]) for i in range(25)]
+        for recipe in cls.recipes:
+            for ingredient in cls.ingredients[recipe.code:recipe.code + 5]:
+                RecipeIngredient.objects.create(
+                    recipe=recipe, ingredient=ingredient)
+        # 테스트 트랜잭션은 커밋되지 않으므로 레시피 조회용 문서 직접 생성
+        rebuild_recipe_documents([recipe.pk for recipe in cls.recipes])
+
+        for ingredient in cls.ingredients[:20]:
+            UserIngredient.objects.create(
+                user=cls.user, ingredient=ingredient, quantity=1)
+            Cart.objects.create(user=cls.user, ingredient=ingredient)
+
+    def setUp(self):
+        # 카탈로그 응답 캐시를 비우고 실제 쿼리 수 확인
+        cache.clear()
+        self.client.force_authenticate(self.user)
+
+    def assertQueries(self, num, url):
+        with self.assertNumQueries(num):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_ingredient_category(self):
+        self.assertQueries(1, '/api/ingredient-category')
+
+    def test_ingredient(self):
+        self.assertQueries(1, '/api/ingredient')
+
+    def test_user_ingredient(self):
+        response = self.assertQueries(1, '/api/user-ingredient')
+        self.assertEqual(len(response.data), 20)
+
+    def test_user_cart(self):
+        response = self.assertQueries(1, '/api/user-cart')
+        self.assertEqual(len(response.data), 20)
+
+    def test_recipe_category(self):
+        self.assertQueries(1, '/api/recipe-category')
+
+    def test_recipe(self):
+        # count, 레시피 + 레시피 문서
+        self.assertQueries(2, '/api/recipe')
+        response = self.assertQueries(2, '/api/recipe?page_size=20')
+        self.assertEqual(len(response.data['results']), 20)
+        self.assertEqual(
+            len(response.data['results'][0]['recipe_ingredients']), 5)
+
+    def test_recipe_cursor(self):
+        # 커서 방식은 count 없이 레시피 + 레시피 문서
+        response = self.assertQueries(1, '/api/recipe?cursor=')
+        self.assertNotIn('count', response.data)
+        response = self.assertQueries(2, '/api/recipe?cursor=&count=true')
+        self.assertEqual(response.data['count'], 25)
+
+        # 모든 페이지를 따라가면 페이지 번호 방식과 같은 순서
+        ids, url = [], '/api/recipe?cursor=&ordering=-title&page_size=7'
+        while url:
+            response = self.assertQueries(1, url)
+            ids += [recipe['id'] for recipe in response.data['results']]
+            url = response.data['next']
+        self.assertEqual(ids, list(Recipe.objects.order_by(
+            '-title', 'id').values_list('id', flat=True)))
+
+        # 이전 페이지
+        response = self.client.get(response.data['previous'])
+        self.assertEqual([recipe['id'] for recipe in response.data['results']], ids[14:21])
+
+    def test_ingredient_recipe_cursor(self):
+        first = self.assertQueries(1, '/api/ingredient-recipe?cursor=')
+        second = self.assertQueries(1, first.data['next'])
+        expected = list(RecipeIngredient.objects.order_by(
+            'recipe__title', 'ingredient__title', 'id').values_list('id', flat=True)[:20])
+        self.assertEqual([item['id'] for item in first.data['results'] + second.data['results']], expected)
+
+    def test_recipe_search(self):
+        self.assertQueries(2, '/api/recipe?search=레시피 카테고리1')
+
+    def test_single_recipe(self):
+        response = self.assertQueries(
+            1, f'/api/recipe/{self.recipes[0].pk}')
+        self.assertEqual(len(response.data['recipe_ingredients']), 5)
+
+    def test_recipe_ingredient(self):
+        response = self.assertQueries(1, '/api/recipe-ingredient')
+        self.assertEqual(len(response.data), 125)
+
+    def test_single_recipe_ingredient(self):
+        pk = RecipeIngredient.objects.first().pk
+        self.assertQueries(1, f'/api/recipe-ingredient/{pk}')
+
+    def test_ingredient_recipe(self):
+        # count, 레시피 식재료
+        self.assertQueries(2, '/api/ingredient-recipe?search=식재료1')
+        self.assertQueries(2, '/api/ingredient-recipe?page_size=20')
+
+    def test_cookable_recipe(self):
+        # 색인 생성 후: 사용자 식재료, 레시피, 부족한 식재료
+        self.client.get('/api/cookable-recipe')
+        response = self.assertQueries(3, '/api/cookable-recipe?page_size=20')
+        self.assertEqual(response.data['count'], 20)
+        self.assertEqual(response.data['results'][0]['coverage'], 1.0)
+
+    def test_single_user_ingredient(self):
+        pk = UserIngredient.objects.filter(user=self.user).first().pk
+        self.assertQueries(1, f'/api/user-ingredient/{pk}')
+
+    def test_single_user_cart(self):
+        pk = Cart.objects.filter(user=self.user).first().pk
+        self.assertQueries(1, f'/api/user-cart/{pk}')
+
+    # staff 권한 필요
+    def test_single_ingredient_category(self):
+        self.client.force_authenticate(self.staff)
+        self.assertQueries(
+            1, f'/api/ingredient-category/{self.ingredient_categories[0].pk}')
+
+    def test_single_ingredient(self):
+        self.client.force_authenticate(self.staff)
+        self.assertQueries(1, f'/api/ingredient/{self.ingredients[0].pk}')
+
+    def test_single_recipe_category(self):
+        self.client.force_authenticate(self.staff)
+        self.assertQueries(
+            1, f'/api/recipe-category/{self.recipe_categories[0].pk}')
+
+    def test_user_ingredient_batch(self):
+        # 식재료 확인, 기존 행 조회, 추가, 수정, 결과 조회 (+ savepoint)
+        items = [{'ingredient_id': ingredient.pk, 'quantity': 2}
+                 for ingredient in self.ingredients[15:25]]
+        with self.assertNumQueries(7):
+            response = self.client.post(
+                '/api/user-ingredient/batch', items, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([result['status'] for result in response.data['results']],
+                         ['updated'] * 5 + ['created'] * 5)
+        self.assertEqual(UserIngredient.objects.filter(
+            user=self.user, quantity=2).count(), 10)
+
+    def test_user_cart_batch(self):
+        pks = list(Cart.objects.filter(
+            user=self.user).values_list('pk', flat=True))
+        with self.assertNumQueries(5):
+            response = self.client.put(
+                '/api/user-cart/batch', [{'id': pk, 'buy': True} for pk in pks], format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Cart.objects.filter(
+            user=self.user, buy=True).count(), 20)
+
+
+# 레시피의 부족한 식재료를 장바구니에 추가
+class RecipeCartTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('user', password='password')
+        cls.other = User.objects.create_user('other', password='password')
+        category = IngredientCategory.objects.create(title='채소')
+        cls.ingredients = [Ingredient.objects.create(title=f'식재료{i}', category=category) for i in range(6)]
+        recipe_category = RecipeCategory.objects.create(title='한식')
+        cls.recipes = [Recipe.objects.create(title=f'레시피{i}', code=i, category=recipe_category) for i in range(2)]
+        for recipe, ingredients in zip(cls.recipes, [cls.ingredients[0:4], cls.ingredients[3:5]]):
+            for ingredient in ingredients:
+                RecipeIngredient.objects.create(recipe=recipe, ingredient=ingredient)
+        UserIngredient.objects.create(user=cls.user, ingredient=cls.ingredients[0], quantity=1)
+        Cart.objects.create(user=cls.user, ingredient=cls.ingredients[1], buy=True)
+        # 다른 사용자의 식재료, 장바구니는 영향 없음
+        UserIngredient.objects.create(user=cls.other, ingredient=cls.ingredients[2], quantity=1)
+        Cart.objects.create(user=cls.other, ingredient=cls.ingredients[3])
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def post(self, recipe_ids):
+        return self.client.post('/api/user-cart/recipe', {'recipe_ids': recipe_ids}, format='json')
+
+    def cart(self):
+        return sorted(Cart.objects.filter(user=self.user).values_list('ingredient_id', 'buy'))
+
+    def test_add_missing(self):
+        # 레시피 확인, 부족한 식재료 계산, 추가, 장바구니 조회
+        with self.assertNumQueries(4):
+            response = self.post([recipe.pk for recipe in self.recipes])
+        self.assertEqual(response.status_code, 200)
+        # 식재료 0~4 중 사용자 식재료(0), 장바구니(1) 제외, 두 레시피의 식재료 3 은 한 번만
+        added = [ingredient.pk for ingredient in self.ingredients[2:5]]
+        self.assertEqual(response.data['missing'], added)
+        self.assertEqual([item['ingredient']['id'] for item in response.data['cart']],
+                         [ingredient.pk for ingredient in self.ingredients[1:5]])
+        expected = [(self.ingredients[1].pk, True)] + [(pk, False) for pk in added]
+        self.assertEqual(self.cart(), expected)
+
+        # 다시 요청하면 추가하지 않음
+        response = self.post([recipe.pk for recipe in self.recipes])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['missing'], [])
+        self.assertEqual(self.cart(), expected)
+        self.assertEqual(Cart.objects.filter(user=self.other).count(), 1)
+
+    def test_invalid(self):
+        before = self.cart()
+        response = self.post([self.recipes[0].pk, 10 ** 6])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['recipe_ids'], [f'Invalid pk "{10 ** 6}" - object does not exist.'])
+        for recipe_ids in ([], ['1'], [True], list(range(1, 52)), None):
+            self.assertEqual(self.post(recipe_ids).status_code, 400, recipe_ids)
+        self.assertEqual(self.cart(), before)
+
+
+# 사용자 식재료로 만들 수 있는 레시피 순위 (recipe_index.py)
+class CookableRecipeTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('user', password='password')
+        category = IngredientCategory.objects.create(title='채소')
+        cls.ingredients = [Ingredient.objects.create(title=f'식재료{i}', category=category) for i in range(6)]
+        recipe_category = RecipeCategory.objects.create(title='한식')
+        cls.recipes = [Recipe.objects.create(title=f'레시피{i}', code=i, category=recipe_category) for i in range(6)]
+        a, b, c, d, e, f = cls.ingredients
+        for recipe, ingredients in zip(cls.recipes, [[a, b], [a, b, c, d], [a, d], [a, b, c, d, e, f], [c], [d, e]]):
+            for ingredient in ingredients:
+                RecipeIngredient.objects.create(recipe=recipe, ingredient=ingredient)
+        for ingredient in (a, b, c):
+            UserIngredient.objects.create(user=cls.user, ingredient=ingredient, quantity=1)
+
+    def setUp(self):
+        # 이전 테스트(롤백된 변경)로 만든 색인을 사용하지 않도록 색인 버전 삭제
+        cache.clear()
+        self.client.force_authenticate(self.user)
+
+    def ranking(self):
+        response = self.client.get('/api/cookable-recipe', {'page_size': 20})
+        self.assertEqual(response.status_code, 200)
+        return [(result['recipe']['id'], result['matched_count'], result['total_count'],
+                 [ingredient['id'] for ingredient in result['missing_ingredients']])
+                for result in response.data['results']]
+
+    def test_ranking(self):
+        # 보유 비율 내림차순, 부족한 식재료 수 오름차순, recipe id 오름차순 (보유 식재료가 없는 레시피 제외)
+        r0, r1, r2, r3, r4, _ = (recipe.pk for recipe in self.recipes)
+        _, _, _, d, e, f = (ingredient.pk for ingredient in self.ingredients)
+        self.assertEqual(self.ranking(), [
+            (r0, 2, 2, []), (r4, 1, 1, []), (r1, 3, 4, [d]), (r2, 1, 2, [d]), (r3, 3, 6, [d, e, f])])
+
+    def test_invalidate(self):
+        self.ranking()
+        a, _, _, d, _, _ = self.ingredients
+        # 레시피 식재료 추가, 삭제 후 다음 조회에서 색인 다시 생성
+        RecipeIngredient.objects.create(recipe=self.recipes[5], ingredient=a)
+        RecipeIngredient.objects.get(recipe=self.recipes[1], ingredient=d).delete()
+        ranking = self.ranking()
+        self.assertEqual([row[0] for row in ranking],
+                         [self.recipes[i].pk for i in (0, 1, 4, 2, 3, 5)])
+        self.assertEqual(ranking[1][1:3], (3, 3))
+        self.assertEqual(ranking[-1][1:3], (1, 3))
+
+        # 레시피 삭제로 인한 cascade 삭제
+        self.recipes[0].delete()
+        self.assertNotIn(self.recipes[0].pk, [row[0] for row in self.ranking()])
+
+
+# 카탈로그 일괄 등록 (import_catalog 명령)
+class ImportCatalogTest(TestCase):
+    HEADER = 'recipe_code,recipe_title,recipe_category,ingredient_title,ingredient_category\n'
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def run_import(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        stdout, stderr = StringIO(), StringIO()
+        call_command('import_catalog', path, '--batch-size', '2', stdout=stdout, stderr=stderr)
+        stats = dict(item.split('=') for item in stdout.getvalue().strip().split(', '))
+        return stats, stderr.getvalue()
+
+    def catalog(self):
+        return {
+            'ingredients': sorted(Ingredient.objects.values_list('title', 'category__title')),
+            'recipes': sorted(Recipe.objects.values_list('code', 'title', 'category__title')),
+            'recipe_ingredients': sorted(RecipeIngredient.objects.values_list('recipe__code', 'ingredient__title')),
+        }
+
+    def test_csv_upsert(self):
+        content = self.HEADER + (
+            '1,김치찌개,한식,김치,채소\n'
+            '1,김치찌개,한식,돼지고기,육류\n'
+            '2,Pasta,양식,양파,채소\n'
+            ',,,마늘,채소\n')
+        stats, errors = self.run_import('catalog.csv', content)
+        self.assertEqual(errors, '')
+        self.assertEqual((stats['categories'], stats['ingredients_created'], stats['recipes_created'],
+                          stats['recipe_ingredients_created']), ('4', '4', '2', '3'))
+        expected = {
+            'ingredients': [('김치', '채소'), ('돼지고기', '육류'), ('마늘', '채소'), ('양파', '채소')],
+            'recipes': [(1, '김치찌개', '한식'), (2, 'Pasta', '양식')],
+            'recipe_ingredients': [(1, '김치'), (1, '돼지고기'), (2, '양파')],
+        }
+        self.assertEqual(self.catalog(), expected)
+        self.assertEqual(RecipeCategory.objects.get(title='양식').slug, 'yangsig')
+
+        # 같은 파일을 다시 등록하면 변경 없음
+        stats, errors = self.run_import('catalog.csv', content)
+        self.assertEqual(errors, '')
+        self.assertEqual({key: value for key, value in stats.items() if key not in ('rows', 'elapsed', 'rows/s')},
+                         dict.fromkeys(['categories', 'ingredients_created', 'ingredients_updated',
+                                        'recipes_created', 'recipes_updated', 'recipe_ingredients_created',
+                                        'errors'], '0'))
+        self.assertEqual(self.catalog(), expected)
+
+    def test_jsonl_update(self):
+        self.run_import('catalog.csv', self.HEADER + '1,김치찌개,한식,김치,채소\n')
+        rows = [{'recipe_code': 1, 'recipe_title': '김치찌개2', 'recipe_category': '찌개',
+                 'ingredient_title': '김치', 'ingredient_category': '발효'}]
+        stats, errors = self.run_import('catalog.jsonl', ''.join(json.dumps(row) + '\n' for row in rows))
+        self.assertEqual(errors, '')
+        self.assertEqual((stats['ingredients_updated'], stats['recipes_updated'], stats['recipe_ingredients_created']),
+                         ('1', '1', '0'))
+        self.assertEqual(self.catalog(), {
+            'ingredients': [('김치', '발효')], 'recipes': [(1, '김치찌개2', '찌개')], 'recipe_ingredients': [(1, '김치')]})
+
+    def test_bad_lines(self):
+        # 잘못된 줄은 건너뛰고 나머지 줄은 같은 batch 에서도 등록
+        lines = [
+            json.dumps({'recipe_code': 1, 'recipe_title': '김치찌개', 'recipe_category': '한식',
+                        'ingredient_title': '김치', 'ingredient_category': '채소'}),
+            '{not json',
+            json.dumps({'recipe_code': 'x', 'recipe_title': '비빔밥', 'recipe_category': '한식'}),
+            json.dumps({'recipe_code': 3, 'recipe_category': '한식'}),
+            json.dumps({'recipe_code': 4, 'recipe_title': '잡채', 'recipe_category': '한식',
+                        'ingredient_title': '당면'}),
+            json.dumps(['not', 'an', 'object']),
+            json.dumps({'recipe_code': 5, 'recipe_title': '김밥', 'recipe_category': '한식',
+                        'ingredient_title': '김치'}),
+        ]
+        stats, errors = self.run_import('catalog.jsonl', '\n'.join(lines) + '\n')
+        self.assertEqual(stats['errors'], '5')
+        self.assertCountEqual(errors.splitlines(), [
+            'line 2: invalid JSON',
+            "line 3: invalid recipe_code 'x'",
+            'line 4: recipe_title and recipe_category are required',
+            'line 6: expected a JSON object',
+            'line 5: ingredient_category is required for new ingredient',
+        ])
+        self.assertEqual(self.catalog(), {
+            'ingredients': [('김치', '채소')],
+            'recipes': [(1, '김치찌개', '한식'), (5, '김밥', '한식')],
+            'recipe_ingredients': [(1, '김치'), (5, '김치')],
+        })
+
+
+# 사용자 식재료/장바구니 일괄 추가, 수정, 삭제 (응답 본문, 저장 결과)
+class BatchWriteTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('user', password='password')
+        cls.other = User.objects.create_user('other', password='password')
+        category = IngredientCategory.objects.create(title='채소')
+        cls.ingredients = [Ingredient.objects.create(title=f'식재료{i}', category=category) for i in range(4)]
+        cls.mine = UserIngredient.objects.create(user=cls.user, ingredient=cls.ingredients[0], quantity=1)
+        cls.others = UserIngredient.objects.create(user=cls.other, ingredient=cls.ingredients[0], quantity=1)
+        cls.cart = Cart.objects.create(user=cls.user, ingredient=cls.ingredients[0])
+        cls.other_cart = Cart.objects.create(user=cls.other, ingredient=cls.ingredients[1])
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+        # updated_at 갱신 확인용
+        self.old = timezone.now() - timedelta(days=1)
+        UserIngredient.objects.update(updated_at=self.old)
+        Cart.objects.update(updated_at=self.old)
+
+    def test_post_upsert(self):
+        items = [
+            {'ingredient_id': self.ingredients[1].pk, 'quantity': 2, 'memo': '새로'},
+            {'ingredient_id': self.ingredients[0].pk, 'quantity': 3},
+            {'ingredient_id': self.ingredients[2].pk, 'quantity': 'many'},
+            {'ingredient_id': 10 ** 6, 'quantity': 1},
+        ]
+        response = self.client.post('/api/user-ingredient/batch', items, format='json')
+        self.assertEqual(response.status_code, 207)
+        results = response.data['results']
+        self.assertEqual([result['status'] for result in results], ['created', 'updated', 'invalid', 'invalid'])
+        self.assertIn('quantity', results[2]['errors'])
+        self.assertEqual(results[3]['errors']['ingredient_id'], [f'Invalid pk "{10 ** 6}" - object does not exist.'])
+        self.assertEqual(results[1]['id'], self.mine.pk)
+        self.assertEqual((results[0]['data']['ingredient']['id'], results[0]['data']['memo']),
+                         (self.ingredients[1].pk, '새로'))
+
+        self.assertEqual(sorted(UserIngredient.objects.filter(user=self.user).values_list(
+            'ingredient_id', 'quantity')), [(self.ingredients[0].pk, Decimal('3.0')), (self.ingredients[1].pk, Decimal('2.0'))])
+        self.mine.refresh_from_db()
+        self.assertGreater(self.mine.updated_at, self.old)
+        # 다른 사용자의 같은 식재료는 그대로
+        self.others.refresh_from_db()
+        self.assertEqual((self.others.quantity, self.others.updated_at), (1, self.old))
+
+        # 모든 항목이 성공하면 200
+        response = self.client.post('/api/user-cart/batch', [{'ingredient_id': self.ingredients[3].pk}], format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'][0]['status'], 'created')
+
+    def test_put(self):
+        items = [
+            {'id': self.cart.pk, 'buy': True},
+            {'id': self.other_cart.pk, 'buy': True},
+            {'buy': True},
+            {'id': self.cart.pk, 'ingredient_id': self.ingredients[2].pk},
+            {'id': 10 ** 6, 'buy': True},
+        ]
+        response = self.client.put('/api/user-cart/batch', items, format='json')
+        self.assertEqual(response.status_code, 207)
+        results = response.data['results']
+        self.assertEqual([result['status'] for result in results],
+                         ['updated', 'not_found', 'invalid', 'invalid', 'not_found'])
+        self.assertEqual(results[0]['data']['buy'], True)
+        self.assertEqual(results[2]['errors'], {'id': ['This field is required.']})
+        self.assertNotIn('data', results[1])
+
+        self.cart.refresh_from_db()
+        self.assertEqual((self.cart.buy, self.cart.ingredient_id), (True, self.ingredients[0].pk))
+        self.assertGreater(self.cart.updated_at, self.old)
+        # 다른 사용자의 장바구니는 수정하지 않음
+        self.other_cart.refresh_from_db()
+        self.assertEqual((self.other_cart.buy, self.other_cart.updated_at), (False, self.old))
+
+    def test_delete(self):
+        items = [self.mine.pk, self.others.pk, 'x', True, 10 ** 6]
+        response = self.client.delete('/api/user-ingredient/batch', items, format='json')
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([(result['status'], result.get('id')) for result in response.data['results']], [
+            ('deleted', self.mine.pk), ('not_found', self.others.pk), ('invalid', None), ('invalid', None),
+            ('not_found', 10 ** 6)])
+        self.assertFalse(UserIngredient.objects.filter(pk=self.mine.pk).exists())
+        self.assertTrue(UserIngredient.objects.filter(pk=self.others.pk).exists())
+
+        response = self.client.delete('/api/user-cart/batch', [self.cart.pk], format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'], [{'index': 0, 'status': 'deleted', 'id': self.cart.pk}])
+        self.assertEqual(list(Cart.objects.values_list('pk', flat=True)), [self.other_cart.pk])
+
+    def test_invalid_body(self):
+        for method in ('post', 'put', 'delete'):
+            response = getattr(self.client, method)('/api/user-cart/batch', {'id': self.cart.pk}, format='json')
+            self.assertEqual(response.status_code, 400)
+        response = self.client.delete('/api/user-cart/batch', [self.cart.pk] * 501, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(Cart.objects.filter(pk=self.cart.pk).exists())
+
+
+# n-gram 색인 검색은 기존 부분 문자열 검색과 같은 결과를 관련도 순으로 반환
+class NgramSearchTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('user', password='password')
+        category = IngredientCategory.objects.create(title='채소')
+        for title in ['양파', '적양파', '양배추', '파', '대파', '쪽파', '파프리카', '배추']:
+            Ingredient.objects.create(title=title, category=category)
+        Ingredient.objects.create(
+            title='돼지고기', category=IngredientCategory.objects.create(title='육류'))
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+
+    def search(self, term):
+        response = self.client.get('/api/ingredient', {'search': term})
+        return [ingredient['title'] for ingredient in response.data]
+
+    def test_substring(self):
+        for term in ['파', '양파', '배추', '프리카', '고기', '채', '없음']:
+            expected = set(Ingredient.objects.filter(
+                Q(title__icontains=term) | Q(category__title__icontains=term)).values_list('title', flat=True))
+            self.assertEqual(set(self.search(term)), expected, term)
+
+    def test_rank(self):
+        self.assertEqual(self.search('파')[:2], ['파', '파프리카'])
+        self.assertEqual(self.search('양파'), ['양파', '적양파'])
+
+    def test_ordering_param(self):
+        response = self.client.get(
+            '/api/ingredient', {'search': '파', 'ordering': 'title'})
+        self.assertEqual([ingredient['title'] for ingredient in response.data],
+                         sorted(['양파', '적양파', '파', '대파', '쪽파', '파프리카']))
+
+    def test_prefixed_fields(self):
+        # 접두사가 붙은 필드, title 이 아닌 필드는 기존 SearchFilter 와 같이 검색
+        with mock.patch.object(IngredientView, 'search_fields', ['^title', '=category__title']):
+            self.assertEqual(set(self.search('파')), {'파', '파프리카'})
+            self.assertEqual(set(self.search('육류')), {'돼지고기'})
+            self.assertEqual(self.search('육'), [])
+
+    def test_rename(self):
+        ingredient = Ingredient.objects.get(title='쪽파')
+        ingredient.title = '실파'
+        ingredient.save()
+        self.assertIn('실파', self.search('실'))
+        self.assertNotIn('실파', self.search('쪽'))
+
+    def expected_index(self):
+        return {(index_kind(model), pk, gram)
+                for model in (IngredientCategory, Ingredient, RecipeCategory, Recipe)
+                for pk, title in model.objects.values_list('id', 'title') for gram in title_grams(title)}
+
+    def test_rebuild_command(self):
+        # signals 를 거치지 않은 변경, 삭제된 객체의 n-gram, 빠진 n-gram
+        Ingredient.objects.filter(title='쪽파').update(title='실파')
+        TitleNgram.objects.create(kind='ingredient', object_id=10 ** 6, gram='유령')
+        TitleNgram.objects.filter(kind='ingredientcategory').delete()
+        self.assertNotEqual(set(TitleNgram.objects.values_list('kind', 'object_id', 'gram')), self.expected_index())
+
+        for _ in range(2):
+            call_command('rebuild_search_index', '--batch-size', '3', stdout=StringIO())
+            self.assertEqual(set(TitleNgram.objects.values_list('kind', 'object_id', 'gram')), self.expected_index())
+            self.assertEqual(TitleNgram.objects.count(), len(self.expected_index()))
+        self.assertEqual(self.search('실'), ['실파'])
+        self.assertIn('돼지고기', self.search('육'))
+
+
+# 카탈로그 조회 응답 캐시, ETag/304
+class CatalogCacheTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('user', password='password')
+        cls.category = IngredientCategory.objects.create(title='채소')
+        Ingredient.objects.create(title='양파', category=cls.category)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_etag(self):
+        response = self.client.get('/api/ingredient')
+        etag = response['ETag']
+        self.assertIn('Last-Modified', response)
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/ingredient', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/ingredient')
+        self.assertEqual(len(response.data), 1)
+
+        # 쿼리 파라미터가 다르면 다른 ETag
+        response = self.client.get('/api/ingredient', {'search': '파'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_invalidate(self):
+        etag = self.client.get('/api/ingredient')['ETag']
+        Ingredient.objects.create(title='대파', category=self.category)
+
+        response = self.client.get('/api/ingredient', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(len(response.data), 2)
+
+
+# 사용자 식재료/장바구니 변경분 동기화
+class DeltaSyncTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('user', password='password')
+        category = IngredientCategory.objects.create(title='채소')
+        cls.ingredients = [Ingredient.objects.create(
+            title=f'식재료{i}', category=category) for i in range(5)]
+        for ingredient in cls.ingredients[:3]:
+            UserIngredient.objects.create(
+                user=cls.user, ingredient=ingredient, quantity=1)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def sync(self, token):
+        response = self.client.get('/api/user-ingredient', {'since': token})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_sync(self):
+        data = self.sync('')
+        self.assertTrue(data['full'])
+        self.assertEqual(len(data['changed']), 3)
+
+        # 변경 없음: 토큰 발급 직전 변경분만 다시 전달될 수 있음
+        token = str(int(data['token']) + 10 * 1000000)
+        with self.assertNumQueries(2):
+            data = self.sync(token)
+        self.assertEqual((data['full'], data['changed'], data['deleted']), (False, [], []))
+
+        token = data['token']
+        deleted = UserIngredient.objects.filter(user=self.user).first()
+        deleted_pk = deleted.pk
+        deleted.delete()
+        self.client.post('/api/user-ingredient/batch',
+                         [{'ingredient_id': self.ingredients[4].pk, 'quantity': 2}], format='json')
+
+        data = self.sync(token)
+        self.assertIn(deleted_pk, data['deleted'])
+        self.assertIn(self.ingredients[4].pk,
+                      [item['ingredient']['id'] for item in data['changed']])
+
+    def test_invalid_token(self):
+        response = self.client.get('/api/user-cart', {'since': 'abc'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_prune_command(self):
+        for user_ingredient in UserIngredient.objects.filter(user=self.user):
+            user_ingredient.delete()
+        old, recent, _ = SyncTombstone.objects.order_by('id')
+        SyncTombstone.objects.filter(pk=old.pk).update(deleted_at=timezone.now() - timedelta(days=31))
+        SyncTombstone.objects.filter(pk=recent.pk).update(deleted_at=timezone.now() - timedelta(days=29))
+
+        # 보관 기간(30일)이 지난 기록만 삭제, 다시 실행해도 같은 결과
+        for deleted in (1, 0):
+            stdout = StringIO()
+            call_command('prune_sync_tombstones', stdout=stdout)
+            self.assertIn(f'{deleted} tombstones deleted', stdout.getvalue())
+            self.assertEqual(SyncTombstone.objects.count(), 2)
+        self.assertFalse(SyncTombstone.objects.filter(pk=old.pk).exists())
+
+
+# 유통기한 임박 식재료 조회, 만료 알림 집계
+class ExpiringTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        category = IngredientCategory.objects.create(title='채소')
+        ingredients = [Ingredient.objects.create(
+            title=f'식재료{i}', category=category) for i in range(6)]
+        today = timezone.localdate()
+        cls.users = [User.objects.create_user(
+            f'user{i}', password='password') for i in range(3)]
+        # 사용자별 -1 ~ 4 일 남은 식재료
+        for user in cls.users:
+            for i, ingredient in enumerate(ingredients):
+                UserIngredient.objects.create(
+                    user=user, ingredient=ingredient, quantity=1, end=today + timedelta(days=i - 1))
+
+    def test_expiring(self):
+        self.client.force_authenticate(self.users[0])
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/user-ingredient/expiring', {'days': 2})
+        self.assertEqual([item['ingredient']['title'] for item in response.data],
+                         ['식재료1', '식재료2', '식재료3'])
+        response = self.client.get('/api/user-ingredient/expiring', {'days': -1})
+        self.assertEqual(response.status_code, 400)
+
+    def test_sweep(self):
+        # chunk 경계에 걸친 사용자도 알림 1건
+        call_command('sweep_expiring_ingredients', days=2,
+                     chunk_size=2, stdout=StringIO())
+        call_command('sweep_expiring_ingredients', days=2,
+                     chunk_size=2, stdout=StringIO())
+        self.assertEqual(ExpiryDigest.objects.count(), 3)
+        for digest in ExpiryDigest.objects.all():
+            self.assertEqual([item['title'] for item in digest.items],
+                             ['식재료1', '식재료2', '식재료3'])
+
+
+# 비동기 조회 뷰는 기존 뷰와 같은 응답
+class AsyncReadViewTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('user', password='password')
+        category = IngredientCategory.objects.create(title='채소')
+        cls.ingredients = [Ingredient.objects.create(
+            title=f'식재료{i}', category=category) for i in range(5)]
+        recipe_category = RecipeCategory.objects.create(title='한식')
+        cls.recipe = Recipe.objects.create(
+            title='레시피', code=1, category=recipe_category)
+        for ingredient in cls.ingredients:
+            RecipeIngredient.objects.create(
+                recipe=cls.recipe, ingredient=ingredient)
+            UserIngredient.objects.create(
+                user=cls.user, ingredient=ingredient, quantity=1)
+        cls.headers = {
+            'Authorization': f'Bearer {AccessToken.for_user(cls.user)}'}
+
+    async def test_same_response(self):
+        for url in ['ingredient?search=식재료&ordering=-id', 'user-ingredient', 'recipe?page_size=1',
+                    f'recipe/{self.recipe.pk}', 'ingredient-recipe?cursor=', 'recipe-ingredient']:
+            expected = await sync_to_async(self.client.get)(f'/api/{url}', headers=self.headers)
+            response = await self.async_client.get(f'/api/async/{url}', headers=self.headers)
+            self.assertEqual(response.status_code, 200, url)
+            self.assertEqual(response.json(), expected.json(), url)
+
+    async def test_auth(self):
+        response = await self.async_client.get('/api/async/user-ingredient')
+        self.assertEqual(response.status_code, 401)
+        response = await self.async_client.get('/api/async/recipe/0', headers=self.headers)
+        self.assertEqual(response.status_code, 404)
+        # 식재료 상세 조회는 staff 권한 필요
+        response = await self.async_client.get(
+            f'/api/async/ingredient/{self.ingredients[0].pk}', headers=self.headers)
+        self.assertEqual(response.status_code, 403)
+
+
+# JWT 인증 사용자 캐시
+class CachedJWTAuthenticationTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('user', password='password')
+        cls.staff = User.objects.create_user(
+            'staff', password='password', is_staff=True)
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, url, user):
+        return self.client.get(url, HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+
+    def test_cached_user(self):
+        # 첫 요청만 사용자 조회
+        with self.assertNumQueries(2):
+            self.assertEqual(self.get('/api/user-ingredient', self.user).status_code, 200)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get('/api/user-ingredient', self.user).status_code, 200)
+
+    def test_staff(self):
+        category = IngredientCategory.objects.create(title='채소')
+        url = f'/api/ingredient-category/{category.pk}'
+        self.assertEqual(self.get(url, self.user).status_code, 403)
+        self.assertEqual(self.get(url, self.staff).status_code, 200)
+
+        self.staff.is_staff = False
+        self.staff.save()
+        self.assertEqual(self.get(url, self.staff).status_code, 403)
+
+    def test_inactive(self):
+        self.assertEqual(self.get('/api/user-cart', self.user).status_code, 200)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.get('/api/user-cart', self.user).status_code, 401)
+
+
+# 요청별 성능 측정
+class PerformanceMiddlewareTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('user', password='password')
+        cls.staff = User.objects.create_user(
+            'staff', password='password', is_staff=True)
+        category = IngredientCategory.objects.create(title='채소')
+        Ingredient.objects.create(title='양파', category=category)
+
+    def setUp(self):
+        cache.clear()
+        route_stats.reset()
+
+    def test_server_timing(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get('/api/ingredient')
+        self.assertEqual(response.status_code, 200)
+        timing = response['Server-Timing']
+        for metric in ['db;', 'serializer;', 'view;', 'total;']:
+            self.assertIn(metric, timing)
+        self.assertIn('desc="1 queries"', timing)
+
+    def test_stats(self):
+        self.client.force_authenticate(self.user)
+        for _ in range(3):
+            self.client.get('/api/ingredient')
+        self.assertEqual(self.client.get('/api/stats/performance').status_code, 403)
+
+        self.client.force_authenticate(self.staff)
+        stats = self.client.get('/api/stats/performance').json()
+        route = stats['GET /api/ingredient']
+        self.assertEqual(route['count'], 3)
+        # 두 번째 요청부터는 카탈로그 캐시 사용
+        self.assertEqual(route['queries']['max'], 1)
+        self.assertEqual(route['queries']['p50'], 0)
+        self.assertGreater(route['size']['max'], 0)
+
+        self.assertEqual(self.client.delete('/api/stats/performance').status_code, 204)
+        self.assertEqual(self.client.get('/api/stats/performance').json().keys(),
+                         {'DELETE /api/stats/performance'})
+
+    async def test_async(self):
+        # ASGI 에서는 스레드로 전환하지 않고 실행, async ORM 쿼리(sync_to_async 스레드)도 측정
+        async def get_response(request):
+            return HttpResponse(str(await Ingredient.objects.acount()))
+
+        middleware = PerformanceMiddleware(get_response)
+        self.assertTrue(iscoroutinefunction(middleware))
+        response = await middleware(RequestFactory().get('/api/ingredient'))
+        self.assertEqual(response.content, b'1')
+        self.assertIn('desc="1 queries"', response['Server-Timing'])
+
+
+# 부하 테스트용 가상 데이터 생성
+class SeedDataTest(TestCase):
+    def test_seed(self):
+        call_command('seed_data', ingredient_categories=3, ingredients=50, recipe_categories=2, recipes=30,
+                     ingredients_per_recipe=4, users=5, pantry_size=5, cart_size=2, batch_size=7,
+                     seed=0, stdout=StringIO())
+        self.assertEqual(Recipe.objects.count(), 30)
+        self.assertEqual(User.objects.filter(username__startswith='seed-user-').count(), 5)
+        # 모든 레시피에 식재료가 있고, 사용자마다 식재료가 있음
+        self.assertFalse(Recipe.objects.filter(recipeingredient__isnull=True).exists())
+        self.assertEqual(UserIngredient.objects.values('user').distinct().count(), 5)
+        # 검색 색인 생성
+        self.client.force_login(User.objects.get(username='seed-user-1'))
+        title = Ingredient.objects.first().title
+        response = self.client.get('/api/ingredient', {'search': title})
+        self.assertEqual([row['title'] for row in response.json()], [title])
+
+        # 다시 실행하면 이어서 추가
+        call_command('seed_data', ingredient_categories=0, ingredients=10, recipe_categories=0, recipes=10,
+                     users=1, batch_size=7, seed=1, stdout=StringIO())
+        self.assertEqual(Recipe.objects.count(), 40)
+        self.assertEqual(Ingredient.objects.count(), 60)
+        self.assertTrue(User.objects.filter(username='seed-user-6').exists())
+
+
+# 목록 조회 행 직렬화 (기존 serializer 와 같은 바이트 출력)
+class RowSerializerTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('user', password='password')
+        category = IngredientCategory.objects.create(title='채소 "특가"\u2028')
+        recipe_category = RecipeCategory.objects.create(title='한식 ')
+        ingredients = [Ingredient.objects.create(title=title, category=category)
+                       for title in ['양파', '대파 \\ 1/2', '감자😀', 'tab\tnew\nline']]
+        recipe = Recipe.objects.create(title='양파 볶음', code=0, category=recipe_category)
+        for ingredient in ingredients:
+            RecipeIngredient.objects.create(recipe=recipe, ingredient=ingredient)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+        self.async_client.force_login(self.user)
+
+    def assertSameOutput(self, url, view_class):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        queryset = view_class.queryset.order_by(*view_class.ordering)
+        expected = JSONRenderer().render(view_class.serializer_class(queryset, many=True).data)
+        self.assertEqual(response.content, expected)
+
+    def test_ingredient(self):
+        self.assertSameOutput('/api/ingredient', IngredientView)
+        # 검색, 정렬 적용
+        response = self.client.get('/api/ingredient', {'search': '파', 'ordering': '-id'})
+        self.assertEqual([row['title'] for row in response.json()], ['대파 \\ 1/2', '양파'])
+
+    def test_recipe_ingredient(self):
+        self.assertSameOutput('/api/recipe-ingredient', RecipeIngredientView)
+
+    def test_renderer(self):
+        data = {'title': 'a\u2028b\u2029', 'date': timezone.now(), 'quantity': Decimal('1.5'), 'big': 2 ** 70}
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+
+# 스트리밍 목록 응답 (?stream=true)
+class StreamingListTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('user', password='password')
+        category = IngredientCategory.objects.create(title='채소')
+        recipe = Recipe.objects.create(title='볶음', code=0, category=RecipeCategory.objects.create(title='한식'))
+        for i in range(5):
+            ingredient = Ingredient.objects.create(title=f'식재료{i}', category=category)
+            RecipeIngredient.objects.create(recipe=recipe, ingredient=ingredient)
+            UserIngredient.objects.create(user=cls.user, ingredient=ingredient, quantity=Decimal('1.5'))
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+        self.async_client.force_login(self.user)
+
+    def assertSameOutput(self, url, view_class):
+        expected = self.client.get(url).content
+        # chunk 경계가 여러 번 생기도록 작은 chunk 사용
+        for chunk_size in (2, 5, 100):
+            with mock.patch.object(view_class, 'stream_chunk_size', chunk_size):
+                response = self.client.get(url, {'stream': 'true'})
+            self.assertTrue(response.streaming)
+            self.assertEqual(b''.join(response.streaming_content), expected)
+
+    def test_same_output(self):
+        self.assertSameOutput('/api/ingredient', IngredientView)
+        self.assertSameOutput('/api/recipe-ingredient', RecipeIngredientView)
+        self.assertSameOutput('/api/user-ingredient', UserIngredientView)
+
+    def test_empty(self):
+        response = self.client.get('/api/user-cart', {'stream': 'true'})
+        self.assertEqual(b''.join(response.streaming_content), b'[]')
+
+    def test_gzip(self):
+        expected = self.client.get('/api/recipe-ingredient').content
+        response = self.client.get('/api/recipe-ingredient', {'stream': 'true'}, HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), expected)
+
+    async def test_asgi(self):
+        # ASGI 에서는 전체 본문을 모으지 않도록 비동기 iterator 로 응답
+        expected = await sync_to_async(lambda: self.client.get('/api/recipe-ingredient').content)()
+        with mock.patch.object(RecipeIngredientView, 'stream_chunk_size', 2):
+            response = await self.async_client.get('/api/recipe-ingredient', {'stream': 'true'})
+            self.assertTrue(response.is_async)
+            self.assertEqual(b''.join([chunk async for chunk in response.streaming_content]), expected)
+
+    def test_not_cached(self):
+        # 카탈로그 캐시에는 저장하지 않고 ETag 는 그대로 사용
+        response = self.client.get('/api/ingredient', {'stream': 'true'})
+        b''.join(response.streaming_content)
+        response = self.client.get('/api/ingredient', {'stream': 'true'}, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get('/api/ingredient', {'stream': 'true'})
+        self.assertTrue(response.streaming)
+
+
+# 식단 계획 (유통기한 가중치 + 새 식재료 감점)
+class MealPlanTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('user', password='password')
+        category = IngredientCategory.objects.create(title='채소')
+        recipe_category = RecipeCategory.objects.create(title='한식')
+        cls.ingredients = {title: Ingredient.objects.create(title=title, category=category)
+                           for title in ['양파', '감자', '대파', '마늘']}
+        cls.recipes = {}
+        for code, (title, ingredients) in enumerate([('양파 볶음', ['양파', '대파']), ('감자 조림', ['감자']),
+                                                     ('감자 양파 국', ['양파', '감자', '대파', '마늘'])]):
+            recipe = cls.recipes[title] = Recipe.objects.create(title=title, code=code, category=recipe_category)
+            for ingredient in ingredients:
+                RecipeIngredient.objects.create(recipe=recipe, ingredient=cls.ingredients[ingredient])
+
+        # 양파: 오늘 만료 (가중치 1), 감자: 7일 후 (가중치 0.5)
+        today = timezone.localdate()
+        UserIngredient.objects.create(user=cls.user, ingredient=cls.ingredients['양파'], quantity=1, end=today)
+        UserIngredient.objects.create(user=cls.user, ingredient=cls.ingredients['감자'], quantity=1,
+                                      end=today + timedelta(days=7))
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+
+    def plan(self, **params):
+        response = self.client.get('/api/meal-plan', params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_plan(self):
+        # 감자 양파 국: 1 + 0.5 - 0.3 x 2 = 0.9, 양파 볶음: 1 - 0.3 = 0.7
+        data = self.plan(recipes=1)
+        self.assertEqual([item['recipe']['title'] for item in data['recipes']], ['감자 양파 국'])
+        self.assertEqual(data['score'], 0.9)
+        self.assertTrue(data['complete'])
+        self.assertEqual({item['title'] for item in data['shopping_list']}, {'대파', '마늘'})
+        self.assertEqual(len(data['recipes'][0]['used_ingredients']), 2)
+
+        # 감점이 크면 새 식재료가 없는 레시피
+        data = self.plan(recipes=1, penalty=1)
+        self.assertEqual([item['recipe']['title'] for item in data['recipes']], ['감자 조림'])
+
+        # 장바구니에 있는 식재료는 새로 사지 않음, 급한 식재료를 사용하는 레시피부터
+        Cart.objects.create(user=self.user, ingredient=self.ingredients['대파'])
+        data = self.plan(recipes=2, penalty=1)
+        self.assertEqual([item['recipe']['title'] for item in data['recipes']], ['양파 볶음', '감자 조림'])
+        self.assertEqual((data['shopping_list'], data['used_count']), ([], 2))
+
+    def test_query_count(self):
+        self.plan()
+        # 보유 식재료, 장바구니, 레시피, 새 식재료 (+ 인증)
+        with self.assertNumQueries(4):
+            self.plan(recipes=3)
+
+    def test_invalid(self):
+        self.assertEqual(self.client.get('/api/meal-plan', {'recipes': 0}).status_code, 400)
+
+
+# 비슷한 레시피 (MinHash/LSH)
+class SimilarRecipeTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('user', password='password')
+        category = IngredientCategory.objects.create(title='채소')
+        cls.ingredients = [Ingredient.objects.create(title=f'식재료{i}', category=category) for i in range(12)]
+        recipe_category = RecipeCategory.objects.create(title='한식')
+        cls.recipes = {}
+        for code, ingredient_numbers in enumerate([range(0, 6), range(0, 5), range(1, 6), range(0, 3), range(6, 12)]):
+            recipe = Recipe.objects.create(title=f'레시피{code}', code=code, category=recipe_category)
+            for i in ingredient_numbers:
+                RecipeIngredient.objects.create(recipe=recipe, ingredient=cls.ingredients[i])
+            cls.recipes[code] = recipe
+
+    def setUp(self):
+        cache.clear()
+        recipe_similarity_index.clear()
+        call_command('build_similarity_index', stdout=StringIO())
+        self.client.force_authenticate(self.user)
+
+    def get_similar(self, code, **params):
+        response = self.client.get(f'/api/recipe/{self.recipes[code].pk}/similar', params)
+        self.assertEqual(response.status_code, 200)
+        return [(row['recipe']['code'], round(row['similarity'], 2)) for row in response.json()]
+
+    def test_similar(self):
+        self.assertEqual(self.get_similar(0), [(1, 0.83), (2, 0.83), (3, 0.5)])
+        self.assertEqual(self.get_similar(0, min_similarity=0.6, limit=1), [(1, 0.83)])
+        self.assertEqual(self.get_similar(4), [])
+
+    def test_incremental_update(self):
+        self.get_similar(0)
+        with self.captureOnCommitCallbacks(execute=True):
+            RecipeIngredient.objects.create(recipe=self.recipes[3], ingredient=self.ingredients[3])
+            RecipeIngredient.objects.create(recipe=self.recipes[3], ingredient=self.ingredients[4])
+            RecipeIngredient.objects.filter(recipe=self.recipes[1]).delete()
+        self.assertEqual(self.get_similar(0), [(2, 0.83), (3, 0.83)])
+
+        # 삭제된 레시피는 제외
+        with self.captureOnCommitCallbacks(execute=True):
+            self.recipes[2].delete()
+        self.assertEqual(self.get_similar(0), [(3, 0.83)])
+
+    def test_deleted_recipe(self):
+        self.get_similar(0)
+        deleted = [self.recipes[1].pk, self.recipes[2].pk]
+        with self.captureOnCommitCallbacks(execute=True):
+            Recipe.objects.filter(pk__in=deleted).delete()
+        # 색인에서 제외되어 limit 개를 다른 레시피로 채움
+        self.assertEqual(self.get_similar(0, limit=1), [(3, 0.5)])
+        snapshot = recipe_similarity_index.snapshot()
+        self.assertFalse(set(deleted) & set(snapshot.positions))
+        self.assertEqual(recipe_similarity_index.similar(deleted[0]), [])
+
+        # 다시 생성해도 같은 결과
+        with mock.patch.multiple(RecipeSimilarityIndex, REBUILD_RATIO=0, REBUILD_MIN=0):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.recipes[4].delete()
+            self.assertEqual(self.get_similar(0), [(3, 0.5)])
+        snapshot = recipe_similarity_index.snapshot()
+        self.assertEqual(sorted(snapshot.recipe_ids.tolist()), [self.recipes[0].pk, self.recipes[3].pk])
+
+    def test_batched_signatures(self):
+        # 식재료 삭제로 여러 레시피 식재료가 cascade 삭제되어도 커밋 후 한 번에 서명 갱신
+        self.get_similar(0)
+        shared = [self.recipes[code].pk for code in (0, 1, 2, 3)]
+        with mock.patch('FoodManagementAPI.similarity_index.update_recipe_signatures',
+                        wraps=update_recipe_signatures) as update:
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                self.ingredients[1].delete()
+        update.assert_called_once()
+        # 롤백된 다른 테스트에서 모은 id 가 함께 있을 수 있음
+        self.assertLessEqual(set(shared), set(update.call_args.args[0]))
+        self.assertGreaterEqual(len(callbacks), 4)
+        self.assertEqual(self.get_similar(0), [(1, 0.8), (2, 0.8), (3, 0.4)])
+
+    @override_settings(SIMILAR_RECIPE_DEFER_THRESHOLD=3)
+    def test_deferred_signatures(self):
+        # 많은 레시피 서명은 커밋 후 바로 갱신하지 않고 작업으로 갱신
+        with self.captureOnCommitCallbacks(execute=True):
+            self.ingredients[1].delete()
+        job = Job.objects.get(name='update_recipe_signatures')
+        self.assertLessEqual({self.recipes[code].pk for code in (0, 1, 2, 3)}, set(job.kwargs['recipe_ids']))
+        self.assertEqual(Worker('test').run(burst=True), 1)
+        self.assertEqual(self.get_similar(0), [(1, 0.8), (2, 0.8), (3, 0.4)])
+
+    def test_invalid(self):
+        self.assertEqual(self.client.get('/api/recipe/0/similar').status_code, 404)
+        url = f'/api/recipe/{self.recipes[0].pk}/similar'
+        self.assertEqual(self.client.get(url, {'limit': 0}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'min_similarity': 2}).status_code, 400)
+
+
+class RecipeDocumentTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('user', password='password')
+        cls.ingredient_category = IngredientCategory.objects.create(title='채소')
+        cls.ingredients = [Ingredient.objects.create(title=f'식재료{i}', category=cls.ingredient_category)
+                           for i in range(3)]
+        cls.recipe_category = RecipeCategory.objects.create(title='한식')
+        cls.recipes = [Recipe.objects.create(title=f'레시피{i}', code=i, category=cls.recipe_category)
+                       for i in range(2)]
+        for recipe in cls.recipes:
+            for ingredient in cls.ingredients[recipe.code:recipe.code + 2]:
+                RecipeIngredient.objects.create(recipe=recipe, ingredient=ingredient)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+
+    def assertDocuments(self):
+        # 저장된 문서와 RecipeSerializer 출력 비교
+        self.assertFalse(Recipe.objects.filter(document__isnull=True).exists())
+        response = self.client.get('/api/recipe', {'ordering': 'id'})
+        self.assertEqual(response.status_code, 200)
+        expected = RecipeSerializer(recipe_queryset.order_by('id'), many=True).data
+        self.assertEqual(response.content, FastJSONRenderer().render(
+            {'count': len(expected), 'next': None, 'previous': None, 'results': expected}))
+
+    def test_rebuild_command(self):
+        call_command('rebuild_recipe_documents', stdout=StringIO())
+        self.assertEqual(RecipeDocument.objects.count(), 2)
+        self.assertDocuments()
+
+    def test_missing_document(self):
+        # 문서가 없으면 조회할 때 생성
+        self.assertEqual(RecipeDocument.objects.count(), 0)
+        self.client.get('/api/recipe')
+        self.assertDocuments()
+        with self.assertNumQueries(1):
+            self.client.get(f'/api/recipe/{self.recipes[0].pk}')
+
+    def test_invalidate(self):
+        call_command('rebuild_recipe_documents', stdout=StringIO())
+        with mock.patch('FoodManagementAPI.recipe_documents.rebuild_recipe_documents',
+                        wraps=rebuild_recipe_documents) as rebuild:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.ingredient_category.title = '과일'
+                self.ingredient_category.save()
+                self.ingredients[1].title = '양파'
+                self.ingredients[1].save()
+                self.recipe_category.title = '양식'
+                self.recipe_category.save()
+        # 같은 트랜잭션의 변경은 커밋 후 한 번에 생성
+        rebuild.assert_called_once_with({recipe.pk for recipe in self.recipes})
+        self.assertDocuments()
+
+        # 식재료 삭제로 인한 레시피 식재료 cascade 삭제
+        with self.captureOnCommitCallbacks(execute=True):
+            self.ingredients[1].delete()
+        self.assertDocuments()
+        self.assertEqual(len(self.client.get(f'/api/recipe/{self.recipes[1].pk}').data['recipe_ingredients']), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            RecipeIngredient.objects.create(recipe=self.recipes[1], ingredient=self.ingredients[0])
+            self.recipes[0].title = '비빔밥'
+            self.recipes[0].save()
+        self.assertDocuments()
+
+        # 롤백된 savepoint 에서 무효화한 문서도 커밋 후 다시 생성
+        with self.captureOnCommitCallbacks(execute=True):
+            savepoint = transaction.savepoint()
+            self.recipes[1].title = '불고기'
+            self.recipes[1].save()
+            transaction.savepoint_rollback(savepoint)
+            self.recipes[0].title = '김밥'
+            self.recipes[0].save()
+        self.assertDocuments()
+
+
+class IngredientAutocompleteTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('user', password='password')
+        cls.category = IngredientCategory.objects.create(title='식재료')
+        for title in ['돼지고기', '다진 마늘', '마늘', '닭가슴살', 'MSG']:
+            Ingredient.objects.create(title=title, category=cls.category)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+
+    def autocomplete(self, q, **params):
+        response = self.client.get('/api/ingredient/autocomplete', {'q': q, **params})
+        self.assertEqual(response.status_code, 200)
+        return [item['title'] for item in response.json()]
+
+    def test_autocomplete(self):
+        # 제목 시작 일치, 짧은 제목 순
+        self.assertEqual(self.autocomplete('마'), ['마늘', '다진 마늘'])
+        self.assertEqual(self.autocomplete('다진마'), ['다진 마늘'])
+        # 입력 중인 글자 (닭 <- 달, 돼지 <- 됒)
+        self.assertEqual(self.autocomplete('달'), ['닭가슴살'])
+        self.assertEqual(self.autocomplete('됒'), ['돼지고기'])
+        # 초성, 로마자
+        self.assertEqual(self.autocomplete('ㄷㅈ'), ['돼지고기', '다진 마늘'])
+        self.assertEqual(self.autocomplete('maneul'), ['마늘', '다진 마늘'])
+        self.assertEqual(self.autocomplete('ms'), ['MSG'])
+        self.assertEqual(self.autocomplete('마', limit=1), ['마늘'])
+        self.assertEqual(self.autocomplete(''), [])
+        self.assertEqual(self.client.get('/api/ingredient/autocomplete', {'limit': 0}).status_code, 400)
+
+    def test_refresh(self):
+        self.assertEqual(self.autocomplete('마늘'), ['마늘', '다진 마늘'])
+        Ingredient.objects.create(title='마늘종', category=self.category)
+        Ingredient.objects.filter(title='다진 마늘').delete()
+        self.assertEqual(self.autocomplete('마늘'), ['마늘', '마늘종'])
+
+
+class PantryAnalyticsTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user('staff', password='password', is_staff=True)
+        cls.users = [User.objects.create_user(f'user{i}', password='password') for i in range(2)]
+        cls.categories = [IngredientCategory.objects.create(title=title) for title in ['채소', '육류', '과일']]
+        cls.ingredients = [Ingredient.objects.create(title=f'식재료{i}', category=cls.categories[i % 2])
+                           for i in range(4)]
+        today = timezone.localdate()
+        # 채소(식재료0, 2): 보관 기간 10, 20, 30일 중 1개 만료, 육류(식재료1): 보관 기간 5일
+        for user, ingredient, start, end in [
+                (cls.users[0], cls.ingredients[0], -20, -10), (cls.users[0], cls.ingredients[2], -5, 15),
+                (cls.users[1], cls.ingredients[0], 0, 30), (cls.users[1], cls.ingredients[1], 0, 5)]:
+            UserIngredient.objects.create(
+                user=user, ingredient=ingredient, quantity=Decimal('2'),
+                start=today + timedelta(days=start), end=today + timedelta(days=end))
+        Cart.objects.create(user=cls.users[0], ingredient=cls.ingredients[0], buy=True)
+        Cart.objects.create(user=cls.users[0], ingredient=cls.ingredients[1], buy=True)
+        Cart.objects.create(user=cls.users[1], ingredient=cls.ingredients[3])
+
+    def setUp(self):
+        cache.clear()
+
+    def test_analytics(self):
+        self.client.force_authenticate(self.users[0])
+        self.assertEqual(self.client.get('/api/stats/pantry').status_code, 403)
+
+        self.client.force_authenticate(self.staff)
+        response = self.client.get('/api/stats/pantry')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['totals'], {
+            'pantry_items': 4, 'expired_items': 1, 'cart_items': 3, 'bought': 2, 'in_pantry': 1,
+            'waste_rate': 0.25, 'buy_rate': 0.6667, 'conversion_rate': 0.3333})
+
+        vegetable, meat, fruit = data['categories']
+        self.assertEqual((vegetable['pantry_items'], vegetable['expired_items'], vegetable['waste_rate']), (3, 1, 0.3333))
+        self.assertEqual(vegetable['expired_quantity'], 2.0)
+        self.assertEqual((vegetable['avg_shelf_life_days'], vegetable['median_shelf_life_days']), (20.0, 20.0))
+        self.assertEqual((vegetable['cart_items'], vegetable['bought'], vegetable['in_pantry']), (1, 1, 1))
+        self.assertEqual((meat['avg_shelf_life_days'], meat['conversion_rate']), (5.0, 0.0))
+        self.assertEqual((meat['cart_items'], meat['bought'], meat['in_pantry']), (2, 1, 0))
+        self.assertEqual((fruit['pantry_items'], fruit['waste_rate'], fruit['avg_shelf_life_days']), (0, None, None))
+        self.assertEqual(data['most_wasted'], [
+            {'id': self.ingredients[0].pk, 'title': '식재료0', 'expired_items': 1}])
+        self.assertEqual([item['id'] for item in data['most_bought']],
+                         [self.ingredients[0].pk, self.ingredients[1].pk])
+
+        # 캐시된 결과, refresh 로 다시 계산
+        UserIngredient.objects.all().delete()
+        self.assertEqual(self.client.get('/api/stats/pantry').json()['totals']['pantry_items'], 4)
+        self.assertEqual(self.client.get('/api/stats/pantry?refresh=true').json()['totals']['pantry_items'], 0)
+
+    def test_command(self):
+        self.client.force_authenticate(self.staff)
+        # 다른 날짜 기준 통계는 캐시에 저장하지 않음
+        stdout = StringIO()
+        call_command('compute_pantry_analytics', '--date', str(timezone.localdate() - timedelta(days=15)),
+                     stdout=stdout)
+        self.assertIn('not cached', stdout.getvalue())
+        self.assertIsNone(cache.get(ANALYTICS_CACHE_KEY))
+
+        call_command('compute_pantry_analytics', '--top', '1', stdout=StringIO())
+        UserIngredient.objects.all().delete()
+        data = self.client.get('/api/stats/pantry').json()
+        self.assertEqual(data['totals']['expired_items'], 1)
+        self.assertEqual(len(data['most_bought']), 1)
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRoutingTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [User.objects.create_user(f'user{i}', password='password') for i in range(2)]
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def read_database(self, method, user=None, status=200, authenticated=True, session=None, **extra):
+        # 요청 처리 중 읽기 DB
+        # get_response 에서 DRF 처럼 인증된 사용자를 request.user 에 설정 (인증 실패는 AnonymousUser)
+        if user is not None and session is None:
+            extra['HTTP_AUTHORIZATION'] = f'Bearer {AccessToken.for_user(user)}'
+        if session is not None:
+            extra['HTTP_COOKIE'] = f'sessionid={session.session_key}'
+        request = getattr(self.factory, method)('/api/ingredient', **extra)
+        used = []
+
+        def get_response(request):
+            used.append(ReplicaRouter().db_for_read(Ingredient))
+            request.user = user if user is not None and authenticated else AnonymousUser()
+            if session is not None:
+                request.session = SessionStore(session.session_key)
+            return HttpResponse(status=status)
+        ReplicaRoutingMiddleware(get_response)(request)
+        return used[0]
+
+    def test_routing(self):
+        self.assertEqual(self.read_database('get', self.users[0]), 'replica')
+        self.assertEqual(self.read_database('post', self.users[0], status=201), None)
+        # 쓰기 요청이 성공한 사용자만 default 에서 읽음
+        self.assertEqual(self.read_database('get', self.users[0]), None)
+        self.assertEqual(self.read_database('get', self.users[1]), 'replica')
+        self.assertEqual(self.read_database('get'), 'replica')
+
+        # 실패한 쓰기 요청, 인증되지 않은 토큰은 고정하지 않음
+        self.read_database('post', self.users[1], status=400)
+        self.read_database('delete', self.users[1], authenticated=False)
+        self.assertEqual(self.read_database('get', self.users[1]), 'replica')
+
+        # 세션 사용자
+        session = SessionStore()
+        session[SESSION_KEY] = str(self.users[1].pk)
+        session.save()
+        self.read_database('delete', self.users[1], session=session, status=204)
+        self.assertEqual(self.read_database('get', session=session), None)
+        self.assertEqual(self.read_database('get', self.users[1]), None)
+
+        # 요청 밖(명령, signals)과 use_primary 블록은 default
+        self.assertEqual(ReplicaRouter().db_for_read(Ingredient), None)
+        self.assertEqual(ReplicaRouter().db_for_write(Ingredient), 'default')
+        self.assertFalse(ReplicaRouter().allow_migrate('replica', 'FoodManagementAPI'))
+
+    async def test_async(self):
+        used = []
+
+        async def get_response(request):
+            used.append(ReplicaRouter().db_for_read(Ingredient))
+            request.user = self.users[0]
+            return HttpResponse(status=201 if request.method == 'POST' else 200)
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        self.assertTrue(iscoroutinefunction(middleware))
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(self.users[0])}'}
+        for method in ['get', 'post', 'get']:
+            await middleware(getattr(self.factory, method)('/api/ingredient', **headers))
+        self.assertEqual(used, ['replica', None, None])
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas(self):
+        self.assertEqual(self.read_database('get', self.users[0]), None)
+
+    def test_stale_replica(self):
+        # 복제 DB 가 지연되면 쓰기 후 바뀐 버전에 이전 데이터가 저장되므로
+        # 응답 캐시, 메모리 색인, 레시피 문서는 GET 요청 중에도 default 에서 읽어서 생성
+        category = IngredientCategory.objects.create(title='채소')
+        ingredient = Ingredient.objects.create(title='마늘', category=category)
+        recipe = Recipe.objects.create(title='마늘볶음', code=1, category=RecipeCategory.objects.create(title='한식'))
+        RecipeIngredient.objects.create(recipe=recipe, ingredient=ingredient)
+        UserIngredient.objects.create(user=self.users[0], ingredient=ingredient, quantity=1)
+        self.client.force_login(self.users[0])
+
+        def replica_models(url):
+            models = []
+
+            def db_for_read(router, model, **hints):
+                if read_database.get() is not None:
+                    models.append(model)
+                # 테스트에는 복제 DB 가 없으므로 실제 조회는 default
+                return None
+            with mock.patch.object(ReplicaRouter, 'db_for_read', db_for_read):
+                self.assertEqual(self.client.get(url).status_code, 200)
+            return models
+
+        # 사용자 조회 등 나머지 읽기는 복제 DB
+        self.assertIn(User, replica_models('/api/ingredient'))
+        Ingredient.objects.create(title='양파', category=category)
+        self.assertNotIn(Ingredient, replica_models('/api/ingredient'))
+        self.assertNotIn(Ingredient, replica_models('/api/ingredient/autocomplete?q=ma'))
+        self.assertNotIn(RecipeIngredient, replica_models('/api/cookable-recipe'))
+        self.assertNotIn(RecipeSignature, replica_models(f'/api/recipe/{recipe.pk}/similar'))
+        self.assertNotIn(RecipeIngredient, replica_models('/api/recipe'))
+        self.assertTrue(RecipeDocument.objects.filter(recipe=recipe).exists())
+
+
+# 요청 비용 기반 토큰 버킷 throttle
+@override_settings(THROTTLE_USER_BUDGET=(1, 10), THROTTLE_ROUTE_BUDGETS={'api/ingredient-recipe': (1, 20)})
+class ThrottleTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('user', password='password')
+        cls.other = User.objects.create_user('other', password='password')
+        cls.staff = User.objects.create_user('staff', password='password', is_staff=True)
+        Ingredient.objects.create(title='양파', category=IngredientCategory.objects.create(title='채소'))
+
+    def setUp(self):
+        cache.clear()
+        local_bucket_store.reset()
+        throttle_stats.reset()
+        self.client.force_authenticate(self.user)
+
+    def test_user_budget(self):
+        # 검색(8) 한 번 후 남은 토큰(2)으로는 목록(4) 불가, 단일 항목(1)은 가능
+        self.assertEqual(self.client.get('/api/ingredient-recipe', {'search': '양'}).status_code, 200)
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/ingredient')
+        self.assertEqual(response.status_code, 429)
+        self.assertIn(response['Retry-After'], ('2', '3'))
+        self.assertEqual(self.client.get('/api/ingredient/autocomplete', {'q': '양'}).status_code, 200)
+
+        # 다른 사용자는 영향 없음
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self.client.get('/api/ingredient').status_code, 200)
+
+    def test_route_budget(self):
+        # 사용자별 예산이 남아 있어도 URL 전체 예산(20)을 넘으면 거부
+        for user in (self.user, self.other):
+            self.client.force_authenticate(user)
+            self.assertEqual(self.client.get('/api/ingredient-recipe', {'search': '양'}).status_code, 200)
+        self.client.force_authenticate(self.staff)
+        self.assertEqual(self.client.get('/api/ingredient-recipe', {'search': '양'}).status_code, 429)
+
+        response = self.client.get('/api/stats/throttle')
+        self.assertEqual(response.status_code, 200)
+        stats = response.data['api/ingredient-recipe']
+        self.assertEqual((stats['allowed'], stats['shed'], stats['shed_user'], stats['shed_route']), (2, 1, 0, 1))
+        self.assertEqual((stats['allowed_cost'], stats['shed_cost']), (16, 8))
+
+    @override_settings(THROTTLE_CACHE='default')
+    def test_cache_store(self):
+        self.assertEqual(self.client.get('/api/ingredient-recipe', {'search': '양'}).status_code, 200)
+        self.assertEqual(self.client.get('/api/ingredient').status_code, 429)
+        self.assertEqual(len(local_bucket_store._buckets), 0)
+
+
+# 관리자 화면 (관련 행 JOIN, autocomplete 위젯, 추정 행 수 Paginator)
+class AdminTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', password='password')
+        category = IngredientCategory.objects.create(title='채소')
+        recipe_category = RecipeCategory.objects.create(title='한식')
+        for i in range(20):
+            user = User.objects.create_user(f'user{i}', password='password')
+            ingredient = Ingredient.objects.create(title=f'식재료{i}', category=category)
+            recipe = Recipe.objects.create(title=f'레시피{i}', code=i, category=recipe_category)
+            RecipeIngredient.objects.create(recipe=recipe, ingredient=ingredient)
+            UserIngredient.objects.create(user=user, ingredient=ingredient, quantity=1)
+            Cart.objects.create(user=user, ingredient=ingredient)
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_changelist(self):
+        # 세션, 사용자, 개수, 목록 (+ 카테고리 필터), 행 수와 관계없이 고정
+        for model, queries in [('useringredient', 4), ('recipeingredient', 4), ('cart', 4),
+                               ('recipe', 5), ('ingredient', 5)]:
+            url = f'/admin/FoodManagementAPI/{model}/'
+            self.client.get(url)
+            with self.assertNumQueries(queries):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+
+    def test_autocomplete_widget(self):
+        response = self.client.get('/admin/FoodManagementAPI/recipeingredient/add/')
+        self.assertContains(response, 'admin-autocomplete')
+        self.assertNotContains(response, '식재료19</option>')
+
+    def test_paginator(self):
+        queryset = Recipe.objects.order_by('id')
+        with mock.patch.object(EstimatedCountPaginator, 'estimated_count', return_value=10 ** 6):
+            self.assertEqual(EstimatedCountPaginator(queryset, 100).count, 10 ** 6)
+            # 필터가 있으면 count_limit 까지만 계산
+            with mock.patch.object(EstimatedCountPaginator, 'count_limit', 5):
+                self.assertEqual(EstimatedCountPaginator(queryset.filter(code__gte=10), 100).count, 5)
+        # 추정할 수 없으면(SQLite) 정확한 개수
+        self.assertEqual(EstimatedCountPaginator(queryset, 100).count, 20)
+
+
+# 백그라운드 작업 큐 (작업 추가, worker 실행, 재시도, 동시 실행 제한, 진행 상황)
+class JobQueueTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('user', password='password')
+        cls.staff = User.objects.create_user('staff', password='password', is_staff=True)
+        cls.recipe_category = RecipeCategory.objects.create(title='한식')
+        cls.recipes = [Recipe.objects.create(title=f'레시피{i}', code=i, category=cls.recipe_category)
+                       for i in range(3)]
+
+    def setUp(self):
+        self.client.force_authenticate(self.staff)
+        self.calls = []
+
+    def register(self, name, func, max_attempts=3, concurrency=None):
+        patcher = mock.patch.dict(tasks, {name: Task(func, max_attempts, concurrency, 0)})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_enqueue_and_run(self):
+        # save() 를 거치지 않은 카테고리 slug 재생성
+        IngredientCategory.objects.bulk_create([IngredientCategory(title='Fresh Fruit'), IngredientCategory(title='채소')])
+        RecipeCategory.objects.filter(pk=self.recipe_category.pk).update(title='Main Dish', slug='')
+        response = self.client.post('/api/jobs', {'name': 'regenerate_slugs'}, format='json')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['status'], Job.QUEUED)
+
+        self.assertEqual(Worker('test').run(burst=True), 1)
+        self.assertEqual(sorted(IngredientCategory.objects.values_list('slug', flat=True)), ['caeso', 'fresh-fruit'])
+        self.assertEqual(RecipeCategory.objects.get().slug, 'main-dish')
+
+        response = self.client.get(f'/api/jobs/{response.data["id"]}')
+        self.assertEqual((response.data['status'], response.data['progress'], response.data['attempts']),
+                         (Job.SUCCEEDED, 1.0, 1))
+        self.assertEqual(response.data['result'], {'count': 3, 'updated': 3})
+        self.assertEqual(self.client.get('/api/jobs', {'status': Job.SUCCEEDED}).data['count'], 1)
+
+        self.assertEqual(self.client.post('/api/jobs', {'name': 'unknown'}, format='json').status_code, 400)
+        # 작업 함수가 받지 않는 인자
+        response = self.client.post('/api/jobs', {'name': 'regenerate_slugs', 'kwargs': {'model': 'Recipe'}},
+                                    format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('kwargs', response.data)
+        response = self.client.post('/api/jobs', {'name': 'regenerate_slugs', 'kwargs': {'models': ['RecipeCategory']}},
+                                    format='json')
+        self.assertEqual(response.status_code, 202)
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.get('/api/jobs').status_code, 403)
+
+    def test_retry(self):
+        def flaky(fail):
+            self.calls.append(fail)
+            report_progress(1, 2, 'half')
+            self.calls.append(Job.objects.values_list('progress', 'message').get())
+            if len(self.calls) < 4:
+                raise ValueError('fail')
+            return 'ok'
+
+        self.register('flaky', flaky, max_attempts=2)
+        job = enqueue('flaky', fail=True)
+        # 실패 후 다시 queued (retry_delay 0), 두 번째 실행에서 성공
+        self.assertEqual(Worker('test').run(burst=True), 2)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, job.result), (Job.SUCCEEDED, 2, 'ok'))
+        self.assertEqual(self.calls[1], (0.5, 'half'))
+
+        # max_attempts 를 넘으면 failed, traceback 저장
+        self.calls = []
+        self.register('broken', lambda: 1 / 0, max_attempts=2)
+        job = enqueue('broken')
+        self.assertEqual(Worker('test').run(burst=True), 2)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.FAILED, 2))
+        self.assertIn('ZeroDivisionError', job.error)
+
+    def test_concurrency_and_stale(self):
+        self.register('exclusive', lambda: self.calls.append(1), concurrency=1)
+        running = Job.objects.create(name='exclusive', status=Job.RUNNING, attempts=1, worker='other',
+                                     heartbeat=timezone.now())
+        enqueue('exclusive')
+        # 같은 작업이 실행 중이면 가져가지 않음
+        self.assertEqual(Worker('test').run(burst=True), 0)
+
+        # heartbeat 가 멈춘 작업은 다시 queued 로 바꿔서 실행
+        Job.objects.filter(pk=running.pk).update(heartbeat=timezone.now() - timedelta(hours=1))
+        self.assertEqual(Worker('test').run(burst=True), 2)
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(Job.objects.filter(status=Job.SUCCEEDED).count(), 2)
+
+    def test_dedupe_key(self):
+        self.register('digest', lambda: None)
+        job = enqueue('digest', key='digest:today')
+        self.assertEqual(enqueue('digest', key='digest:today'), job)
+        # 다음 실행 시각까지 대기
+        enqueue('digest', delay=3600)
+        with mock.patch.object(Worker, 'install_signal_handlers'):
+            call_command('run_jobs', '--burst', '--processes', '1', stdout=StringIO())
+        self.assertNotEqual(enqueue('digest', key='digest:today'), job)
+        self.assertEqual(Job.objects.filter(status=Job.QUEUED).count(), 2)
+
+    @override_settings(RECIPE_DOCUMENTS_DEFER_THRESHOLD=3)
+    def test_deferred_recipe_documents(self):
+        rebuild_recipe_documents([recipe.pk for recipe in self.recipes])
+
+        # 많은 레시피 문서는 커밋 후 바로 생성하지 않고 작업으로 생성
+        with self.captureOnCommitCallbacks(execute=True):
+            self.recipe_category.title = '양식'
+            self.recipe_category.save()
+        self.assertEqual(RecipeDocument.objects.count(), 0)
+        job = Job.objects.get(name='rebuild_recipe_documents')
+        self.assertEqual(job.kwargs, {'recipe_ids': [recipe.pk for recipe in self.recipes]})
+
+        self.assertEqual(Worker('test').run(burst=True), 1)
+        self.assertEqual(RecipeDocument.objects.count(), 3)
+        self.assertIn('양식', RecipeDocument.objects.first().document)
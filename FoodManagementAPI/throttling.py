@@ -0,0 +1,186 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+
+# 요청 비용 (토큰 수)
+# 검색(?search=) > 목록 > 쓰기 > 단일 항목 조회 순으로 DB 부하가 큼
+DEFAULT_COSTS = {'detail': 1, 'write': 2, 'list': 4, 'search': 8}
+# 사용자별 예산: (초당 채워지는 토큰 수, 최대 토큰 수)
+DEFAULT_USER_BUDGET = (20, 200)
+# URL 별 예산 (전체 사용자 합계), 목록에 없는 URL 은 사용자별 예산만 적용
+DEFAULT_ROUTE_BUDGETS = {
+    f'{prefix}{route}': budget
+    for prefix in ('api/', 'api/async/')
+    for route, budget in [('recipe', (400, 1600)), ('ingredient-recipe', (400, 1600)),
+                          ('recipe-ingredient', (100, 400)), ('cookable-recipe', (200, 800)),
+                          ('meal-plan', (200, 800))]
+}
+
+
+def refill(state, rate, capacity, now):
+    # state: (토큰 수, 갱신 시각, ...), 없으면 가득 찬 버킷
+    if state is None:
+        return capacity
+    tokens, updated = state[:2]
+    return min(capacity, tokens + (now - updated) * rate)
+
+
+# 프로세스 메모리 토큰 버킷 (워커별로 따로 계산되므로 URL 별 예산은 워커 수만큼 커짐)
+# 가득 찬 버킷은 기본 상태와 같으므로 max_keys 를 넘으면 삭제
+class LocalBucketStore:
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets = {}
+
+    def take(self, buckets, cost):
+        """
+        buckets: [(key, rate, capacity)]
+        모든 버킷에 cost 만큼 토큰이 있으면 모두에서 사용하고 빈 리스트 반환
+        아니면 사용하지 않고 [(부족한 버킷 key, 기다려야 하는 초)] 반환
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens = [refill(self._buckets.get(key), rate, capacity, now) for key, rate, capacity in buckets]
+            shortfalls = [(key, (cost - available) / rate)
+                          for (key, rate, _), available in zip(buckets, tokens) if available < cost]
+            if shortfalls:
+                return shortfalls
+
+            for (key, rate, capacity), available in zip(buckets, tokens):
+                self._buckets[key] = (available - cost, now, now + (capacity - available + cost) / rate)
+            if len(self._buckets) > self.max_keys:
+                self._buckets = {key: state for key, state in self._buckets.items() if state[2] > now}
+            return []
+
+    def reset(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+# 여러 프로세스가 함께 사용하는 캐시(redis, memcached 등) 토큰 버킷
+# 읽기/쓰기가 원자적이지 않으므로 동시에 들어온 요청은 예산보다 조금 더 허용될 수 있음
+class CacheBucketStore:
+    key_prefix = 'throttle:'
+
+    def __init__(self, alias):
+        self.cache = caches[alias]
+
+    def take(self, buckets, cost):
+        now = time.time()
+        keys = [self.key_prefix + key for key, _, _ in buckets]
+        states = self.cache.get_many(keys)
+        tokens = [refill(states.get(cache_key), rate, capacity, now)
+                  for cache_key, (_, rate, capacity) in zip(keys, buckets)]
+        shortfalls = [(key, (cost - available) / rate)
+                      for (key, rate, _), available in zip(buckets, tokens) if available < cost]
+        if shortfalls:
+            return shortfalls
+
+        for cache_key, (_, rate, capacity), available in zip(keys, buckets, tokens):
+            # 가득 찰 때까지만 보관
+            self.cache.set(cache_key, (available - cost, now), int((capacity - available + cost) / rate) + 1)
+        return []
+
+
+local_bucket_store = LocalBucketStore()
+
+
+def bucket_store():
+    alias = getattr(settings, 'THROTTLE_CACHE', None)
+    return CacheBucketStore(alias) if alias else local_bucket_store
+
+
+# URL 별 허용/거부(shed) 요청 수와 비용 (프로세스 메모리)
+class ThrottleStats:
+    FIELDS = ['allowed', 'shed', 'shed_user', 'shed_route', 'allowed_cost', 'shed_cost']
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def record(self, route, cost, shed_user=False, shed_route=False):
+        shed = shed_user or shed_route
+        with self._lock:
+            route_stats = self._routes.setdefault(route, dict.fromkeys(self.FIELDS, 0))
+            route_stats['shed' if shed else 'allowed'] += 1
+            route_stats['shed_cost' if shed else 'allowed_cost'] += cost
+            route_stats['shed_user'] += shed_user
+            route_stats['shed_route'] += shed_route
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+    def summary(self):
+        with self._lock:
+            routes = {route: dict(route_stats) for route, route_stats in sorted(self._routes.items())}
+        for route_stats in routes.values():
+            total = route_stats['allowed'] + route_stats['shed']
+            route_stats['shed_rate'] = round(route_stats['shed'] / total, 4) if total else 0.0
+        return routes
+
+
+throttle_stats = ThrottleStats()
+
+
+# 요청 비용 기반 토큰 버킷 throttle (REST_FRAMEWORK DEFAULT_THROTTLE_CLASSES)
+# 사용자별 예산(THROTTLE_USER_BUDGET)과 URL 별 예산(THROTTLE_ROUTE_BUDGETS)에서 모두 토큰을 사용할 수 있을 때만 허용
+# 비용은 THROTTLE_COSTS (뷰의 throttle_cost 가 있으면 그 값)
+# 거부하면 429 + Retry-After (뷰 실행 전이므로 DB 조회 없음, 인증은 CachedJWTAuthentication 캐시 사용)
+# 저장소는 프로세스 메모리, THROTTLE_CACHE 에 캐시 alias 를 지정하면 공유 캐시 사용
+class TokenBucketThrottle(BaseThrottle):
+    def __init__(self):
+        self.costs = {**DEFAULT_COSTS, **getattr(settings, 'THROTTLE_COSTS', {})}
+        self.user_budget = getattr(settings, 'THROTTLE_USER_BUDGET', DEFAULT_USER_BUDGET)
+        self.route_budgets = getattr(settings, 'THROTTLE_ROUTE_BUDGETS', DEFAULT_ROUTE_BUDGETS)
+        self.wait_seconds = None
+
+    def allow_request(self, request, view):
+        route = self.get_route(request)
+        cost = self.get_cost(request, view)
+
+        if request.user and request.user.is_authenticated:
+            user_key = f'user:{request.user.pk}'
+        else:
+            user_key = f'ip:{self.get_ident(request)}'
+        buckets = [(user_key, *self.user_budget)]
+        if route in self.route_budgets:
+            buckets.append((f'route:{route}', *self.route_budgets[route]))
+        # 최대 토큰 수보다 비싼 요청도 가득 찬 버킷에서는 허용
+        cost = min(cost, *(capacity for _, _, capacity in buckets))
+
+        shortfalls = bucket_store().take(buckets, cost)
+        throttle_stats.record(route, cost,
+                              shed_user=any(key == user_key for key, _ in shortfalls),
+                              shed_route=any(key != user_key for key, _ in shortfalls))
+        if shortfalls:
+            self.wait_seconds = max(wait for _, wait in shortfalls)
+            return False
+        return True
+
+    def wait(self):
+        return self.wait_seconds
+
+    @staticmethod
+    def get_route(request):
+        match = request.resolver_match
+        return match.route if match else request.path
+
+    def get_cost(self, request, view):
+        cost = getattr(view, 'throttle_cost', None)
+        if cost is not None:
+            return cost
+        if request.method not in ('GET', 'HEAD', 'OPTIONS'):
+            return self.costs['write']
+        lookup_url_kwarg = getattr(view, 'lookup_url_kwarg', None) or getattr(view, 'lookup_field', None)
+        if not hasattr(view, 'list') or lookup_url_kwarg in view.kwargs:
+            return self.costs['detail']
+        if request.query_params.get(api_settings.SEARCH_PARAM):
+            return self.costs['search']
+        return self.costs['list']
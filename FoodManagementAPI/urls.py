@@ -8,22 +8,37 @@ urlpatterns = [
 
     path('ingredient', views.IngredientView.as_view()),
     path('ingredient/<int:pk>', views.SingleIngredientView.as_view()),
+    path('ingredient/autocomplete', views.IngredientAutocompleteView.as_view()),
 
     path('user-ingredient', views.UserIngredientView.as_view()),
     path('user-ingredient/<int:pk>', views.SingleUserIngredientView.as_view()),
+    path('user-ingredient/batch', views.UserIngredientBatchView.as_view()),
+    path('user-ingredient/expiring', views.ExpiringUserIngredientView.as_view()),
 
     path('user-cart', views.CartView.as_view()),
     path('user-cart/<int:pk>', views.SingleCartView.as_view()),
+    path('user-cart/batch', views.CartBatchView.as_view()),
+    path('user-cart/recipe', views.RecipeCartView.as_view()),
 
     path('recipe-category', views.RecipeCategoryView.as_view()),
     path('recipe-category/<int:pk>', views.SingleRecipeCategoryView.as_view()),
 
     path('recipe', views.RecipeView.as_view()),
     path('recipe/<int:pk>', views.SingleRecipeView.as_view()),
+    path('recipe/<int:pk>/similar', views.SimilarRecipeView.as_view()),
 
     path('recipe-ingredient', views.RecipeIngredientView.as_view()),
     path('recipe-ingredient/<int:pk>',
          views.SingleRecipeIngredientView.as_view()),
 
     path('ingredient-recipe', views.IngredientRecipeView.as_view()),
+    path('cookable-recipe', views.CookableRecipeView.as_view()),
+    path('meal-plan', views.MealPlanView.as_view()),
+
+    path('stats/performance', views.PerformanceStatsView.as_view()),
+    path('stats/throttle', views.ThrottleStatsView.as_view()),
+    path('stats/pantry', views.PantryAnalyticsView.as_view()),
+
+    path('jobs', views.JobView.as_view()),
+    path('jobs/<int:pk>', views.SingleJobView.as_view()),
 ]
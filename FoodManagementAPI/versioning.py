@@ -0,0 +1,67 @@
+import threading
+import uuid
+
+from django.core.cache import cache
+
+from .db_router import use_primary
+
+
+def new_version():
+    # 캐시가 비워져도 이전 버전과 겹치지 않도록 버전은 임의 문자열 사용
+    return uuid.uuid4().hex
+
+
+def cache_version(key, default=new_version):
+    """
+    캐시에 저장된 버전 반환
+    없으면 default() 로 만든 버전을 저장 (여러 프로세스가 동시에 저장하면 먼저 저장된 버전 사용)
+    """
+    version = cache.get(key)
+    if version is None:
+        version = default()
+        if not cache.add(key, version, None):
+            version = cache.get(key, version)
+    return version
+
+
+async def acache_version(key, default=new_version):
+    version = await cache.aget(key)
+    if version is None:
+        version = default()
+        if not await cache.aadd(key, version, None):
+            version = await cache.aget(key, version)
+    return version
+
+
+# 프로세스 메모리에 올려두는 색인의 기본 클래스
+# 데이터가 변경되면 invalidate() 로 캐시의 버전을 바꾸고, 다음 조회 때 버전이 다르면 refresh() 로 다시 생성
+# 여러 프로세스가 같은 캐시를 사용하면 함께 갱신됨
+# 지연된 복제 DB 에서 읽으면 새 버전에 이전 데이터가 남으므로 GET 요청 중에도 default 에서 읽음
+class VersionedSnapshot:
+    VERSION_KEY = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._snapshot = None
+
+    @classmethod
+    def invalidate(cls):
+        cache.set(cls.VERSION_KEY, new_version(), None)
+
+    def snapshot(self):
+        version = cache_version(self.VERSION_KEY)
+        if self._snapshot is None or version != self._version:
+            with self._lock:
+                if self._snapshot is None or version != self._version:
+                    with use_primary():
+                        self._snapshot = self.refresh(self._snapshot)
+                    self._version = version
+        return self._snapshot
+
+    def refresh(self, snapshot):
+        # 이전 snapshot 을 이어서 갱신하려면 재정의 (기본: 전체 다시 생성)
+        return self.build()
+
+    def build(self):
+        raise NotImplementedError
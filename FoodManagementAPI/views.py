@@ -1,25 +1,51 @@
+from datetime import timedelta
+
 from django.shortcuts import render
 from django.core.paginator import Paginator, EmptyPage
+from django.db import connection, transaction
+from django.utils import timezone
 
-from rest_framework import generics, filters
+from rest_framework import generics, filters, status
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.pagination import PageNumberPagination
-
-from .models import IngredientCategory, Ingredient, UserIngredient, RecipeCategory, Recipe, RecipeIngredient, Cart
-from .serializers import IngredientCategorySerializer, IngredientSerializer, UserIngredientSerializer, RecipeCategorySerializer, RecipeSerializer, RecipeIngredientSerializer, CartSerializer
-
+from rest_framework.renderers import BrowsableAPIRenderer
+
+from .models import IngredientCategory, Ingredient, UserIngredient, RecipeCategory, Recipe, RecipeIngredient, Cart, Job
+from .serializers import IngredientCategorySerializer, IngredientSerializer, UserIngredientSerializer, RecipeCategorySerializer, RecipeSerializer, RecipeIngredientSerializer, CartSerializer, CookableRecipeSerializer, UserIngredientBatchSerializer, CartBatchSerializer, SimilarRecipeSerializer, SimilarRecipeQuerySerializer, IngredientAutocompleteQuerySerializer, MealPlanSerializer, MealPlanQuerySerializer, JobSerializer, JobCreateSerializer
+from .recipe_index import recipe_ingredient_index
+from .similarity_index import recipe_similarity_index
+from .autocomplete import ingredient_autocomplete_index
+from .pagination import KeysetPagination
+from .search import NgramSearchFilter
+from .catalog_cache import CatalogCacheMixin
+from .sync import DeltaSyncMixin
+from .streaming import StreamingListMixin
+from .metrics import route_stats
+from .throttling import DEFAULT_COSTS, throttle_stats
+from .meal_plan import expiry_weights, plan_meals
+from .analytics import pantry_analytics
+from .jobs import enqueue
+from .renderers import FastJSONRenderer
+from .row_serializers import RowListMixin, IngredientRowSerializer, RecipeIngredientRowSerializer
+from .recipe_documents import RecipeDocumentMixin, recipe_queryset
+
+
+# 레시피 식재료 직렬화에 필요한 레시피/식재료 카테고리를 한 번에 조회
+recipe_ingredient_queryset = RecipeIngredient.objects.select_related(
+    'recipe__category', 'ingredient__category')
 
 # 설명: 식재료 카테고리 목록 조회, 식재료 카테고리 생성
 # 메소드: GET, POST
 # URL: /api/ingredient-category
 # 식재료 카테고리 생성은 staff 권한 필요
-class IngredientCategoryView(generics.ListCreateAPIView):
+class IngredientCategoryView(CatalogCacheMixin, generics.ListCreateAPIView):
     queryset = IngredientCategory.objects.all()
     serializer_class = IngredientCategorySerializer
 
     # 필터링 설정
-    filter_backends = [filters.OrderingFilter, filters.SearchFilter]
+    filter_backends = [filters.OrderingFilter, NgramSearchFilter]
     # URL: /api/ingredient?search=<str:search>
     search_fields = ['title']
     # URL: /api/ingredient?ordering=<str:ordering>
@@ -49,12 +75,14 @@ class SingleIngredientCategoryView(generics.RetrieveUpdateDestroyAPIView):
 # 설명: 식재료 목록 조회, 식재료 생성
 # 메소드: GET, POST
 # URL: /api/ingredient
-class IngredientView(generics.ListCreateAPIView):
-    queryset = Ingredient.objects.all()
+# URL: /api/ingredient?stream=true (스트리밍 응답)
+class IngredientView(CatalogCacheMixin, StreamingListMixin, RowListMixin, generics.ListCreateAPIView):
+    queryset = Ingredient.objects.select_related('category')
     serializer_class = IngredientSerializer
+    row_serializer_class = IngredientRowSerializer
 
     # 필터링 설정
-    filter_backends = [filters.OrderingFilter, filters.SearchFilter]
+    filter_backends = [filters.OrderingFilter, NgramSearchFilter]
     search_fields = ['title', 'category__title']
     ordering_fields = ['id', 'title']
     ordering = ['title']
@@ -69,24 +97,44 @@ class IngredientView(generics.ListCreateAPIView):
         return [permission() for permission in permission_classes]
 
 
+# 설명: 식재료 자동완성 (제목 또는 단어의 앞부분 일치)
+# 한글은 입력 중인 글자, 초성(ㄷㅈㄱㄱ), 로마자(dwaeji) 입력도 검색
+# 메모리 색인 사용 (autocomplete.py), 식재료 변경 시 다시 생성
+# 메소드: GET
+# URL: /api/ingredient/autocomplete?q=<str>&limit=<int>
+class IngredientAutocompleteView(generics.GenericAPIView):
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+
+    def get(self, request, *args, **kwargs):
+        query = IngredientAutocompleteQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        matches = ingredient_autocomplete_index.search(
+            query.validated_data['q'], query.validated_data['limit'])
+        return Response([{'id': pk, 'title': title} for pk, title in matches])
+
+
 # 설명: 단일 식재료 조회, 수정, 삭제
 # 메소드: GET, PUT, DELETE
 # URL: /api/ingredient/<int:pk>
 # staff 권한 필요
 class SingleIngredientView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAuthenticated, IsAdminUser]
-    queryset = Ingredient.objects.all()
+    queryset = Ingredient.objects.select_related('category')
     serializer_class = IngredientSerializer
 
 
 # 설명: 사용자 식재료 목록 조회, 사용자 식재료 생성
 # 메소드: GET, POST
 # URL: /api/user-ingredient
-class UserIngredientView(generics.ListCreateAPIView):
+# URL: /api/user-ingredient?since=<str:token> (변경분 동기화)
+# URL: /api/user-ingredient?stream=true (스트리밍 응답)
+class UserIngredientView(DeltaSyncMixin, StreamingListMixin, generics.ListCreateAPIView):
     serializer_class = UserIngredientSerializer
 
     # 필터링 설정
-    filter_backends = [filters.OrderingFilter, filters.SearchFilter]
+    filter_backends = [filters.OrderingFilter, NgramSearchFilter]
     search_fields = ['ingredient__title']
     ordering_fields = ['id', 'ingredient__title']
     ordering = ['ingredient__title']
@@ -98,7 +146,34 @@ class UserIngredientView(generics.ListCreateAPIView):
 
     def get_queryset(self):
         user = self.request.user
-        return UserIngredient.objects.filter(user=user)
+        return UserIngredient.objects.filter(user=user).select_related('ingredient__category')
+
+
+# 설명: 유통기한이 days 일 이내로 남은 사용자 식재료 목록 조회 (이미 지난 식재료 제외)
+# 메소드: GET
+# URL: /api/user-ingredient/expiring?days=<int:days>
+class ExpiringUserIngredientView(generics.ListAPIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = UserIngredientSerializer
+    default_days = 3
+    max_days = 365
+
+    def get_queryset(self):
+        try:
+            days = int(self.request.query_params.get('days', self.default_days))
+        except ValueError:
+            raise ValidationError({'days': ['A valid integer is required.']})
+        if not 0 <= days <= self.max_days:
+            raise ValidationError(
+                {'days': [f'Ensure this value is between 0 and {self.max_days}.']})
+
+        # (user, end) 인덱스 사용
+        today = timezone.localdate()
+        user = self.request.user
+        return (UserIngredient.objects
+                .filter(user=user, end__gte=today, end__lte=today + timedelta(days=days))
+                .select_related('ingredient__category')
+                .order_by('end', 'ingredient__title'))
 
 
 # 설명: 단일 사용자 식재료 조회, 수정, 삭제
@@ -106,26 +181,72 @@ class UserIngredientView(generics.ListCreateAPIView):
 # URL: /api/user-ingredient/<int:pk>
 class SingleUserIngredientView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAuthenticated]
-    queryset = UserIngredient.objects.all()
+    queryset = UserIngredient.objects.select_related('ingredient__category')
     serializer_class = UserIngredientSerializer
 
 
 # 설명: 장바구니 목록 조회, 장바구니 생성
 # 메소드: GET, POST
 # URL: /api/user-cart
-class CartView(generics.ListCreateAPIView):
+# URL: /api/user-cart?since=<str:token> (변경분 동기화)
+# URL: /api/user-cart?stream=true (스트리밍 응답)
+class CartView(DeltaSyncMixin, StreamingListMixin, generics.ListCreateAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = CartSerializer
 
     # 필터링 설정
-    filter_backends = [filters.OrderingFilter, filters.SearchFilter]
+    filter_backends = [filters.OrderingFilter, NgramSearchFilter]
     search_fields = ['ingredient__title']
     ordering_fields = ['id', 'ingredient__title']
     ordering = ['ingredient__title']
 
     def get_queryset(self):
         user = self.request.user
-        return Cart.objects.filter(user=user)
+        return Cart.objects.filter(user=user).select_related('ingredient__category')
+
+
+# 설명: 레시피 식재료 중 사용자 식재료에 없는 식재료를 장바구니에 추가
+# 요청 본문: {"recipe_ids": [<int:recipe_id>, ...]}
+# 응답: 사용자 식재료, 장바구니에 없어서 추가한 식재료 id (missing), 추가 후 장바구니 목록
+# (동시에 다른 요청이 같은 식재료를 추가했으면 그 항목도 missing 에 포함)
+# 메소드: POST
+# URL: /api/user-cart/recipe
+class RecipeCartView(generics.GenericAPIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = CartSerializer
+    max_recipes = 50
+
+    def get_queryset(self):
+        user = self.request.user
+        return Cart.objects.filter(user=user).select_related('ingredient__category').order_by('ingredient__title')
+
+    def post(self, request, *args, **kwargs):
+        recipe_ids = request.data.get('recipe_ids') if isinstance(request.data, dict) else None
+        if (not isinstance(recipe_ids, list) or not recipe_ids or len(recipe_ids) > self.max_recipes
+                or not all(isinstance(pk, int) and not isinstance(pk, bool) for pk in recipe_ids)):
+            raise ValidationError(
+                {'recipe_ids': [f'Expected a list of 1 to {self.max_recipes} recipe ids.']})
+        missing_recipes = set(recipe_ids) - set(Recipe.objects.filter(
+            id__in=recipe_ids).values_list('id', flat=True))
+        if missing_recipes:
+            raise ValidationError({'recipe_ids': [
+                f'Invalid pk "{pk}" - object does not exist.' for pk in sorted(missing_recipes)]})
+
+        user = request.user
+        # 레시피 식재료 - 사용자 식재료 - 장바구니 를 쿼리 한 번으로 계산
+        ingredient_ids = list(RecipeIngredient.objects
+                              .filter(recipe_id__in=recipe_ids)
+                              .exclude(ingredient_id__in=UserIngredient.objects.filter(user=user).values('ingredient_id'))
+                              .exclude(ingredient_id__in=Cart.objects.filter(user=user).values('ingredient_id'))
+                              .order_by()
+                              .values_list('ingredient_id', flat=True)
+                              .distinct())
+        # 동시에 추가된 장바구니 항목은 무시
+        Cart.objects.bulk_create([Cart(user=user, ingredient_id=ingredient_id) for ingredient_id in ingredient_ids],
+                                 ignore_conflicts=True)
+
+        serializer = self.get_serializer(self.get_queryset(), many=True)
+        return Response({'missing': sorted(ingredient_ids), 'cart': serializer.data})
 
 
 # 설명: 단일 장바구니 조회, 수정, 삭제
@@ -137,18 +258,201 @@ class SingleCartView(generics.RetrieveUpdateDestroyAPIView):
 
     def get_queryset(self):
         user = self.request.user
-        return Cart.objects.filter(user=user)
+        return Cart.objects.filter(user=user).select_related('ingredient__category')
+
+
+# 사용자 식재료/장바구니 일괄 추가, 수정, 삭제 공통 처리
+# 요청 본문은 항목 리스트, 응답은 항목별 처리 결과(status)
+# 전체 항목을 먼저 검증한 뒤 하나의 트랜잭션에서 bulk 연산으로 저장
+class BatchWriteView(generics.GenericAPIView):
+    permission_classes = [IsAuthenticated]
+    model = None
+    batch_serializer_class = None
+    # (user, ingredient) 외에 수정 가능한 필드
+    write_fields = []
+    max_batch_size = 500
+
+    def get_queryset(self):
+        user = self.request.user
+        return self.model.objects.filter(user=user).select_related('ingredient__category')
+
+    def get_items(self):
+        items = self.request.data
+        if not isinstance(items, list):
+            raise ValidationError({'detail': 'Expected a list of items.'})
+        if len(items) > self.max_batch_size:
+            raise ValidationError(
+                {'detail': f'Ensure this list has no more than {self.max_batch_size} items.'})
+        return items
+
+    def validate_items(self, items, partial=False):
+        results = [{'index': index} for index in range(len(items))]
+        valid = {}
+        for index, item in enumerate(items):
+            serializer = self.batch_serializer_class(data=item, partial=partial)
+            if serializer.is_valid():
+                valid[index] = dict(serializer.validated_data)
+            else:
+                results[index].update(status='invalid', errors=serializer.errors)
+
+        # 식재료 존재 여부는 한 번에 확인
+        ingredient_ids = {data['ingredient_id']
+                          for data in valid.values() if 'ingredient_id' in data}
+        if ingredient_ids:
+            found = set(Ingredient.objects.filter(
+                id__in=ingredient_ids).values_list('id', flat=True))
+            for index, data in list(valid.items()):
+                if 'ingredient_id' in data and data['ingredient_id'] not in found:
+                    results[index].update(status='invalid', errors={
+                        'ingredient_id': [f'Invalid pk "{data["ingredient_id"]}" - object does not exist.']})
+                    del valid[index]
+        return results, valid
+
+    def batch_response(self, results, objects):
+        for result in results:
+            if 'id' in result and result['id'] in objects:
+                result['data'] = self.get_serializer(objects[result['id']]).data
+        ok = all(result['status'] in ('created', 'updated', 'deleted')
+                 for result in results)
+        return Response({'results': results}, status=status.HTTP_200_OK if ok else status.HTTP_207_MULTI_STATUS)
+
+    # 일괄 추가: (user, ingredient) 가 이미 있으면 수정 (upsert)
+    def post(self, request, *args, **kwargs):
+        results, valid = self.validate_items(self.get_items())
+
+        # 같은 식재료가 여러 번 오면 뒤의 항목으로 덮어씀
+        merged, indexes = {}, {}
+        for index, data in valid.items():
+            data.pop('id', None)
+            ingredient_id = data['ingredient_id']
+            merged[ingredient_id] = {**merged.get(ingredient_id, {}), **data}
+            indexes.setdefault(ingredient_id, []).append(index)
+
+        with transaction.atomic():
+            existing = {obj.ingredient_id: obj for obj in self.model.objects.select_for_update().filter(
+                user=request.user, ingredient_id__in=merged)}
+            # bulk_update 는 auto_now 를 적용하지 않으므로 updated_at 직접 설정
+            now = timezone.now()
+            created, updated, update_fields = [], [], {'updated_at'}
+            for ingredient_id, data in merged.items():
+                obj = existing.get(ingredient_id)
+                if obj is None:
+                    created.append(self.model(user=request.user, **data))
+                    continue
+                for field, value in data.items():
+                    setattr(obj, field, value)
+                obj.updated_at = now
+                update_fields.update(data)
+                updated.append(obj)
+
+            if created:
+                # 동시에 추가된 행과 충돌하면 덮어씀
+                # MySQL 은 충돌 대상(unique_fields)을 지정하지 않음
+                unique_fields = ['user', 'ingredient'] if connection.features.supports_update_conflicts_with_target else None
+                self.model.objects.bulk_create(
+                    created, update_conflicts=True, unique_fields=unique_fields, update_fields=self.write_fields + ['updated_at'])
+            update_fields.discard('ingredient_id')
+            if updated:
+                self.model.objects.bulk_update(updated, list(update_fields))
+
+        objects = {obj.ingredient_id: obj for obj in self.get_queryset().filter(
+            ingredient_id__in=merged)}
+        for ingredient_id, ingredient_indexes in indexes.items():
+            for index in ingredient_indexes:
+                results[index].update(
+                    status='updated' if ingredient_id in existing else 'created',
+                    id=objects[ingredient_id].id)
+        return self.batch_response(results, {obj.id: obj for obj in objects.values()})
+
+    # 일괄 수정: id 기준, 식재료 변경은 불가
+    def put(self, request, *args, **kwargs):
+        results, valid = self.validate_items(self.get_items(), partial=True)
+        for index, data in list(valid.items()):
+            if 'id' not in data:
+                results[index].update(status='invalid', errors={
+                    'id': ['This field is required.']})
+                del valid[index]
+
+        with transaction.atomic():
+            objects = self.model.objects.select_for_update().filter(
+                user=request.user).in_bulk([data['id'] for data in valid.values()])
+            now = timezone.now()
+            updated, update_fields = [], {'updated_at'}
+            for index, data in valid.items():
+                obj = objects.get(data.pop('id'))
+                if obj is None:
+                    results[index].update(status='not_found')
+                    continue
+                if data.pop('ingredient_id', obj.ingredient_id) != obj.ingredient_id:
+                    results[index].update(status='invalid', errors={
+                        'ingredient_id': ['Ingredient cannot be changed in a batch update.']})
+                    continue
+                for field, value in data.items():
+                    setattr(obj, field, value)
+                obj.updated_at = now
+                update_fields.update(data)
+                updated.append(obj)
+                results[index].update(status='updated', id=obj.id)
+            if updated:
+                self.model.objects.bulk_update(
+                    set(updated), list(update_fields))
+
+        return self.batch_response(results, self.get_queryset().in_bulk(
+            [result['id'] for result in results if 'id' in result]))
+
+    # 일괄 삭제: 요청 본문은 id 리스트
+    def delete(self, request, *args, **kwargs):
+        items = self.get_items()
+        results = [{'index': index} for index in range(len(items))]
+        ids = {}
+        for index, item in enumerate(items):
+            if isinstance(item, int) and not isinstance(item, bool):
+                ids[index] = item
+            else:
+                results[index].update(status='invalid', errors={
+                    'id': ['A valid integer is required.']})
+
+        with transaction.atomic():
+            queryset = self.model.objects.filter(
+                user=request.user, id__in=ids.values())
+            existing = set(queryset.values_list('id', flat=True))
+            queryset.delete()
+
+        for index, pk in ids.items():
+            results[index].update(
+                status='deleted' if pk in existing else 'not_found', id=pk)
+        return self.batch_response(results, {})
+
+
+# 설명: 사용자 식재료 일괄 추가(upsert), 수정, 삭제
+# 메소드: POST, PUT, DELETE
+# URL: /api/user-ingredient/batch
+class UserIngredientBatchView(BatchWriteView):
+    model = UserIngredient
+    serializer_class = UserIngredientSerializer
+    batch_serializer_class = UserIngredientBatchSerializer
+    write_fields = ['quantity', 'start', 'end', 'memo']
+
+
+# 설명: 장바구니 일괄 추가(upsert), 수정, 삭제
+# 메소드: POST, PUT, DELETE
+# URL: /api/user-cart/batch
+class CartBatchView(BatchWriteView):
+    model = Cart
+    serializer_class = CartSerializer
+    batch_serializer_class = CartBatchSerializer
+    write_fields = ['buy']
 
 
 # 설명: 레시피 카테고리 목록 조회, 레시피 카테고리 생성
 # 메소드: GET, POST
 # URL: /api/recipe-category
-class RecipeCategoryView(generics.ListCreateAPIView):
+class RecipeCategoryView(CatalogCacheMixin, generics.ListCreateAPIView):
     queryset = RecipeCategory.objects.all()
     serializer_class = RecipeCategorySerializer
 
     # 필터링 설정
-    filter_backends = [filters.OrderingFilter, filters.SearchFilter]
+    filter_backends = [filters.OrderingFilter, NgramSearchFilter]
     search_fields = ['title']
     ordering_fields = ['id', 'title']
     ordering = ['title']
@@ -174,20 +478,21 @@ class SingleRecipeCategoryView(generics.RetrieveUpdateDestroyAPIView):
 
 
 # 설명: 레시피 목록 조회, 레시피 생성
+# 조회는 저장된 레시피 문서 사용 (recipe_documents.py)
 # 메소드: GET, POST
 # URL: /api/recipe
-class RecipeView(generics.ListCreateAPIView):
-    queryset = Recipe.objects.all()
+class RecipeView(RecipeDocumentMixin, generics.ListCreateAPIView):
+    queryset = recipe_queryset
     serializer_class = RecipeSerializer
 
     # 필터링 설정
-    filter_backends = [filters.OrderingFilter, filters.SearchFilter]
+    filter_backends = [filters.OrderingFilter, NgramSearchFilter]
     search_fields = ['title', 'category__title']
     ordering_fields = ['id', 'title']
     ordering = ['title']
 
-    # 페이지 설정
-    class RecipePagination(PageNumberPagination):
+    # 페이지 설정, ?cursor= 사용 시 커서 방식
+    class RecipePagination(KeysetPagination):
         page_size = 10
         page_size_query_param = 'page_size'
         max_page_size = 20
@@ -205,10 +510,11 @@ class RecipeView(generics.ListCreateAPIView):
 
 
 # 설명: 단일 레시피 조회, 수정, 삭제
+# 조회는 저장된 레시피 문서 사용 (recipe_documents.py)
 # 메소드: GET, PUT, DELETE
 # URL: /api/recipe/<int:pk>
-class SingleRecipeView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Recipe.objects.all()
+class SingleRecipeView(CatalogCacheMixin, RecipeDocumentMixin, generics.RetrieveUpdateDestroyAPIView):
+    queryset = recipe_queryset
     serializer_class = RecipeSerializer
 
     def get_permissions(self):
@@ -220,15 +526,41 @@ class SingleRecipeView(generics.RetrieveUpdateDestroyAPIView):
         return [permission() for permission in permission_classes]
 
 
+# 설명: 식재료 구성이 비슷한 레시피 목록 조회 (MinHash 로 추정한 Jaccard 유사도 내림차순)
+# build_similarity_index 명령으로 색인을 만든 뒤 사용
+# 메소드: GET
+# URL: /api/recipe/<int:pk>/similar?limit=<int>&min_similarity=<float>&bands=<int>
+# min_similarity 를 높이면 정확도 증가, bands 를 줄이면 빨라지지만 재현율 감소
+class SimilarRecipeView(generics.GenericAPIView):
+    permission_classes = [IsAuthenticated]
+    queryset = Recipe.objects.all()
+    serializer_class = SimilarRecipeSerializer
+
+    def get(self, request, *args, **kwargs):
+        recipe = self.get_object()
+        query = SimilarRecipeQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        similar = recipe_similarity_index.similar(recipe.pk, **query.validated_data)
+        # 색인에 남아있는 삭제된 레시피는 제외
+        recipes = Recipe.objects.select_related('category').in_bulk(
+            [recipe_id for recipe_id, _ in similar])
+        results = [{'recipe': recipes[recipe_id], 'similarity': similarity}
+                   for recipe_id, similarity in similar if recipe_id in recipes]
+        return Response(self.get_serializer(results, many=True).data)
+
+
 # 설명: 레시피 식재료 목록 조회, 레시피 식재료 생성
 # 메소드: GET, POST
 # URL: /api/recipe-ingredient
-class RecipeIngredientView(generics.ListCreateAPIView):
-    queryset = RecipeIngredient.objects.all()
+# URL: /api/recipe-ingredient?stream=true (스트리밍 응답)
+class RecipeIngredientView(StreamingListMixin, RowListMixin, generics.ListCreateAPIView):
+    queryset = recipe_ingredient_queryset
     serializer_class = RecipeIngredientSerializer
+    row_serializer_class = RecipeIngredientRowSerializer
 
     # 필터링 설정
-    filter_backends = [filters.OrderingFilter, filters.SearchFilter]
+    filter_backends = [filters.OrderingFilter, NgramSearchFilter]
     search_fields = ['recipe__title']
     ordering_fields = ['id', 'recipe__title', 'ingredient__title']
     ordering = ['recipe__title', 'ingredient__title']
@@ -247,17 +579,17 @@ class RecipeIngredientView(generics.ListCreateAPIView):
 # 메소드: GET
 # URL: /api/ingredient-recipe
 class IngredientRecipeView(generics.ListAPIView):
-    queryset = RecipeIngredient.objects.all()
+    queryset = recipe_ingredient_queryset
     serializer_class = RecipeIngredientSerializer
 
     # 필터링 설정
-    filter_backends = [filters.OrderingFilter, filters.SearchFilter]
+    filter_backends = [filters.OrderingFilter, NgramSearchFilter]
     search_fields = ['ingredient__title']
     ordering_fields = ['id', 'recipe__title', 'ingredient__title']
     ordering = ['recipe__title', 'ingredient__title']
 
-    # 페이지 설정
-    class IngredientPagination(PageNumberPagination):
+    # 페이지 설정, ?cursor= 사용 시 커서 방식
+    class IngredientPagination(KeysetPagination):
         page_size = 10
         page_size_query_param = 'page_size'
         max_page_size = 20
@@ -270,11 +602,100 @@ class IngredientRecipeView(generics.ListAPIView):
         return [permission() for permission in permission_classes]
 
 
+# 설명: 사용자 식재료로 만들 수 있는 레시피 목록 조회
+# 보유 식재료 비율이 높은 순으로 정렬, 레시피별 부족한 식재료 포함
+# 메소드: GET
+# URL: /api/cookable-recipe
+class CookableRecipeView(generics.ListAPIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = CookableRecipeSerializer
+
+    # 페이지 설정
+    class CookablePagination(PageNumberPagination):
+        page_size = 10
+        page_size_query_param = 'page_size'
+        max_page_size = 20
+
+    pagination_class = CookablePagination
+
+    def list(self, request, *args, **kwargs):
+        pantry = set(UserIngredient.objects.filter(
+            user=request.user).values_list('ingredient_id', flat=True))
+        ranked = recipe_ingredient_index.rank(pantry)
+
+        page = self.paginate_queryset(ranked)
+        rows = page if page is not None else ranked[:]
+
+        missing = {recipe_id: recipe_ingredient_index.missing_ingredients(recipe_id, pantry)
+                   for recipe_id, _, _ in rows}
+        recipes = Recipe.objects.select_related(
+            'category').in_bulk([recipe_id for recipe_id, _, _ in rows])
+        ingredients = Ingredient.objects.select_related('category').in_bulk(
+            {ingredient_id for ids in missing.values() for ingredient_id in ids})
+
+        results = [
+            {
+                'recipe': recipes[recipe_id],
+                'matched_count': matched,
+                'total_count': total,
+                'coverage': matched / total,
+                'missing_ingredients': [ingredients[i] for i in missing[recipe_id] if i in ingredients],
+            }
+            for recipe_id, matched, total in rows if recipe_id in recipes
+        ]
+        serializer = self.get_serializer(results, many=True)
+
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
+
+
+# 설명: 보유 식재료를 최대한 사용하는 레시피 N 개 선택 (식단 계획)
+# 유통기한이 가까운 식재료일수록 가중치가 크고, 보유/장바구니에 없어 새로 사야 하는 식재료는 감점
+# 레시피 x 식재료 역색인으로 탐욕 선택 후 제한 시간(MEAL_PLAN_TIME_LIMIT) 동안 교체 탐색 (meal_plan.py)
+# 메소드: GET
+# URL: /api/meal-plan?recipes=<int>&penalty=<float>
+class MealPlanView(generics.GenericAPIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = MealPlanSerializer
+    # 전체 레시피를 계산하므로 검색과 같은 비용
+    throttle_cost = DEFAULT_COSTS['search']
+
+    def get(self, request, *args, **kwargs):
+        query = MealPlanQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        pantry = {item.ingredient_id: item for item in UserIngredient.objects.filter(
+            user=request.user).select_related('ingredient__category')}
+        cart = Cart.objects.filter(user=request.user).values_list('ingredient_id', flat=True)
+        plan = plan_meals(
+            expiry_weights([(item.ingredient_id, item.end) for item in pantry.values()], timezone.localdate()),
+            list(cart), query.validated_data['recipes'], query.validated_data['penalty'])
+
+        recipes = Recipe.objects.select_related('category').in_bulk(plan.recipe_ids)
+        ingredients = Ingredient.objects.select_related('category').in_bulk(plan.shopping)
+        results = [
+            {
+                'recipe': recipes[recipe_id],
+                'used_ingredients': [pantry[i] for i in plan.used[recipe_id]],
+                'missing_ingredients': [ingredients[i] for i in plan.missing[recipe_id] if i in ingredients],
+            }
+            for recipe_id in plan.recipe_ids if recipe_id in recipes
+        ]
+        return Response(self.get_serializer({
+            'recipes': results,
+            'shopping_list': [ingredients[i] for i in plan.shopping if i in ingredients],
+            'used_count': len({i for recipe_id in plan.recipe_ids for i in plan.used[recipe_id]}),
+            'score': plan.score,
+            'complete': plan.complete,
+        }).data)
+
+
 # 설명: 단일 레시피 식재료 조회, 수정, 삭제
 # 메소드: GET, PUT, DELETE
 # URL: /api/recipe-ingredient/<int:pk>
-class SingleRecipeIngredientView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = RecipeIngredient.objects.all()
+class SingleRecipeIngredientView(CatalogCacheMixin, generics.RetrieveUpdateDestroyAPIView):
+    queryset = recipe_ingredient_queryset
     serializer_class = RecipeIngredientSerializer
 
     def get_permissions(self):
@@ -284,3 +705,88 @@ class SingleRecipeIngredientView(generics.RetrieveUpdateDestroyAPIView):
             permission_classes.append(IsAdminUser)
 
         return [permission() for permission in permission_classes]
+
+
+# 설명: URL 별 성능 측정 결과 조회 (p50/p95/p99/max), 측정 결과 초기화
+# 시간 단위: ms, size 단위: byte, 현재 프로세스에서 처리한 최근 요청 기준
+# 메소드: GET, DELETE
+# URL: /api/stats/performance
+class PerformanceStatsView(generics.GenericAPIView):
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    def get(self, request):
+        return Response(route_stats.summary())
+
+    def delete(self, request):
+        route_stats.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+# 설명: URL 별 throttle 허용/거부 요청 수, 비용 조회 (GET), 초기화 (DELETE)
+# shed_user: 사용자별 예산 초과, shed_route: URL 별 예산 초과로 거부 (throttling.py)
+# 메소드: GET, DELETE
+# URL: /api/stats/throttle
+# staff 권한 필요
+class ThrottleStatsView(generics.GenericAPIView):
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    def get(self, request):
+        return Response(throttle_stats.summary())
+
+    def delete(self, request):
+        throttle_stats.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+# 설명: 사용자 식재료/장바구니 통계 조회
+# 식재료 카테고리별 폐기율(유통기한이 지난 식재료 비율), 보관 기간(start -> end, 일), 장바구니 구매율/사용자 식재료 등록율
+# 가장 많이 폐기된 식재료, 가장 많이 구매한 식재료 (analytics.py)
+# 캐시된 결과 반환, ?refresh=true 이면 다시 계산 (compute_pantry_analytics 명령으로 주기적으로 갱신)
+# 메소드: GET
+# URL: /api/stats/pantry
+class PantryAnalyticsView(generics.GenericAPIView):
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    def get(self, request):
+        refresh = request.query_params.get('refresh', '').lower() in ('1', 'true')
+        return Response(pantry_analytics(refresh=refresh))
+
+
+# 설명: 백그라운드 작업 목록 조회 (최근 작업부터, ?status=, ?name= 로 필터), 작업 추가
+# 추가한 작업은 run_jobs 명령의 worker 가 실행하고 바로 202 응답 (jobs.py, tasks.py)
+# 메소드: GET, POST
+# URL: /api/jobs
+# staff 권한 필요
+class JobView(generics.ListCreateAPIView):
+    serializer_class = JobSerializer
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    class JobPagination(PageNumberPagination):
+        page_size = 50
+
+    pagination_class = JobPagination
+
+    def get_queryset(self):
+        queryset = Job.objects.order_by('-id')
+        for field in ('status', 'name'):
+            value = self.request.query_params.get(field)
+            if value:
+                queryset = queryset.filter(**{field: value})
+        return queryset
+
+    def create(self, request, *args, **kwargs):
+        serializer = JobCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        job = enqueue(data['name'], key=data['key'], delay=data['delay'], **data['kwargs'])
+        return Response(JobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+
+# 설명: 단일 백그라운드 작업 상태, 진행 상황(progress 0~1, message) 조회
+# 메소드: GET
+# URL: /api/jobs/<int:pk>
+# staff 권한 필요
+class SingleJobView(generics.RetrieveAPIView):
+    queryset = Job.objects.all()
+    serializer_class = JobSerializer
+    permission_classes = [IsAuthenticated, IsAdminUser]